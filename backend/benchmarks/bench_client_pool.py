@@ -0,0 +1,116 @@
+"""
+Benchmark: per-request aiohttp session vs the pooled EZFacilityClient.
+
+Starts a local stub of the FilterResults endpoint and times the same
+request sequence through get_client() (a new session, and so a new TCP
+connection, per request) and through create_client() (one keep-alive
+pool for the whole run). Against the real upstream the gap is larger
+still, because every new connection also pays a TLS handshake.
+
+Usage:
+    uv run python benchmarks/bench_client_pool.py [--requests 300] [--concurrency 6]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from aiohttp import web
+
+from hos_padel.scraper.client import create_client, get_client
+
+ENDPOINT = "/Rentals/FilterResults"
+PAYLOAD = {
+    "rows": [
+        {
+            "ResourceID": 386680,
+            "StartDate": "25/05/2025",
+            "EndDate": "25/05/2025",
+            "StartTime": f"{hour:02d}:00",
+            "EndTime": f"{hour + 1:02d}:00",
+        }
+        for hour in range(9, 22)
+    ],
+    "total": 13,
+}
+
+
+async def _filter_results(request: web.Request) -> web.Response:
+    await request.read()
+    return web.json_response(PAYLOAD)
+
+
+async def _start_stub(port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_post(ENDPOINT, _filter_results)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def _run(request_once, requests: int, concurrency: int) -> list[float]:
+    """Issue requests with bounded concurrency, returning latencies in ms."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await request_once()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(ordered):6.2f}ms "
+        f"p50={statistics.median(ordered):6.2f}ms p95={p95:6.2f}ms "
+        f"total={elapsed:6.2f}s"
+    )
+
+
+async def main(requests: int, concurrency: int, port: int) -> None:
+    base_url = f"http://127.0.0.1:{port}"
+    runner = await _start_stub(port)
+    try:
+
+        async def per_request_session() -> None:
+            async with get_client() as client:
+                client.base_url = base_url
+                await client.post(ENDPOINT, "resourceId=386680")
+
+        pooled = create_client(base_url=base_url)
+
+        async def pooled_session() -> None:
+            await pooled.post(ENDPOINT, "resourceId=386680")
+
+        # Warm up both paths once
+        await per_request_session()
+        await pooled_session()
+
+        for label, request_once in (
+            ("per-request session", per_request_session),
+            ("pooled client", pooled_session),
+        ):
+            started = time.perf_counter()
+            latencies = await _run(request_once, requests, concurrency)
+            _report(label, latencies, time.perf_counter() - started)
+
+        await pooled.close()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.port))
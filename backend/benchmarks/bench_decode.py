@@ -0,0 +1,125 @@
+"""
+Benchmark: decoding a FilterResults page into booking rows.
+
+Times two ways of turning a 500-row response body into rows the service
+can use, each followed by reading every row's court and start/end minutes
+three times (the rental-length derivation, grid marking and snapshot
+passes):
+
+- json.loads into dicts, parsing "HH:MM" strings on every read (the old path)
+- the decode stage: scraper.decode.loads (orjson when installed) and one
+  TypeAdapter batch into BookingSlot records with integer minutes
+
+Pass --payload to use a recorded page instead of the synthetic one, e.g. a
+file written by scripts/parity_check.py record.
+
+Usage:
+    uv run python benchmarks/bench_decode.py [--payload rows.json] [--repeat 500]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from hos_padel.core.constants import COURT_IDS
+from hos_padel.core.times import parse_minutes
+from hos_padel.scraper import decode
+
+ROWS = 500
+READS = 3
+
+# The old path parsed "HH:MM" uncached on every read
+_parse_minutes = parse_minutes.__wrapped__
+
+
+def _synthetic_page(rows: int) -> bytes:
+    """A FilterResults page shaped like the upstream's, with a fixed seed."""
+    rnd = random.Random(0)
+    page = []
+    for _ in range(rows):
+        day = rnd.randint(1, 28)
+        start = rnd.randrange(8 * 60 + 30, 22 * 60, 30)
+        page.append(
+            {
+                "ResourceID": rnd.choice(COURT_IDS),
+                "StartDate": f"{day:02d}/05/2025",
+                "EndDate": f"{day:02d}/05/2025",
+                "StartTime": f"{start // 60:02d}:{start % 60:02d}",
+                "EndTime": f"{(start + 60) // 60:02d}:{(start + 60) % 60:02d}",
+            }
+        )
+    return json.dumps({"rows": page, "total": rows}).encode()
+
+
+def _load_payload(path: Path) -> bytes:
+    """Wrap a recorded list of rows (or a whole page) as a page body."""
+    data = json.loads(path.read_text())
+    if isinstance(data, list):
+        data = {"rows": data, "total": len(data)}
+    return json.dumps(data).encode()
+
+
+def dicts(body: bytes) -> int:
+    rows = json.loads(body)["rows"]
+    total = 0
+    for _ in range(READS):
+        for row in rows:
+            total += (
+                row["ResourceID"]
+                + _parse_minutes(row["StartTime"])
+                + _parse_minutes(row["EndTime"])
+            )
+    return total
+
+
+def decoded(body: bytes) -> int:
+    rows = decode.decode_rows(decode.loads(body)["rows"])
+    total = 0
+    for _ in range(READS):
+        for row in rows:
+            total += row.court_id + row.start + row.end
+    return total
+
+
+def _time(fn: Callable[[bytes], int], body: bytes, repeat: int) -> list[float]:
+    """Run fn repeatedly, returning per-call times in µs."""
+    fn(body)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(body)
+        times.append((time.perf_counter() - started) * 1_000_000)
+    return times
+
+
+def main(payload: Path | None, repeat: int) -> None:
+    body = _load_payload(payload) if payload else _synthetic_page(ROWS)
+    rows = len(json.loads(body)["rows"])
+    parser = "orjson" if decode.orjson is not None else "json"
+    print(f"{rows} rows, {len(body)} bytes, decode.loads uses {parser}")
+
+    results = [fn(body) for fn in (dicts, decoded)]
+    assert len(set(results)) == 1, "paths disagree"
+
+    for label, fn in (
+        ("dicts", dicts),
+        ("decode stage", decoded),
+    ):
+        times = _time(fn, body, repeat)
+        print(
+            f"{label:<16} mean={statistics.mean(times):8.1f}µs "
+            f"p50={statistics.median(times):8.1f}µs "
+            f"per row={statistics.mean(times) / rows:5.2f}µs"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payload", type=Path)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    main(args.payload, args.repeat)
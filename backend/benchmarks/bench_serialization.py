@@ -0,0 +1,162 @@
+"""
+Benchmark: response_model serialization vs pre-encoded cached bodies.
+
+Fills an AvailabilityService cache with a week of synthetic days, then
+times the same day and range requests through two routes of a minimal
+app: one returning the model for FastAPI to validate and serialize on
+every request, and one answering with cached_response(), which sends the
+bytes encoded when the day was cached. Compressed sizes are reported for
+each content coding the server supports.
+
+Usage:
+    uv run python benchmarks/bench_serialization.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI, Request
+
+from hos_padel.api.caching import cached_response
+from hos_padel.core.constants import COURT_IDS, DEFAULT_RENTAL_LENGTH
+from hos_padel.core.times import parse_date
+from hos_padel.models.availability import (
+    AvailabilityRangeResponse,
+    AvailabilityResponse,
+)
+from hos_padel.models.booking import BookingSlot
+from hos_padel.services.availability import AvailabilityCache, AvailabilityService
+from hos_padel.services.encoding import ENCODINGS
+
+START_DATE = "25/05/2025"
+DAYS = 7
+CACHE_CONTROL = "public, max-age=30"
+
+
+def _rows(date: str, seed: int) -> list[BookingSlot]:
+    """Free 60-minute rows for every court at roughly half occupancy."""
+    rnd = random.Random(seed)
+    day = parse_date(date)
+    return [
+        BookingSlot(court_id, day, start, start + 60)
+        for court_id in COURT_IDS
+        for start in range(8 * 60 + 30, 22 * 60 + 1, 30)
+        if rnd.random() < 0.5
+    ]
+
+
+def _build_service() -> tuple[AvailabilityService, list[str]]:
+    cache = AvailabilityCache(ttl_seconds=3600, stale_seconds=0, max_entries=256)
+    service = AvailabilityService(cache=cache)
+    start = datetime.strptime(START_DATE, "%d/%m/%Y")
+    dates = [(start + timedelta(days=i)).strftime("%d/%m/%Y") for i in range(DAYS)]
+    for seed, date in enumerate(dates):
+        service._cache_day(service._build_day_responses(date, _rows(date, seed)))
+    return service, dates
+
+
+def _build_app(service: AvailabilityService, dates: list[str]) -> FastAPI:
+    app = FastAPI()
+    rental_length = DEFAULT_RENTAL_LENGTH
+
+    def day() -> AvailabilityResponse:
+        return service.cache.get(service._cache_key(dates[0], rental_length))
+
+    def week() -> AvailabilityRangeResponse:
+        return AvailabilityRangeResponse(
+            start_date=dates[0],
+            rental_length=rental_length,
+            days=[
+                service.cache.get(service._cache_key(d, rental_length)) for d in dates
+            ],
+        )
+
+    @app.get("/model/day", response_model=AvailabilityResponse)
+    async def model_day():
+        return day()
+
+    @app.get("/model/range", response_model=AvailabilityRangeResponse)
+    async def model_range():
+        return week()
+
+    @app.get("/encoded/day", response_model=AvailabilityResponse)
+    async def encoded_day(request: Request):
+        return cached_response(
+            request,
+            day(),
+            service.cached_day_body(day()),
+            CACHE_CONTROL,
+        )
+
+    @app.get("/encoded/range", response_model=AvailabilityRangeResponse)
+    async def encoded_range(request: Request):
+        return cached_response(
+            request,
+            week(),
+            service.cached_range_body(dates[0], week().days, rental_length),
+            CACHE_CONTROL,
+        )
+
+    return app
+
+
+async def _run(client: httpx.AsyncClient, path: str, requests: int) -> list[float]:
+    """Issue requests one after another, returning latencies in µs."""
+    headers = {"Accept-Encoding": "identity"}
+    await client.get(path, headers=headers)
+    latencies: list[float] = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<16} mean={statistics.mean(ordered):7.1f}µs "
+        f"p50={statistics.median(ordered):7.1f}µs p95={p95:7.1f}µs"
+    )
+
+
+async def main(requests: int) -> None:
+    service, dates = _build_service()
+    app = _build_app(service, dates)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for path in ("/model/day", "/encoded/day", "/model/range", "/encoded/range"):
+            _report(path, await _run(client, path, requests))
+
+    print()
+    responses = [
+        service.cache.get(service._cache_key(date, DEFAULT_RENTAL_LENGTH))
+        for date in dates
+    ]
+    for label, cached in (
+        ("day", service.cached_day_body(responses[0])),
+        (
+            "range",
+            service.cached_range_body(dates[0], responses, DEFAULT_RENTAL_LENGTH),
+        ),
+    ):
+        sizes = ", ".join(
+            f"{encoding}={len(cached.body.variant(encoding))}B"
+            for encoding in ENCODINGS
+        )
+        print(f"{label:<6} identity={len(cached.body.identity)}B, {sizes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,245 @@
+"""
+Load test: every uvicorn worker scraping vs one worker publishing.
+
+Starts a local stub of the EZFacility endpoints (with an artificial
+upstream delay) and runs the same HTTP load against two topologies of
+--workers uvicorn processes:
+
+- standalone: each process runs its own prefetcher and fetches on a miss
+- split: one `python -m hos_padel.worker` scrapes and publishes, and the
+  uvicorn processes run with API_READ_ONLY=true
+
+Requests pick a random day (or a week-long range) within the prefetch
+horizon. Reports throughput, latency percentiles, errors and how many
+upstream requests the stub received, from boot to the end of the load.
+
+Usage:
+    uv run python benchmarks/load_test.py [--workers 4] [--duration 20] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from aiohttp import web
+
+from hos_padel.core.constants import COURT_IDS
+
+HORIZON_DAYS = 7
+
+
+class StubUpstream:
+    """FilterResults, GetResources and GetTimeFrame with a fixed delay."""
+
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+        self.requests = 0
+
+    async def _filter_results(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        form = await request.post()
+        await asyncio.sleep(self.delay_seconds)
+        start = datetime.strptime(form["startDate"], "%d/%m/%Y")
+        court_id = int(form["resourceId"])
+        rows = []
+        for offset in range(7):
+            date = (start + timedelta(days=offset)).strftime("%d/%m/%Y")
+            rnd = random.Random(f"{court_id}-{date}")
+            for minute in range(8 * 60 + 30, 22 * 60, 30):
+                if rnd.random() < 0.5:
+                    rows.append(
+                        {
+                            "ResourceID": court_id,
+                            "StartDate": date,
+                            "EndDate": date,
+                            "StartTime": f"{minute // 60:02d}:{minute % 60:02d}",
+                            "EndTime": f"{(minute + 60) // 60:02d}:{minute % 60:02d}",
+                        }
+                    )
+        return web.json_response({"rows": rows, "total": len(rows)})
+
+    async def _resources(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.delay_seconds)
+        return web.json_response(
+            [
+                {"Id": court_id, "Name": f"Padel Court {number}"}
+                for number, court_id in enumerate(COURT_IDS, 1)
+            ]
+        )
+
+    async def _timeframe(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.delay_seconds)
+        return web.json_response({"openCloseHoursForDay": [["08:30", "23:00"]]})
+
+    async def start(self, port: int) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_post("/Rentals/FilterResults", self._filter_results)
+        app.router.add_post("/Rentals/GetResources", self._resources)
+        app.router.add_post("/Rentals/GetTimeFrame", self._timeframe)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        return runner
+
+
+def _dates() -> list[str]:
+    today = datetime.now()
+    return [
+        (today + timedelta(days=offset)).strftime("%d-%m-%Y")
+        for offset in range(HORIZON_DAYS)
+    ]
+
+
+async def _spawn(args: list[str], env: dict[str, str]) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(
+        sys.executable,
+        *args,
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    """Wait until every date in the horizon is served."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            responses = await asyncio.gather(
+                *(client.get(f"/api/v1/availability/{date}") for date in _dates())
+            )
+            if all(r.status_code == 200 for r in responses):
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError("API didn't become ready")
+
+
+async def _load(
+    client: httpx.AsyncClient,
+    duration: float,
+    concurrency: int,
+) -> tuple[list[float], int]:
+    """Send requests for `duration` seconds, returning latencies (ms) and errors."""
+    dates = _dates()
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def user() -> None:
+        nonlocal errors
+        rnd = random.Random()
+        while time.monotonic() < deadline:
+            if rnd.random() < 0.2:
+                path = (
+                    f"/api/v1/availability/range?start={dates[0]}&days={HORIZON_DAYS}"
+                )
+            else:
+                path = f"/api/v1/availability/{rnd.choice(dates)}"
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.TransportError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _report(label: str, latencies: list[float], errors: int, upstream: int) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(
+        f"{label:<11} {len(ordered):7d} req  p50={statistics.median(ordered):6.2f}ms "
+        f"p95={p95:6.2f}ms p99={p99:7.2f}ms errors={errors} upstream={upstream}"
+    )
+
+
+async def _run_topology(
+    label: str,
+    split: bool,
+    stub: StubUpstream,
+    args: argparse.Namespace,
+) -> None:
+    with tempfile.TemporaryDirectory() as data:
+        env = {
+            **os.environ,
+            "EZFACILITY_BASE_URL": f"http://127.0.0.1:{args.upstream_port}",
+            "SNAPSHOT_PATH": f"{data}/snapshots.sqlite3",
+            "HISTORY_PATH": f"{data}/history",
+            "PUBLISHED_PATH": f"{data}/published.bin",
+            "PREFETCH_HORIZON_DAYS": str(HORIZON_DAYS),
+        }
+        processes = []
+        stub.requests = 0
+        if split:
+            processes.append(await _spawn(["-m", "hos_padel.worker"], env))
+            env["API_READ_ONLY"] = "true"
+        processes.append(
+            await _spawn(
+                [
+                    "-m",
+                    "uvicorn",
+                    "hos_padel.main:app",
+                    "--port",
+                    str(args.port),
+                    "--workers",
+                    str(args.workers),
+                    "--log-level",
+                    "warning",
+                ],
+                env,
+            )
+        )
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{args.port}",
+                limits=httpx.Limits(max_connections=args.concurrency),
+                timeout=30.0,
+            ) as client:
+                await _wait_ready(client)
+                latencies, errors = await _load(client, args.duration, args.concurrency)
+            _report(label, latencies, errors, stub.requests)
+        finally:
+            for process in processes:
+                process.terminate()
+            await asyncio.gather(*(process.wait() for process in processes))
+
+
+async def main(args: argparse.Namespace) -> None:
+    stub = StubUpstream(args.upstream_delay)
+    runner = await stub.start(args.upstream_port)
+    try:
+        print(
+            f"{args.workers} API workers, {args.concurrency} concurrent clients, "
+            f"{args.duration:.0f}s each, upstream delay {args.upstream_delay * 1000:.0f}ms"
+        )
+        await _run_topology("standalone", False, stub, args)
+        await _run_topology("split", True, stub, args)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--upstream-delay", type=float, default=0.15)
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--upstream-port", type=int, default=8797)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,164 @@
+"""
+Parity check: derived rental lengths vs what EZFacility actually returns.
+
+The service only fetches BASE_RENTAL_LENGTH rows and derives every longer
+rental length from them (services/occupancy.py). This script records real
+FilterResults responses for every rental length, then checks that the
+derived rows and slot grids match the recorded ones. tests/test_parity.py
+runs the check on upstream windows committed under tests/fixtures/parity,
+when there are any, and on the synthetic ones in
+tests/fixtures/synthetic_parity.
+
+Usage:
+    uv run python scripts/parity_check.py record --start 25/05/2025 --out tests/fixtures/parity/
+    uv run python scripts/parity_check.py check tests/fixtures/parity/
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+from hos_padel.core.config import settings
+from hos_padel.core.constants import (
+    ALL_DAYS_SELECTED,
+    BASE_RENTAL_LENGTH,
+    COURT_IDS,
+    DEFAULT_END_TIME,
+    DEFAULT_START_TIME,
+    UPSTREAM_WINDOW_DAYS,
+    VALID_RENTAL_LENGTHS,
+)
+from hos_padel.core.times import format_date, format_minutes
+from hos_padel.models.booking import BookingSlot
+from hos_padel.scraper.bookings import iter_court_bookings
+from hos_padel.scraper.client import get_client
+from hos_padel.scraper.decode import decode_rows
+from hos_padel.services.occupancy import derive_rows
+from hos_padel.services.slot_grid import SlotGrid
+
+logger = logging.getLogger(__name__)
+
+
+def _fixture_path(directory: Path, start_date: str, rental_length: int) -> Path:
+    return directory / f"{start_date.replace('/', '-')}_{rental_length}.json"
+
+
+async def record(start_date: str, out: Path) -> None:
+    """Fetch every court at every rental length and save the raw rows."""
+    out.mkdir(parents=True, exist_ok=True)
+    async with get_client() as client:
+        for rental_length in VALID_RENTAL_LENGTHS:
+            rows = []
+            for court_id in COURT_IDS:
+                rows.extend(
+                    [
+                        row.to_raw()
+                        async for row in iter_court_bookings(
+                            client=client,
+                            location_id=settings.ezfacility_location_id,
+                            court_id=court_id,
+                            rental_type_id=settings.ezfacility_rental_type_id,
+                            start_date=start_date,
+                            rental_length=rental_length,
+                            start_time=DEFAULT_START_TIME,
+                            end_time=DEFAULT_END_TIME,
+                            selected_days=ALL_DAYS_SELECTED,
+                        )
+                    ]
+                )
+            path = _fixture_path(out, start_date, rental_length)
+            path.write_text(json.dumps(rows, indent=2))
+            logger.info("Recorded %d rows to %s", len(rows), path)
+
+
+def _row_keys(rows: list[BookingSlot]) -> set[tuple]:
+    return {(row.court_id, row.day, row.start, row.end) for row in rows}
+
+
+def _describe(key: tuple) -> str:
+    court_id, day, start, end = key
+    return (
+        f"court {court_id} {format_date(day)} "
+        f"{format_minutes(start)}-{format_minutes(end)}"
+    )
+
+
+def _grid_masks(rows: list[BookingSlot]) -> dict[str, dict[int, int]]:
+    """Build per-date availability masks the way the service does."""
+    grids: dict[str, SlotGrid] = {}
+    for row in rows:
+        date = row.date
+        grid = grids.get(date) or grids.setdefault(date, SlotGrid(date))
+        grid.mark_free(row.court_id, row.start, row.end)
+    return {date: dict(grid.free) for date, grid in grids.items()}
+
+
+def check(directory: Path) -> bool:
+    """
+    Compare derived rows against every recorded window.
+
+    Returns:
+        True if every window matched, False on any mismatch or if no window
+        was recorded for a derived rental length
+    """
+    ok = True
+    compared = 0
+    for base_path in sorted(directory.glob(f"*_{BASE_RENTAL_LENGTH}.json")):
+        start_date = base_path.stem.rsplit("_", 1)[0].replace("-", "/")
+        base_rows = decode_rows(json.loads(base_path.read_text()))
+
+        for rental_length in VALID_RENTAL_LENGTHS:
+            path = _fixture_path(directory, start_date, rental_length)
+            if rental_length == BASE_RENTAL_LENGTH or not path.exists():
+                continue
+
+            recorded = decode_rows(json.loads(path.read_text()))
+            derived = derive_rows(base_rows, rental_length)
+            missing = _row_keys(recorded) - _row_keys(derived)
+            extra = _row_keys(derived) - _row_keys(recorded)
+            masks_match = _grid_masks(recorded) == _grid_masks(derived)
+
+            compared += 1
+            label = f"{start_date} +{UPSTREAM_WINDOW_DAYS}d {rental_length} min"
+            if missing or extra or not masks_match:
+                ok = False
+                logger.error(
+                    "Mismatch %s: %d missing, %d extra", label, len(missing), len(extra)
+                )
+                for key in sorted(missing)[:5]:
+                    logger.error("  missing %s", _describe(key))
+                for key in sorted(extra)[:5]:
+                    logger.error("  extra   %s", _describe(key))
+            else:
+                logger.info("OK %s: %d rows", label, len(recorded))
+
+    if not compared:
+        logger.error("No recorded windows to check in %s", directory)
+        return False
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record upstream responses")
+    record_parser.add_argument("--start", required=True, help="DD/MM/YYYY")
+    record_parser.add_argument("--out", type=Path, required=True)
+
+    check_parser = commands.add_parser("check", help="check recorded responses")
+    check_parser.add_argument("directory", type=Path)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    if args.command == "record":
+        asyncio.run(record(args.start, args.out))
+    elif not check(args.directory):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""HTTP cache validators, conditional GETs and pre-encoded responses."""
+
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+
+from ..core.config import settings
+from ..services.availability import CachedBody
+from ..services.encoding import compression_stats, negotiate_encoding, route_level
+
+
+def _strip_coding(etag: str) -> str:
+    """Map the ETag of a compressed variant back to the identity ETag."""
+    etag = etag.strip().removeprefix("W/")
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return etag in {_strip_coding(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return int(last_modified) <= since
+
+    return False
+
+
+def cached_response(
+    request: Request,
+    value: Any,
+    cached: CachedBody | None,
+    cache_control: str,
+    media_type: str = "application/json",
+) -> Any:
+    """
+    Answer from a cached, pre-encoded body when there is one.
+
+    Sends a bare 304 if the client's copy is current, otherwise the stored
+    bytes in the best content coding the client accepts, compressed at
+    the route's level. Both are returned as a Response, so FastAPI skips
+    response_model validation and serialization, and the compression
+    middleware passes the body through. Without a cached body, value is
+    returned for FastAPI to serialize as usual.
+    """
+    if cached is None:
+        return value
+
+    size = len(cached.body.identity)
+    encoding = None
+    if size >= settings.compression_min_size:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": cached.body.variant_etag(encoding),
+        "Last-Modified": formatdate(cached.last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+        "Vary": "Accept, Accept-Encoding",
+    }
+    if is_not_modified(request, cached.body.etag, cached.last_modified):
+        return Response(status_code=304, headers=headers)
+
+    content = cached.body.variant(encoding, route_level(request.url.path))
+    compression_stats.record_send(size, len(content), precompressed=True)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -0,0 +1,87 @@
+"""Response compression middleware."""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..services.encoding import (
+    compress,
+    compression_stats,
+    negotiate_encoding,
+    route_level,
+)
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best coding the client accepts.
+
+    Only complete bodies of at least `minimum_size` bytes are compressed,
+    at the level configured for the route. Responses that already carry a
+    Content-Encoding (pre-encoded cache hits) and streamed responses
+    (Server-Sent Events) are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        level = route_level(scope["path"])
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or headers.get(
+                    "content-type", ""
+                ).startswith("text/event-stream"):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streamed body: send it as it comes
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if len(body) < self.minimum_size:
+                if body:
+                    compression_stats.record_send(len(body), len(body))
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding, level)
+            compression_stats.record_send(len(body), len(compressed))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag is not None and etag.endswith('"'):
+                headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
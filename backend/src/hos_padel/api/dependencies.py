@@ -2,7 +2,89 @@
 
 from datetime import datetime
 
+from fastapi import Request
+
+from ..core.config import settings
+from ..scraper.client import EZFacilityClient
+from ..services.availability import AvailabilityCache, AvailabilityService
+from ..services.broadcast import AvailabilityHub
+from ..services.changes import ChangeLog
+from ..services.metadata import VenueMetadata
+from ..services.prefetch import AvailabilityPrefetcher
+from ..services.publish import PublishedFollower
+from ..services.search import AvailabilityIndex
+from ..storage import OccupancyHistory, PublishedReader, SnapshotStore
+
 
 def get_current_date() -> str:
     """Return current date in DD/MM/YYYY format."""
     return datetime.now().strftime("%d/%m/%Y")
+
+
+def create_availability_service(
+    client: EZFacilityClient | None,
+    store: SnapshotStore | None = None,
+    published: PublishedReader | None = None,
+) -> AvailabilityService:
+    """
+    Build the process-wide availability service around a shared client.
+
+    With a PublishedReader (and no client) the service is read-only.
+    """
+    cache = AvailabilityCache(
+        ttl_seconds=settings.availability_cache_ttl_seconds,
+        stale_seconds=settings.availability_cache_stale_seconds,
+        max_entries=settings.availability_cache_max_entries,
+    )
+    return AvailabilityService(
+        cache=cache,
+        client=client,
+        store=store,
+        metadata=VenueMetadata(client),
+        published=published,
+    )
+
+
+def get_ezfacility_client(request: Request) -> EZFacilityClient | None:
+    """Return the pooled EZFacility client, or None when read-only."""
+    return request.app.state.ezfacility_client
+
+
+def get_availability_service(request: Request) -> AvailabilityService:
+    """Return the availability service owned by the app lifespan."""
+    return request.app.state.availability_service
+
+
+def get_availability_hub(request: Request) -> AvailabilityHub:
+    """Return the availability stream hub owned by the app lifespan."""
+    return request.app.state.availability_hub
+
+
+def get_change_log(request: Request) -> ChangeLog:
+    """Return the availability change log owned by the app lifespan."""
+    return request.app.state.change_log
+
+
+def get_prefetcher(request: Request) -> AvailabilityPrefetcher:
+    """Return the background prefetcher owned by the app lifespan."""
+    return request.app.state.prefetcher
+
+
+def get_venue_metadata(request: Request) -> VenueMetadata:
+    """Return the venue courts and opening hours owned by the app lifespan."""
+    return request.app.state.venue_metadata
+
+
+def get_availability_index(request: Request) -> AvailabilityIndex:
+    """Return the free-slot search index owned by the app lifespan."""
+    return request.app.state.availability_index
+
+
+def get_published_follower(request: Request) -> PublishedFollower | None:
+    """Return the published file follower, or None unless read-only."""
+    return request.app.state.published_follower
+
+
+def get_occupancy_history(request: Request) -> OccupancyHistory | None:
+    """Return the occupancy history store, or None when history is off."""
+    return request.app.state.occupancy_history
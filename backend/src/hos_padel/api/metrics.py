@@ -0,0 +1,119 @@
+"""Request timing middleware and the stats exported on /metrics."""
+
+import time
+from collections.abc import Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.metrics import Family, http_request_seconds, http_response_bytes
+from ..services.availability import AvailabilityService
+from ..services.encoding import compression_stats
+
+# Stats that go up and down; all other numeric stats only count up
+GAUGES = {
+    "entries",
+    "max_entries",
+    "ttl_seconds",
+    "stale_seconds",
+    "refreshing",
+    "in_flight",
+}
+
+
+class MetricsMiddleware:
+    """
+    Observe each request's handling time and response size.
+
+    Labelled by the matched route's template (e.g. /api/v1/availability/
+    {date}) rather than the raw path, so dates don't multiply the series.
+    Sizes are the bytes actually sent, after compression. Event streams
+    are left out, since they stay open for as long as the client listens.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+        streaming = False
+
+        async def send_measured(message: Message) -> None:
+            nonlocal status, size, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type" and value.startswith(
+                        b"text/event-stream"
+                    ):
+                        streaming = True
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            if not streaming:
+                route = _route_template(scope)
+                http_request_seconds.observe(
+                    time.perf_counter() - started, scope["method"], route, status
+                )
+                http_response_bytes.observe(size, route)
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    The matched route's path template, or "unmatched".
+
+    Included routers keep their own routes, so the template leaves out
+    the outer /api/v1 prefix (/availability/{date}); it is still one
+    label per endpoint.
+    """
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+def _stats_families(prefix: str, description: str, stats: dict) -> Iterator[Family]:
+    """One family per numeric stat; totals are counters, the rest gauges."""
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in GAUGES:
+            yield f"{prefix}_{key}", "gauge", f"{description}: {key}", [({}, value)]
+        else:
+            yield (
+                f"{prefix}_{key}_total",
+                "counter",
+                f"{description}: {key}",
+                [({}, value)],
+            )
+
+
+def service_families(service: AvailabilityService) -> Iterator[Family]:
+    """Cache, coalescing and compression counters, read at scrape time."""
+    if service.cache is not None:
+        yield from _stats_families(
+            "hos_padel_availability_cache",
+            "Availability cache",
+            service.cache.stats(),
+        )
+    yield from _stats_families(
+        "hos_padel_upstream_coalescing",
+        "Upstream fetches issued versus joined",
+        service.flights.stats(),
+    )
+    yield from _stats_families(
+        "hos_padel_metadata_coalescing",
+        "Venue metadata loads issued versus joined",
+        service.metadata.flights.stats(),
+    )
+    yield from _stats_families(
+        "hos_padel_compression",
+        "Response compression",
+        compression_stats.stats(),
+    )
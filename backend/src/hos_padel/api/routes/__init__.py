@@ -2,8 +2,11 @@
 
 from fastapi import APIRouter
 
-from . import availability, courts
+from . import admin, availability, courts, history, search
 
 router = APIRouter(prefix="/api/v1")
 router.include_router(availability.router)
 router.include_router(courts.router)
+router.include_router(search.router)
+router.include_router(history.router)
+router.include_router(admin.router)
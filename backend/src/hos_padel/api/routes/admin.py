@@ -0,0 +1,134 @@
+"""Admin API routes."""
+
+from fastapi import APIRouter, Depends
+
+from ...scraper.client import EZFacilityClient
+from ...services.availability import AvailabilityService
+from ...services.broadcast import AvailabilityHub
+from ...services.changes import ChangeLog
+from ...services.encoding import compression_stats
+from ...services.metadata import VenueMetadata
+from ...services.prefetch import AvailabilityPrefetcher
+from ...services.publish import PublishedFollower
+from ...services.search import AvailabilityIndex
+from ...storage import OccupancyHistory
+from ..dependencies import (
+    get_availability_hub,
+    get_availability_index,
+    get_availability_service,
+    get_change_log,
+    get_ezfacility_client,
+    get_occupancy_history,
+    get_prefetcher,
+    get_published_follower,
+    get_venue_metadata,
+)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/cache")
+async def get_cache_stats(
+    service: AvailabilityService = Depends(get_availability_service),
+) -> dict:
+    """Availability cache hit/miss/refresh counters."""
+    return service.cache.stats()
+
+
+@router.get("/changes")
+async def get_change_stats(
+    change_log: ChangeLog = Depends(get_change_log),
+) -> dict:
+    """Versioned days and change deltas served to polling clients."""
+    return change_log.stats()
+
+
+@router.get("/compression")
+async def get_compression_stats() -> dict:
+    """Responses compressed or sent pre-compressed, bytes saved and CPU time."""
+    return compression_stats.stats()
+
+
+@router.get("/coalescing")
+async def get_coalescing_stats(
+    service: AvailabilityService = Depends(get_availability_service),
+) -> dict:
+    """Upstream fetches issued versus joined by concurrent identical requests."""
+    return service.flights.stats()
+
+
+@router.get("/cube")
+async def get_cube_stats(
+    service: AvailabilityService = Depends(get_availability_service),
+) -> dict:
+    """Days held in the availability cube, its size and rewrites."""
+    return service.cube.stats()
+
+
+@router.get("/history")
+async def get_history_stats(
+    history: OccupancyHistory | None = Depends(get_occupancy_history),
+) -> dict | None:
+    """Recorded months, disk use and slot changes seen (null when off)."""
+    return history.stats() if history is not None else None
+
+
+@router.get("/metadata")
+async def get_metadata_stats(
+    metadata: VenueMetadata = Depends(get_venue_metadata),
+) -> dict:
+    """Courts and opening hours in use, and metadata load counters."""
+    return metadata.stats()
+
+
+@router.get("/planner")
+async def get_planner_stats(
+    service: AvailabilityService = Depends(get_availability_service),
+) -> dict:
+    """Upstream calls planned and rows fetched versus rows used."""
+    return service.planner.stats()
+
+
+@router.get("/upstream")
+async def get_upstream_stats(
+    client: EZFacilityClient | None = Depends(get_ezfacility_client),
+) -> dict | None:
+    """Upstream throttling, queue wait times and circuit breaker state."""
+    if client is None:
+        return None
+    return {
+        "governor": client.governor.stats() if client.governor else None,
+        "circuit_breaker": client.breaker.stats() if client.breaker else None,
+    }
+
+
+@router.get("/published")
+async def get_published_stats(
+    follower: PublishedFollower | None = Depends(get_published_follower),
+) -> dict | None:
+    """Age and size of the worker's published file (null unless read-only)."""
+    return follower.stats() if follower is not None else None
+
+
+@router.get("/search")
+async def get_search_stats(
+    index: AvailabilityIndex = Depends(get_availability_index),
+) -> dict:
+    """Days in the search index, index updates and searches served."""
+    return index.stats()
+
+
+@router.get("/stream")
+async def get_stream_stats(
+    hub: AvailabilityHub = Depends(get_availability_hub),
+) -> dict:
+    """Availability stream subscribers and events sent."""
+    return hub.stats()
+
+
+@router.get("/prefetch/status")
+async def get_prefetch_status(
+    prefetcher: AvailabilityPrefetcher = Depends(get_prefetcher),
+) -> dict:
+    """Last refresh time and duration for each prefetched date."""
+    return prefetcher.status()
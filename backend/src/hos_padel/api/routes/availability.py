@@ -1,15 +1,42 @@
 """Availability API routes."""
 
+import asyncio
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from ...core.constants import DEFAULT_RENTAL_LENGTH, VALID_RENTAL_LENGTHS
-from ...models.availability import AvailabilityResponse
+from ...core.config import settings
+from ...core.constants import (
+    DEFAULT_RENTAL_LENGTH,
+    MAX_EXPORT_DAYS,
+    MAX_RANGE_DAYS,
+    MAX_SUMMARY_DAYS,
+    VALID_RENTAL_LENGTHS,
+)
+from ...models.availability import (
+    AvailabilityChanges,
+    AvailabilityRangeResponse,
+    AvailabilityResponse,
+    AvailabilitySummary,
+)
 from ...services.availability import AvailabilityService
+from ...services.broadcast import AvailabilityHub
+from ...services.changes import ChangeLog
+from ...services.compact import COMPACT_MEDIA_TYPE, to_compact
+from ...services.export import MEDIA_TYPES, ExportFormat, date_range, export_lines
+from ..caching import cached_response
+from ..dependencies import (
+    get_availability_hub,
+    get_availability_service,
+    get_change_log,
+)
 
 router = APIRouter(prefix="/availability", tags=["availability"])
 
+ResponseFormat = Literal["full", "compact"]
+
 
 def _validate_rental_length(rental_length: int) -> None:
     """Validate rental length parameter."""
@@ -32,38 +59,288 @@ def _parse_date(date_str: str) -> str:
         )
 
 
+def _wants_compact(request: Request, response_format: ResponseFormat | None) -> bool:
+    """Return whether the client asked for the compact format."""
+    if response_format is not None:
+        return response_format == "compact"
+    return COMPACT_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _compact_response(
+    request: Request,
+    service: AvailabilityService,
+    responses: list[AvailabilityResponse],
+    rental_length: int,
+    cache_control: str,
+) -> Response:
+    """Answer with responses in the compact format."""
+    cached = service.cached_compact_body(responses, rental_length)
+    if cached is None:
+        return Response(
+            content=to_compact(responses, rental_length).model_dump_json(),
+            media_type=COMPACT_MEDIA_TYPE,
+        )
+    return cached_response(
+        request, None, cached, cache_control, media_type=COMPACT_MEDIA_TYPE
+    )
+
+
 @router.get("/", response_model=AvailabilityResponse)
 async def get_today_availability(
+    request: Request,
     rental_length: int = Query(
         default=DEFAULT_RENTAL_LENGTH,
         description="Rental duration in minutes (60 or 90)",
     ),
-) -> AvailabilityResponse:
+    response_format: ResponseFormat | None = Query(
+        default=None,
+        alias="format",
+        description="full (default) or compact; also negotiable via Accept",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> AvailabilityResponse | Response:
     """Get court availability for today."""
     _validate_rental_length(rental_length)
 
     today = datetime.now().strftime("%d/%m/%Y")
-    service = AvailabilityService()
+    availability = await service.get_availability_for_date(today, rental_length)
+    if _wants_compact(request, response_format):
+        return _compact_response(
+            request,
+            service,
+            [availability],
+            rental_length,
+            settings.cache_control_today,
+        )
+    return cached_response(
+        request,
+        availability,
+        service.cached_day_body(availability),
+        settings.cache_control_today,
+    )
+
+
+@router.get("/range", response_model=AvailabilityRangeResponse)
+async def get_availability_for_range(
+    request: Request,
+    start: str = Query(description="First date (DD-MM-YYYY)"),
+    days: int = Query(
+        default=7,
+        ge=1,
+        le=MAX_RANGE_DAYS,
+        description="Number of consecutive days",
+    ),
+    rental_length: int = Query(
+        default=DEFAULT_RENTAL_LENGTH,
+        description="Rental duration in minutes (60 or 90)",
+    ),
+    response_format: ResponseFormat | None = Query(
+        default=None,
+        alias="format",
+        description="full (default) or compact; also negotiable via Accept",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> AvailabilityRangeResponse | Response:
+    """
+    Get court availability for consecutive days.
+
+    With format=compact, the days share one grid and each court's free
+    slots are sent as a base64 bitmask per day (CompactAvailability).
+    Date format: DD-MM-YYYY (e.g., 25-05-2025)
+    """
+    _validate_rental_length(rental_length)
+    parsed_date = _parse_date(start)
+
+    availability = await service.get_availability_for_range(
+        parsed_date, days, rental_length
+    )
+    if _wants_compact(request, response_format):
+        return _compact_response(
+            request,
+            service,
+            availability.days,
+            rental_length,
+            settings.cache_control_range,
+        )
+    return cached_response(
+        request,
+        availability,
+        service.cached_range_body(parsed_date, availability.days, rental_length),
+        settings.cache_control_range,
+    )
+
+
+@router.get("/summary", response_model=AvailabilitySummary)
+async def get_availability_summary(
+    start: str = Query(description="First date (DD-MM-YYYY)"),
+    days: int = Query(
+        default=MAX_SUMMARY_DAYS,
+        ge=1,
+        le=MAX_SUMMARY_DAYS,
+        description="Number of consecutive days",
+    ),
+    rental_length: int = Query(
+        default=DEFAULT_RENTAL_LENGTH,
+        description="Rental duration in minutes (60 or 90)",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> AvailabilitySummary:
+    """
+    Get the start times with any court free for each day of a range.
+
+    Sliced from the in-memory availability cube without fetching, so it is
+    cheap over the whole horizon; dates not loaded yet (usually beyond the
+    prefetch horizon) are listed in missing_dates.
+    Date format: DD-MM-YYYY (e.g., 25-05-2025)
+    """
+    _validate_rental_length(rental_length)
+    return service.get_availability_summary(_parse_date(start), days, rental_length)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_availability(
+    dates: str = Query(description="Comma-separated dates (DD-MM-YYYY)"),
+    rental_length: int = Query(
+        default=DEFAULT_RENTAL_LENGTH,
+        description="Rental duration in minutes (60 or 90)",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+    hub: AvailabilityHub = Depends(get_availability_hub),
+) -> StreamingResponse:
+    """
+    Stream availability changes as Server-Sent Events.
+
+    A `snapshot` event carrying the full AvailabilityResponse is sent for
+    each date, then an `update` event carrying only the changed slots and
+    courts whenever refreshed data differs.
+    """
+    _validate_rental_length(rental_length)
+    parsed_dates = list(dict.fromkeys(_parse_date(d) for d in dates.split(",") if d))
+    if not parsed_dates or len(parsed_dates) > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide between 1 and {MAX_RANGE_DAYS} dates",
+        )
+
+    responses = await asyncio.gather(
+        *(service.get_availability_for_date(d, rental_length) for d in parsed_dates)
+    )
+    return StreamingResponse(
+        hub.stream(
+            {(d, rental_length): r for d, r in zip(parsed_dates, responses)},
+            settings.stream_keepalive_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return await service.get_availability_for_date(today, rental_length)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_availability(
+    start: str = Query(description="First date (DD-MM-YYYY)"),
+    end: str = Query(description="Last date (DD-MM-YYYY), inclusive"),
+    export_format: ExportFormat = Query(
+        default="ndjson",
+        alias="format",
+        description="ndjson (one AvailabilityResponse per line) or csv",
+    ),
+    rental_length: int = Query(
+        default=DEFAULT_RENTAL_LENGTH,
+        description="Rental duration in minutes (60 or 90)",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> StreamingResponse:
+    """
+    Stream availability for a date range as NDJSON or CSV.
+
+    Days are loaded a few at a time and written as they arrive, so memory
+    stays flat however long the range. A day that can't be loaded is an
+    error line in NDJSON and left out of CSV.
+    Date format: DD-MM-YYYY (e.g., 25-05-2025)
+    """
+    _validate_rental_length(rental_length)
+    parsed_start, parsed_end = _parse_date(start), _parse_date(end)
+    dates = date_range(parsed_start, parsed_end)
+    if not dates or len(dates) > MAX_EXPORT_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"end must be on or after start and within {MAX_EXPORT_DAYS} days",
+        )
+
+    filename = f"availability-{start}-to-{end}.{export_format}"
+    return StreamingResponse(
+        export_lines(service, dates, rental_length, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{date}", response_model=AvailabilityResponse)
 async def get_availability_for_date(
+    request: Request,
     date: str,
     rental_length: int = Query(
         default=DEFAULT_RENTAL_LENGTH,
         description="Rental duration in minutes (60 or 90)",
     ),
-) -> AvailabilityResponse:
+    response_format: ResponseFormat | None = Query(
+        default=None,
+        alias="format",
+        description="full (default) or compact; also negotiable via Accept",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> AvailabilityResponse | Response:
     """
     Get court availability for a specific date.
 
+    Served from pre-encoded bytes when cached. Supports If-None-Match /
+    If-Modified-Since; a matching request gets a 304 without the body.
     Date format: DD-MM-YYYY (e.g., 25-05-2025)
     """
     _validate_rental_length(rental_length)
     parsed_date = _parse_date(date)
 
-    service = AvailabilityService()
+    availability = await service.get_availability_for_date(parsed_date, rental_length)
+    if _wants_compact(request, response_format):
+        return _compact_response(
+            request,
+            service,
+            [availability],
+            rental_length,
+            settings.cache_control_date,
+        )
+    return cached_response(
+        request,
+        availability,
+        service.cached_day_body(availability),
+        settings.cache_control_date,
+    )
+
+
+@router.get("/{date}/changes", response_model=AvailabilityChanges)
+async def get_availability_changes(
+    date: str,
+    since: int = Query(ge=0, description="Version the client last saw"),
+    rental_length: int = Query(
+        default=DEFAULT_RENTAL_LENGTH,
+        description="Rental duration in minutes (60 or 90)",
+    ),
+    service: AvailabilityService = Depends(get_availability_service),
+    change_log: ChangeLog = Depends(get_change_log),
+) -> AvailabilityChanges:
+    """
+    Get the slots and courts that flipped since a version of a date.
+
+    If the history no longer reaches `since`, `reset` is true and `slots`
+    holds the full day. Date format: DD-MM-YYYY (e.g., 25-05-2025)
+    """
+    _validate_rental_length(rental_length)
+    parsed_date = _parse_date(date)
 
-    return await service.get_availability_for_date(parsed_date, rental_length)
+    # Reading through the service keeps the day fresh, and so versioned
+    response = await service.get_availability_for_date(parsed_date, rental_length)
+    changes = change_log.changes(parsed_date, rental_length, since)
+    if changes is None:
+        # Not versioned (e.g. a partial response that was never cached)
+        return AvailabilityChanges(**response.model_dump(), since=since, reset=True)
+    return changes
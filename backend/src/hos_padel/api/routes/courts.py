@@ -1,23 +1,29 @@
 """Courts API routes."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from ...core.constants import COURTS
 from ...models.court import Court
+from ...services.metadata import VenueMetadata
+from ..dependencies import get_venue_metadata
 
 router = APIRouter(prefix="/courts", tags=["courts"])
 
 
 @router.get("/", response_model=list[Court])
-async def list_courts() -> list[Court]:
+async def list_courts(
+    metadata: VenueMetadata = Depends(get_venue_metadata),
+) -> list[Court]:
     """List all padel courts."""
-    return [Court(id=c["id"], name=c["name"]) for c in COURTS]
+    return metadata.courts()
 
 
 @router.get("/{court_id}", response_model=Court)
-async def get_court(court_id: int) -> Court:
+async def get_court(
+    court_id: int,
+    metadata: VenueMetadata = Depends(get_venue_metadata),
+) -> Court:
     """Get a specific court by ID."""
-    court = next((c for c in COURTS if c["id"] == court_id), None)
+    court = metadata.court(court_id)
     if court is None:
         raise HTTPException(status_code=404, detail="Court not found")
-    return Court(id=court["id"], name=court["name"])
+    return court
@@ -0,0 +1,124 @@
+"""Occupancy history API routes."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ...core.constants import DEFAULT_HISTORY_DAYS
+from ...models.history import OccupancyHeatmap, SelloutReport
+from ...scraper.planner import WEEKDAYS
+from ...storage.history import LEAD_BUCKET_LABELS, OccupancyHistory
+from ..dependencies import get_occupancy_history
+
+router = APIRouter(prefix="/history", tags=["history"])
+
+
+def _require(history: OccupancyHistory | None) -> OccupancyHistory:
+    """Return the history store, or 503 if history isn't recorded."""
+    if history is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Occupancy history is disabled (HISTORY_ENABLED or NumPy missing)",
+        )
+    return history
+
+
+def _parse_range(start: str | None, end: str | None) -> tuple[str, str]:
+    """Parse DD-MM-YYYY bounds, defaulting to the days up to today."""
+    try:
+        last = datetime.strptime(end, "%d-%m-%Y") if end else datetime.now()
+        first = (
+            datetime.strptime(start, "%d-%m-%Y")
+            if start
+            else last - timedelta(days=DEFAULT_HISTORY_DAYS - 1)
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid date format. Use DD-MM-YYYY",
+        )
+    if first > last:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return first.strftime("%d/%m/%Y"), last.strftime("%d/%m/%Y")
+
+
+@router.get("/occupancy", response_model=OccupancyHeatmap)
+async def get_occupancy_heatmap(
+    start: str | None = Query(
+        default=None,
+        description=f"First date (DD-MM-YYYY), {DEFAULT_HISTORY_DAYS} days before end if omitted",
+    ),
+    end: str | None = Query(
+        default=None,
+        description="Last date (DD-MM-YYYY), today if omitted",
+    ),
+    history: OccupancyHistory | None = Depends(get_occupancy_history),
+) -> OccupancyHeatmap:
+    """Share of court slots booked by weekday and hour of the day."""
+    history = _require(history)
+    first, last = _parse_range(start, end)
+
+    booked, observed = await asyncio.to_thread(history.occupancy, first, last)
+    hours = [hour for hour in range(24) if observed[:, hour].any()]
+    return OccupancyHeatmap(
+        start_date=first,
+        end_date=last,
+        weekdays=WEEKDAYS,
+        hours=hours,
+        occupancy=[
+            [
+                (
+                    round(booked[day, hour] / observed[day, hour], 3)
+                    if observed[day, hour]
+                    else None
+                )
+                for hour in hours
+            ]
+            for day in range(7)
+        ],
+        observed=[[int(observed[day, hour]) for hour in hours] for day in range(7)],
+    )
+
+
+@router.get("/sellout", response_model=SelloutReport)
+async def get_sellout_report(
+    start: str | None = Query(
+        default=None,
+        description=f"First date (DD-MM-YYYY), {DEFAULT_HISTORY_DAYS} days before end if omitted",
+    ),
+    end: str | None = Query(
+        default=None,
+        description="Last date (DD-MM-YYYY), today if omitted",
+    ),
+    history: OccupancyHistory | None = Depends(get_occupancy_history),
+) -> SelloutReport:
+    """How far ahead court slots sell out, by weekday and hour of the day."""
+    history = _require(history)
+    first, last = _parse_range(start, end)
+
+    sold, lead_sum, histogram, before_seen = await asyncio.to_thread(
+        history.sellout, first, last
+    )
+    hours = [hour for hour in range(24) if sold[:, hour].any()]
+    return SelloutReport(
+        start_date=first,
+        end_date=last,
+        weekdays=WEEKDAYS,
+        hours=hours,
+        sold=[[int(sold[day, hour]) for hour in hours] for day in range(7)],
+        mean_lead_hours=[
+            [
+                (
+                    round(lead_sum[day, hour] / sold[day, hour] / 60, 1)
+                    if sold[day, hour]
+                    else None
+                )
+                for hour in hours
+            ]
+            for day in range(7)
+        ],
+        lead_buckets=LEAD_BUCKET_LABELS,
+        lead_distribution=[histogram[hour].tolist() for hour in hours],
+        sold_before_seen=before_seen,
+    )
@@ -0,0 +1,148 @@
+"""Court search API routes."""
+
+import re
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ...core.constants import (
+    DEFAULT_RENTAL_LENGTH,
+    MAX_SEARCH_DAYS,
+    VALID_RENTAL_LENGTHS,
+)
+from ...models.search import SearchResponse
+from ...scraper.planner import WEEKDAYS
+from ...services.metadata import VenueMetadata
+from ...services.search import AvailabilityIndex
+from ..dependencies import get_availability_index, get_venue_metadata
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+TIME_PATTERN = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+
+
+def _parse_start(start: str | None) -> datetime:
+    """Parse the first date (DD-MM-YYYY), defaulting to today."""
+    if start is None:
+        return datetime.now()
+    try:
+        return datetime.strptime(start, "%d-%m-%Y")
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid date format. Use DD-MM-YYYY",
+        )
+
+
+def _validate_time(name: str, value: str | None) -> None:
+    """Validate an HH:MM time parameter."""
+    if value is not None and not TIME_PATTERN.match(value):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {name}. Use HH:MM",
+        )
+
+
+def _parse_weekdays(weekdays: str | None) -> set[int] | None:
+    """Parse comma-separated day names (e.g. "sat,sun") to weekday numbers."""
+    if not weekdays:
+        return None
+    parsed = set()
+    for name in weekdays.lower().split(","):
+        name = name.strip()
+        day = next(
+            (i for i, day in enumerate(WEEKDAYS) if name and day.startswith(name)),
+            None,
+        )
+        if len(name) < 3 or day is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid weekday {name!r}. Use e.g. mon,tue or saturday",
+            )
+        parsed.add(day)
+    return parsed
+
+
+@router.get("/", response_model=SearchResponse)
+async def search_courts(
+    start: str | None = Query(
+        default=None,
+        description="First date (DD-MM-YYYY), today if omitted",
+    ),
+    days: int = Query(
+        default=7,
+        ge=1,
+        le=MAX_SEARCH_DAYS,
+        description="Number of consecutive days to search",
+    ),
+    earliest: str | None = Query(
+        default=None,
+        description="Earliest start time (HH:MM), inclusive",
+    ),
+    latest: str | None = Query(
+        default=None,
+        description="Latest start time (HH:MM), inclusive",
+    ),
+    duration: int = Query(
+        default=DEFAULT_RENTAL_LENGTH,
+        description="Rental duration in minutes (60 or 90)",
+    ),
+    min_courts: int = Query(
+        default=1,
+        ge=1,
+        description="Courts that must be free at the same time",
+    ),
+    adjacent: bool = Query(
+        default=False,
+        description="Whether those courts must be next to each other",
+    ),
+    weekdays: str | None = Query(
+        default=None,
+        description="Comma-separated days to include, e.g. sat,sun",
+    ),
+    limit: int = Query(
+        default=50,
+        ge=1,
+        le=500,
+        description="Maximum number of matches",
+    ),
+    index: AvailabilityIndex = Depends(get_availability_index),
+    metadata: VenueMetadata = Depends(get_venue_metadata),
+) -> SearchResponse:
+    """
+    Find start times with enough courts free for the whole rental.
+
+    Answered from the index of cached availability without fetching, so
+    dates that haven't been loaded yet (usually beyond the prefetch
+    horizon) are listed in missing_dates instead of being searched.
+    Matches are ordered by date and start time.
+    """
+    if duration not in VALID_RENTAL_LENGTHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid duration. Must be one of: {VALID_RENTAL_LENGTHS}",
+        )
+    _validate_time("earliest", earliest)
+    _validate_time("latest", latest)
+    first = _parse_start(start)
+
+    matches, missing = index.search(
+        [
+            (first + timedelta(days=offset)).strftime("%d/%m/%Y")
+            for offset in range(days)
+        ],
+        duration,
+        metadata.court_names,
+        earliest=earliest,
+        latest=latest,
+        min_courts=min_courts,
+        adjacent=adjacent,
+        weekdays=_parse_weekdays(weekdays),
+        limit=limit,
+    )
+    return SearchResponse(
+        duration=duration,
+        min_courts=min_courts,
+        matches=matches,
+        missing_dates=missing,
+    )
@@ -0,0 +1,84 @@
+"""Command-line entry point (`hos-padel`)."""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import BinaryIO
+
+from .api.dependencies import create_availability_service
+from .core.config import settings
+from .core.constants import DEFAULT_RENTAL_LENGTH, VALID_RENTAL_LENGTHS
+from .scraper.client import create_client
+from .services.export import date_range, export_lines
+from .storage import create_snapshot_store
+
+
+def _date(value: str) -> str:
+    """Parse a DD-MM-YYYY argument into DD/MM/YYYY."""
+    try:
+        return datetime.strptime(value, "%d-%m-%Y").strftime("%d/%m/%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError("use DD-MM-YYYY")
+
+
+async def export(args: argparse.Namespace, output: BinaryIO) -> None:
+    """Write an availability export, a day at a time, to output."""
+    client = create_client()
+    store = create_snapshot_store(settings.snapshot_backend, settings.snapshot_path)
+    service = create_availability_service(client, store)
+    try:
+        await service.metadata.refresh()
+        dates = date_range(args.start, args.end)
+        async for chunk in export_lines(
+            service, dates, args.rental_length, args.format
+        ):
+            output.write(chunk)
+            output.flush()
+    finally:
+        await client.close()
+        if store is not None:
+            await store.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="hos-padel")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser(
+        "export", help="Export availability for a date range as NDJSON or CSV"
+    )
+    export_parser.add_argument(
+        "--start", type=_date, required=True, help="First date (DD-MM-YYYY)"
+    )
+    export_parser.add_argument(
+        "--end", type=_date, required=True, help="Last date (DD-MM-YYYY), inclusive"
+    )
+    export_parser.add_argument(
+        "--format", choices=["ndjson", "csv"], default="ndjson", help="Output format"
+    )
+    export_parser.add_argument(
+        "--rental-length",
+        type=int,
+        choices=VALID_RENTAL_LENGTHS,
+        default=DEFAULT_RENTAL_LENGTH,
+        help="Rental duration in minutes",
+    )
+    export_parser.add_argument(
+        "--output", "-o", help="File to write (standard output if omitted)"
+    )
+    args = parser.parse_args(argv)
+
+    if not date_range(args.start, args.end):
+        parser.error("--end must be on or after --start")
+
+    if args.output is None:
+        asyncio.run(export(args, sys.stdout.buffer))
+    else:
+        with open(args.output, "wb") as output:
+            asyncio.run(export(args, output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,91 @@ class Settings(BaseSettings):
     # EZFacility API settings
     ezfacility_location_id: int = 17555
     ezfacility_rental_type_id: int = 271998
+    ezfacility_base_url: str = "https://houseofsport.ezfacility.com"
+
+    # Upstream HTTP connection pool settings
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 20
+    http_keepalive_seconds: float = 30.0
+    http_dns_cache_ttl_seconds: int = 300
+
+    # Upstream throttling settings
+    upstream_max_concurrency: int = 8
+    upstream_rate_per_second: float = 10.0
+    upstream_burst: int = 12
+
+    # Upstream timeout, retry and circuit breaker settings
+    upstream_request_timeout_seconds: float = 10.0
+    upstream_deadline_seconds: float = 20.0
+    upstream_max_attempts: int = 3
+    upstream_retry_base_seconds: float = 0.25
+    upstream_retry_max_seconds: float = 2.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+
+    # Venue metadata settings (courts and per-date opening hours)
+    metadata_ttl_seconds: float = 21600.0
+
+    # Availability cube settings (consecutive days held per rental length)
+    cube_days: int = 62
+
+    # Availability cache settings
+    availability_cache_ttl_seconds: float = 60.0
+    availability_cache_stale_seconds: float = 300.0
+    availability_cache_max_entries: int = 256
+    availability_change_history: int = 50
+
+    # Snapshot store settings ("sqlite" or "none")
+    snapshot_backend: str = "sqlite"
+    snapshot_path: str = "data/snapshots.sqlite3"
+    snapshot_max_age_seconds: float = 600.0
+
+    # Occupancy history settings (needs the analytics extra)
+    history_enabled: bool = True
+    history_path: str = "data/history"
+
+    # Background prefetch settings
+    prefetch_enabled: bool = True
+    prefetch_horizon_days: int = 14
+    prefetch_today_interval_seconds: float = 60.0
+    prefetch_interval_seconds: float = 300.0
+    prefetch_jitter_seconds: float = 15.0
+    prefetch_concurrency: int = 2
+
+    # Split topology: one scraper worker (python -m hos_padel.worker)
+    # publishes to a memory-mapped file that read-only API processes serve
+    api_read_only: bool = False
+    published_path: str = "data/published.bin"
+    # How often the worker writes the file and API processes check it
+    published_interval_seconds: float = 0.5
+    # Older published data is no longer served
+    published_max_age_seconds: float = 1800.0
+
+    # Bulk export settings (days loaded ahead of the one being streamed)
+    export_concurrency: int = 2
+
+    # Availability stream settings
+    stream_keepalive_seconds: float = 15.0
+    stream_max_pending_events: int = 32
+
+    # Response encoding settings
+    response_gzip_level: int = 6
+    response_brotli_quality: int = 5
+    # Bodies smaller than this are sent uncompressed
+    compression_min_size: int = 1024
+    # Path prefix -> level (1-9) used as both gzip level and Brotli quality,
+    # e.g. COMPRESSION_ROUTE_LEVELS='{"/api/v1/availability/range": 9}'
+    compression_route_levels: dict[str, int] = {}
+
+    # HTTP caching settings (Cache-Control per availability route)
+    cache_control_today: str = "public, max-age=15, stale-while-revalidate=30"
+    cache_control_date: str = "public, max-age=30, stale-while-revalidate=60"
+    cache_control_range: str = "public, max-age=30, stale-while-revalidate=60"
+
+    # Prometheus /metrics and request timing
+    metrics_enabled: bool = True
+    # Port the scraper worker serves its own /metrics on
+    worker_metrics_port: int = 9100
 
     # Server settings
     host: str = "0.0.0.0"
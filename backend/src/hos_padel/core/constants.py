@@ -31,6 +31,27 @@ ALL_DAYS_SELECTED = {
 DEFAULT_START_TIME = "08:30"
 DEFAULT_END_TIME = "23:00"
 
+# FilterResults returns rows for up to a week from the requested start date
+UPSTREAM_WINDOW_DAYS = 7
+
+# Maximum number of days served by a single range request
+MAX_RANGE_DAYS = 28
+
+# Maximum number of days covered by a single search request
+MAX_SEARCH_DAYS = 31
+
+# Maximum number of days covered by a single summary request
+MAX_SUMMARY_DAYS = 62
+
+# Maximum number of days covered by a single export
+MAX_EXPORT_DAYS = 366
+
+# Default number of days covered by occupancy history reports
+DEFAULT_HISTORY_DAYS = 90
+
 # Valid rental lengths in minutes
 VALID_RENTAL_LENGTHS = [60, 90]
 DEFAULT_RENTAL_LENGTH = 60
+
+# Rental length actually fetched; longer lengths are derived from its rows
+BASE_RENTAL_LENGTH = min(VALID_RENTAL_LENGTHS)
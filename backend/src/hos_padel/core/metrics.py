@@ -0,0 +1,180 @@
+"""In-process histograms exported in the Prometheus text format."""
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from functools import wraps
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from sub-millisecond builds to slow upstream calls
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+ROW_BUCKETS = (0, 10, 50, 100, 250, 500, 1000, 2500)
+
+# name, type, help, [(label pairs, value)]
+Family = tuple[str, str, str, list[tuple[dict[str, str], float]]]
+
+
+class Histogram:
+    """
+    A labelled histogram with fixed buckets.
+
+    observe() is a bisect and three increments on plain lists, so it is
+    cheap enough for the request and build paths. Cumulative bucket counts
+    are only worked out when the histogram is rendered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values: object) -> None:
+        """Record one observation for the given label values."""
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_values, (counts, total, count) in sorted(
+            self._series.items(), key=lambda item: tuple(map(str, item[0]))
+        ):
+            labels = list(zip(self.labels, map(str, label_values)))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_labels([*labels, ('le', str(bound))])} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Every histogram in the process, rendered together for /metrics."""
+
+    def __init__(self):
+        self._histograms: dict[str, Histogram] = {}
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        histogram = self._histograms[name] = Histogram(
+            name, description, labels, buckets
+        )
+        return histogram
+
+    def render(self, families: Iterable[Family] = ()) -> str:
+        """
+        Return the text exposition of every histogram and extra families.
+
+        Args:
+            families: Counters and gauges read from existing stats() at
+                scrape time, so they cost nothing on the hot path
+        """
+        lines = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        for name, kind, description, samples in families:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels.items())} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs: Iterable[tuple[str, str]]) -> str:
+    """Format label pairs as {a="1",b="2"}, or nothing when there are none."""
+    formatted = [f'{key}="{_escape(value)}"' for key, value in pairs]
+    return "{" + ",".join(formatted) + "}" if formatted else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def timed(histogram: Histogram, *label_values: object) -> Callable:
+    """Decorate a function to observe its run time in seconds."""
+
+    def decorate(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, *label_values)
+
+        return wrapper
+
+    return decorate
+
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "hos_padel_http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template.",
+    ("method", "route", "status"),
+)
+http_response_bytes = registry.histogram(
+    "hos_padel_http_response_size_bytes",
+    "Response body bytes sent, after compression, by route template.",
+    ("route",),
+    SIZE_BUCKETS,
+)
+upstream_request_seconds = registry.histogram(
+    "hos_padel_upstream_request_duration_seconds",
+    "Time for one EZFacility request attempt, by endpoint, court and status.",
+    ("endpoint", "court", "status"),
+)
+upstream_rows = registry.histogram(
+    "hos_padel_upstream_rows_fetched",
+    "Booking rows returned by one planned FilterResults call, by court.",
+    ("court",),
+    ROW_BUCKETS,
+)
+build_seconds = registry.histogram(
+    "hos_padel_build_stage_duration_seconds",
+    "Time spent in each stage of building a day's availability.",
+    ("stage",),
+)
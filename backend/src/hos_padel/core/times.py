@@ -0,0 +1,32 @@
+"""Parsing and formatting of the upstream's date and time strings."""
+
+from datetime import date
+from functools import lru_cache
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@lru_cache(maxsize=2048)
+def parse_minutes(value: str) -> int:
+    """Convert an HH:MM string to minutes since midnight."""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def format_minutes(minutes: int) -> str:
+    """Convert minutes since midnight to an HH:MM string."""
+    hours, minutes = divmod(minutes % MINUTES_PER_DAY, 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+@lru_cache(maxsize=1024)
+def parse_date(value: str) -> int:
+    """Convert a DD/MM/YYYY string to a proleptic Gregorian ordinal."""
+    day, month, year = value.split("/")
+    return date(int(year), int(month), int(day)).toordinal()
+
+
+@lru_cache(maxsize=1024)
+def format_date(ordinal: int) -> str:
+    """Convert a proleptic Gregorian ordinal to a DD/MM/YYYY string."""
+    return date.fromordinal(ordinal).strftime("%d/%m/%Y")
@@ -1,16 +1,113 @@
 """FastAPI application entry point."""
 
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from .api.compression import CompressionMiddleware
+from .api.dependencies import create_availability_service
+from .api.metrics import MetricsMiddleware, service_families
 from .api.routes import router as api_router
+from .core.config import settings
+from .core.metrics import CONTENT_TYPE, registry
+from .scraper.client import create_client
+from .scraper.resilience import UpstreamUnavailableError
+from .services.broadcast import AvailabilityHub
+from .services.changes import ChangeLog
+from .services.history import HistoryRecorder
+from .services.prefetch import AvailabilityPrefetcher
+from .services.publish import PublishedFollower
+from .services.search import AvailabilityIndex
+from .storage import PublishedReader, create_occupancy_history, create_snapshot_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Own the pooled EZFacility client and the services built on it."""
+    if settings.api_read_only:
+        # Serve what the worker publishes; never call the upstream
+        client, store = None, None
+        service = create_availability_service(
+            None, published=PublishedReader(settings.published_path)
+        )
+        follower = PublishedFollower(service)
+    else:
+        client = create_client()
+        store = create_snapshot_store(settings.snapshot_backend, settings.snapshot_path)
+        service = create_availability_service(client, store)
+        follower = None
+    change_log = ChangeLog(
+        max_days=settings.availability_cache_max_entries,
+        max_changes=settings.availability_change_history,
+    )
+    hub = AvailabilityHub(settings.stream_max_pending_events)
+    index = AvailabilityIndex()
+    # Version each stored response before it is broadcast
+    service.cache.add_listener(change_log.record)
+    service.cache.add_listener(hub.publish)
+    service.cache.add_listener(index.record)
+    history = create_occupancy_history(
+        settings.history_enabled,
+        settings.history_path,
+        service.location_id,
+        service.rental_type_id,
+    )
+    # Read-only processes only report; the worker records. Standalone
+    # processes race for the writer lock and the rest only report.
+    recorder = None
+    if history is not None and follower is None and history.claim_writer():
+        recorder = HistoryRecorder(history)
+        service.cache.add_listener(recorder.record)
+        recorder.start()
+    prefetcher = AvailabilityPrefetcher(service, hub=hub)
+    app.state.ezfacility_client = client
+    app.state.availability_service = service
+    app.state.venue_metadata = service.metadata
+    app.state.availability_hub = hub
+    app.state.change_log = change_log
+    app.state.availability_index = index
+    app.state.occupancy_history = history
+    app.state.prefetcher = prefetcher
+    app.state.published_follower = follower
+
+    # Courts first; each date's opening hours load when the date is first built
+    await service.metadata.refresh()
+    # Serve from disk straight after boot instead of stampeding upstream
+    await service.warm_start()
+
+    if follower is not None:
+        follower.start()
+    elif settings.prefetch_enabled:
+        prefetcher.start()
+    try:
+        yield
+    finally:
+        await prefetcher.stop()
+        if follower is not None:
+            await follower.stop()
+        if client is not None:
+            await client.close()
+        if store is not None:
+            await store.close()
+        if recorder is not None:
+            await recorder.stop()
+        if history is not None:
+            history.close()
+
 
 app = FastAPI(
     title="HOS Padel API",
     description="API for checking padel court availability at House of Sport",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Compress large responses; pre-encoded cache hits pass straight through
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
 # CORS middleware - allow all origins for development
 app.add_middleware(
     CORSMiddleware,
@@ -20,12 +117,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so timings cover the other middleware and sizes are as sent
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router)
 
 
+@app.exception_handler(UpstreamUnavailableError)
+async def upstream_unavailable_handler(
+    request: Request, exc: UpstreamUnavailableError
+) -> JSONResponse:
+    """Report an unreachable upstream with no fallback data as 503."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 @app.get("/health", tags=["health"])
 @app.get("/api/health", tags=["health"])
 async def health_check() -> dict:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus text exposition of this process's histograms and counters."""
+    if not settings.metrics_enabled:
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    return PlainTextResponse(
+        registry.render(service_families(request.app.state.availability_service)),
+        media_type=CONTENT_TYPE,
+    )
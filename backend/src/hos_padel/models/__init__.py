@@ -1,13 +1,33 @@
 """Pydantic models for the API."""
 
-from .availability import AvailabilityResponse, TimeSlot
-from .booking import RawBookingSlot
+from .availability import (
+    AvailabilityChanges,
+    AvailabilityRangeResponse,
+    AvailabilityResponse,
+    AvailabilitySummary,
+    AvailabilityUpdate,
+    CompactAvailability,
+    CompactDay,
+    DayAvailabilitySummary,
+    TimeSlot,
+)
+from .booking import BookingSlot
 from .court import Court, CourtStatus
+from .search import SearchMatch, SearchResponse
 
 __all__ = [
+    "AvailabilityChanges",
+    "AvailabilityRangeResponse",
+    "AvailabilityResponse",
+    "AvailabilitySummary",
+    "AvailabilityUpdate",
+    "BookingSlot",
+    "CompactAvailability",
+    "CompactDay",
     "Court",
     "CourtStatus",
-    "RawBookingSlot",
+    "DayAvailabilitySummary",
+    "SearchMatch",
+    "SearchResponse",
     "TimeSlot",
-    "AvailabilityResponse",
 ]
@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel
 
-from .court import CourtStatus
+from .court import Court, CourtStatus
 
 
 class TimeSlot(BaseModel):
@@ -21,3 +21,84 @@ class AvailabilityResponse(BaseModel):
     date: str
     rental_length: int
     slots: list[TimeSlot]
+    # Courts the upstream failed for and that are shown as booked
+    failed_courts: list[int] = []
+    # Courts served from their last-known snapshot because the upstream failed
+    stale_courts: list[int] = []
+    # Increases whenever the day's availability changes
+    version: int | None = None
+
+
+class AvailabilityUpdate(BaseModel):
+    """Cells that changed since the last version sent to stream subscribers."""
+
+    date: str
+    rental_length: int
+    # Only slots with a changed court, each listing only its changed courts
+    slots: list[TimeSlot]
+    failed_courts: list[int] = []
+    stale_courts: list[int] = []
+    version: int | None = None
+
+
+class AvailabilityChanges(AvailabilityUpdate):
+    """Cells that flipped between booked and free since a client's version."""
+
+    since: int
+    # The change history no longer reaches `since`, so slots hold the full day
+    reset: bool = False
+
+
+class AvailabilityRangeResponse(BaseModel):
+    """Response for multi-day availability endpoints."""
+
+    start_date: str
+    rental_length: int
+    days: list[AvailabilityResponse]
+
+
+class DayAvailabilitySummary(BaseModel):
+    """Which of a day's slots have any court free."""
+
+    date: str
+    # Start times (HH:MM) with at least one court free
+    available_times: list[str]
+    # Free (court, slot) cells across every court
+    free_court_slots: int
+
+
+class AvailabilitySummary(BaseModel):
+    """Per-day availability aggregates over a range of dates."""
+
+    rental_length: int
+    days: list[DayAvailabilitySummary]
+    # Dates not loaded yet, which aren't summarised
+    missing_dates: list[str] = []
+
+
+class CompactDay(BaseModel):
+    """A day's availability as one free-slot bitmask per court."""
+
+    date: str
+    # Base64 bitmask per court ID, bit i (byte i // 8, LSB first) set when
+    # slot i is free
+    free: dict[int, str]
+    failed_courts: list[int] = []
+    stale_courts: list[int] = []
+    version: int | None = None
+    # Set when the day's opening hours don't match the shared grid
+    origin: str | None = None
+    slot_count: int | None = None
+
+
+class CompactAvailability(BaseModel):
+    """Availability for one or more days in the compact bitmask format."""
+
+    rental_length: int
+    # Grid shared by every day unless the day overrides it: slot i starts
+    # at origin + i * step_minutes
+    origin: str
+    step_minutes: int
+    slot_count: int
+    courts: list[Court]
+    days: list[CompactDay]
@@ -1,15 +1,43 @@
-"""Booking-related Pydantic models."""
+"""Booking-related models."""
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from typing import Annotated
 
+from pydantic import BeforeValidator, Field
 
-class RawBookingSlot(BaseModel):
-    """Raw booking slot from EZFacility API."""
+from ..core.times import format_date, format_minutes, parse_date, parse_minutes
 
-    resource_id: int = Field(alias="ResourceID")
-    start_date: str = Field(alias="StartDate")
-    end_date: str = Field(alias="EndDate")
-    start_time: str = Field(alias="StartTime")
-    end_time: str = Field(alias="EndTime")
 
-    model_config = {"populate_by_name": True}
+@dataclass(slots=True)
+class BookingSlot:
+    """
+    A free FilterResults row, decoded.
+
+    Validated from the upstream's ResourceID, StartDate, StartTime and
+    EndTime keys (EndDate always equals StartDate), with the date as an
+    ordinal and the times as minutes since midnight, so nothing
+    downstream parses strings again. Constructed positionally elsewhere.
+    """
+
+    court_id: Annotated[int, Field(alias="ResourceID")]
+    # Proleptic Gregorian ordinal of the start date
+    day: Annotated[int, Field(alias="StartDate"), BeforeValidator(parse_date)]
+    # Minutes since midnight
+    start: Annotated[int, Field(alias="StartTime"), BeforeValidator(parse_minutes)]
+    end: Annotated[int, Field(alias="EndTime"), BeforeValidator(parse_minutes)]
+
+    @property
+    def date(self) -> str:
+        """The start date as DD/MM/YYYY."""
+        return format_date(self.day)
+
+    def to_raw(self) -> dict:
+        """Return the row in the upstream's FilterResults shape."""
+        date = format_date(self.day)
+        return {
+            "ResourceID": self.court_id,
+            "StartDate": date,
+            "EndDate": date,
+            "StartTime": format_minutes(self.start),
+            "EndTime": format_minutes(self.end),
+        }
@@ -0,0 +1,37 @@
+"""Occupancy history report models."""
+
+from pydantic import BaseModel
+
+
+class OccupancyHeatmap(BaseModel):
+    """Share of observed court slots that were booked, by weekday and hour."""
+
+    start_date: str
+    end_date: str
+    # Row labels, Monday first
+    weekdays: list[str]
+    # Column labels: hours of the day with any observations
+    hours: list[int]
+    # [weekday][hour] booked share, None where nothing was observed
+    occupancy: list[list[float | None]]
+    # [weekday][hour] court slots observed
+    observed: list[list[int]]
+
+
+class SelloutReport(BaseModel):
+    """How far ahead of their start court slots were booked."""
+
+    start_date: str
+    end_date: str
+    weekdays: list[str]
+    hours: list[int]
+    # [weekday][hour] slots seen free and later booked
+    sold: list[list[int]]
+    # [weekday][hour] mean hours between booking and start
+    mean_lead_hours: list[list[float | None]]
+    # Lead-time bucket labels, e.g. "1-3h"
+    lead_buckets: list[str]
+    # [hour][bucket] slots sold
+    lead_distribution: list[list[int]]
+    # Slots already booked when first seen, so when they sold is unknown
+    sold_before_seen: int
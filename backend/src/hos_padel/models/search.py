@@ -0,0 +1,24 @@
+"""Court search models."""
+
+from pydantic import BaseModel
+
+from .court import Court
+
+
+class SearchMatch(BaseModel):
+    """A start time with enough courts free for the whole rental."""
+
+    date: str
+    start_time: str
+    end_time: str
+    courts: list[Court]
+
+
+class SearchResponse(BaseModel):
+    """Matching start times across the searched dates."""
+
+    duration: int
+    min_courts: int
+    matches: list[SearchMatch]
+    # Dates with no indexed availability yet, which weren't searched
+    missing_dates: list[str] = []
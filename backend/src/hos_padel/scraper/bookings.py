@@ -1,6 +1,14 @@
 """Fetch available booking slots from EZFacility."""
 
+import asyncio
+from collections.abc import AsyncIterator
+
+from ..models.booking import BookingSlot
 from .client import EZFacilityClient
+from .decode import decode_rows
+
+# Rows requested per FilterResults page
+PAGE_SIZE = 500
 
 
 async def fetch_court_bookings(
@@ -15,7 +23,7 @@ async def fetch_court_bookings(
     selected_days: dict[str, bool],
     sort_asc: bool = False,
     current: int = 1,
-    row_count: int = 500,
+    row_count: int = PAGE_SIZE,
 ) -> dict:
     """
     Fetch available booking slots for a specific court.
@@ -51,4 +59,76 @@ async def fetch_court_bookings(
         f"&startTime={start_time}&endTime={end_time}&sortAsc={sort_asc_str}"
     )
 
-    return await client.post("/Rentals/FilterResults", data)
+    return await client.post("/Rentals/FilterResults", data, court_id=court_id)
+
+
+async def iter_court_bookings(
+    client: EZFacilityClient,
+    location_id: int,
+    court_id: int,
+    rental_type_id: int,
+    start_date: str,
+    rental_length: int,
+    start_time: str,
+    end_time: str,
+    selected_days: dict[str, bool],
+    sort_asc: bool = False,
+    page_size: int = PAGE_SIZE,
+) -> AsyncIterator[BookingSlot]:
+    """
+    Yield every available booking slot for a court, across all result pages.
+
+    The first page is fetched to learn the total, then the remaining pages
+    are fetched concurrently and their rows yielded as each page arrives,
+    in no particular order. Each page's rows are validated in one batch.
+    Closing the generator early cancels any pages still in flight.
+
+    Args:
+        client: EZFacility API client
+        location_id: Location ID (e.g., 17555 for House of Sport)
+        court_id: Court/resource ID
+        rental_type_id: Rental type ID (e.g., 271998 for padel)
+        start_date: Start date in DD/MM/YYYY format
+        rental_length: Rental duration in minutes (60 or 90)
+        start_time: Start time in HH:MM format
+        end_time: End time in HH:MM format
+        selected_days: Dict of day names to boolean (which days to include)
+        sort_asc: Sort ascending
+        page_size: Number of results per page
+
+    Yields:
+        The decoded 'rows' of fetch_court_bookings
+    """
+
+    def fetch_page(page: int) -> asyncio.Future:
+        return asyncio.ensure_future(
+            fetch_court_bookings(
+                client=client,
+                location_id=location_id,
+                court_id=court_id,
+                rental_type_id=rental_type_id,
+                start_date=start_date,
+                rental_length=rental_length,
+                start_time=start_time,
+                end_time=end_time,
+                selected_days=selected_days,
+                sort_asc=sort_asc,
+                current=page,
+                row_count=page_size,
+            )
+        )
+
+    first = await fetch_page(1)
+    for row in decode_rows(first["rows"]):
+        yield row
+
+    page_count = -(-first["total"] // page_size)
+    pages = [fetch_page(page) for page in range(2, page_count + 1)]
+    try:
+        for next_page in asyncio.as_completed(pages):
+            result = await next_page
+            for row in decode_rows(result["rows"]):
+                yield row
+    finally:
+        for page in pages:
+            page.cancel()
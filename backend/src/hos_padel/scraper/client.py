@@ -1,11 +1,19 @@
 """Shared async HTTP client for EZFacility API."""
 
+import asyncio
+import time
+from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
 
 import aiohttp
 
-# Base URL for EZFacility API
+from ..core.config import settings
+from ..core.metrics import upstream_request_seconds
+from .decode import loads
+from .resilience import CircuitBreaker, RetryPolicy, is_retryable
+from .throttle import UpstreamGovernor
+
+# Base URL for EZFacility API (requests go to settings.ezfacility_base_url)
 BASE_URL = "https://houseofsport.ezfacility.com"
 
 # Shared headers for all requests
@@ -31,20 +39,156 @@ DEFAULT_HEADERS = {
 class EZFacilityClient:
     """Async HTTP client for EZFacility API with shared session."""
 
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str | None = None,
+        governor: UpstreamGovernor | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        request_timeout: float | None = None,
+    ):
         self.session = session
-        self.base_url = BASE_URL
+        self.base_url = base_url or settings.ezfacility_base_url
+        self.governor = governor
+        self.retry = retry
+        self.breaker = breaker
+        self.timeout = aiohttp.ClientTimeout(
+            total=request_timeout or settings.upstream_request_timeout_seconds
+        )
+
+    async def post(
+        self,
+        endpoint: str,
+        data: str,
+        court_id: int | None = None,
+    ) -> dict:
+        """
+        Make a POST request to the API.
+
+        Each attempt is throttled by the governor and bounded by the
+        per-request timeout. 5xx responses, connection errors and timeouts
+        are retried with exponential backoff and count towards opening the
+        circuit breaker; other errors are raised without affecting it. While
+        the circuit breaker is open, requests fail fast with
+        CircuitOpenError. court_id only labels the attempt's latency metric.
+        """
+        attempt = 1
+        while True:
+            if self.breaker is not None:
+                self.breaker.before_call()
+            try:
+                result = await self._throttled_post(endpoint, data, court_id)
+            except Exception as exc:
+                if self.breaker is not None:
+                    if is_retryable(exc):
+                        self.breaker.record_failure()
+                    else:
+                        # A 4xx or bad body says nothing about availability,
+                        # so it must not close (or reset) the circuit either
+                        self.breaker.abandon_call()
+                if (
+                    not is_retryable(exc)
+                    or self.retry is None
+                    or attempt >= self.retry.max_attempts
+                ):
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                if self.breaker is not None:
+                    self.breaker.abandon_call()
+                raise
+
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    async def _throttled_post(
+        self,
+        endpoint: str,
+        data: str,
+        court_id: int | None,
+    ) -> dict:
+        """Make one attempt, holding a governor slot if one is configured."""
+        if self.governor is None:
+            return await self._post(endpoint, data, court_id)
 
-    async def post(self, endpoint: str, data: str) -> dict:
-        """Make a POST request to the API."""
+        async with self.governor.slot():
+            return await self._post(endpoint, data, court_id)
+
+    async def _post(self, endpoint: str, data: str, court_id: int | None) -> dict:
         url = f"{self.base_url}{endpoint}"
-        async with self.session.post(url, headers=DEFAULT_HEADERS, data=data) as response:
-            response.raise_for_status()
-            return await response.json()
+        # Timed from the request, so waiting for a governor slot isn't counted
+        started = time.perf_counter()
+        status = "error"
+        try:
+            async with self.session.post(
+                url, headers=DEFAULT_HEADERS, data=data, timeout=self.timeout
+            ) as response:
+                status = response.status
+                response.raise_for_status()
+                return loads(await response.read())
+        except TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            upstream_request_seconds.observe(
+                time.perf_counter() - started,
+                endpoint,
+                "" if court_id is None else court_id,
+                status,
+            )
+
+    async def close(self) -> None:
+        """Close the underlying session and its connection pool."""
+        await self.session.close()
+
+
+def create_client(
+    base_url: str | None = None,
+    limit: int | None = None,
+    limit_per_host: int | None = None,
+    keepalive_timeout: float | None = None,
+    dns_cache_ttl: int | None = None,
+) -> EZFacilityClient:
+    """
+    Create a long-lived client backed by a persistent connection pool.
+
+    The caller owns the client and must close() it. Connections are kept
+    alive between requests and DNS lookups are cached, so repeated calls
+    skip the TCP and TLS handshakes. Requests are throttled by an
+    UpstreamGovernor and guarded by retries and a circuit breaker, all
+    configured from settings. Must be called from a running loop.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit or settings.http_pool_limit,
+        limit_per_host=limit_per_host or settings.http_pool_limit_per_host,
+        keepalive_timeout=keepalive_timeout or settings.http_keepalive_seconds,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl or settings.http_dns_cache_ttl_seconds,
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    governor = UpstreamGovernor(
+        max_concurrency=settings.upstream_max_concurrency,
+        rate_per_second=settings.upstream_rate_per_second,
+        burst=settings.upstream_burst,
+    )
+    retry = RetryPolicy(
+        max_attempts=settings.upstream_max_attempts,
+        base_delay=settings.upstream_retry_base_seconds,
+        max_delay=settings.upstream_retry_max_seconds,
+    )
+    breaker = CircuitBreaker(
+        failure_threshold=settings.circuit_failure_threshold,
+        reset_timeout=settings.circuit_reset_seconds,
+    )
+    return EZFacilityClient(session, base_url, governor, retry, breaker)
 
 
 @asynccontextmanager
 async def get_client() -> AsyncGenerator[EZFacilityClient, None]:
-    """Context manager for creating an EZFacility client with a shared session."""
+    """Context manager for a short-lived client, for scripts outside the app."""
     async with aiohttp.ClientSession() as session:
         yield EZFacilityClient(session)
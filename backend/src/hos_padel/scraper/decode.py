@@ -0,0 +1,28 @@
+"""Decode FilterResults responses into typed booking rows."""
+
+import json
+
+from pydantic import TypeAdapter
+
+from ..models.booking import BookingSlot
+
+try:
+    import orjson
+except ImportError:  # optional: pip install 'hos-padel-api[fast-json]'
+    orjson = None
+
+# Parses a JSON body from bytes, with orjson when it is installed
+loads = orjson.loads if orjson is not None else json.loads
+
+_BOOKING_ROWS = TypeAdapter(list[BookingSlot])
+
+
+def decode_rows(rows: list[dict]) -> list[BookingSlot]:
+    """
+    Validate a page's rows in one batch.
+
+    Raises:
+        pydantic.ValidationError: If a row is missing a key or has a
+            malformed date or time
+    """
+    return _BOOKING_ROWS.validate_python(rows)
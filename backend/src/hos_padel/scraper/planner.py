@@ -0,0 +1,166 @@
+"""Plan the FilterResults calls needed to cover a set of wanted dates."""
+
+import datetime
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+from ..core.constants import (
+    ALL_DAYS_SELECTED,
+    DEFAULT_END_TIME,
+    DEFAULT_START_TIME,
+    UPSTREAM_WINDOW_DAYS,
+)
+from ..core.times import parse_date
+from ..models.booking import BookingSlot
+
+# A (DD/MM/YYYY date, court ID, rental length) the caller needs rows for
+Cell = tuple[str, int, int]
+
+# selected_days keys indexed by datetime.weekday()
+WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+
+@dataclass(frozen=True)
+class FetchCall:
+    """One planned fetch_court_bookings call and the dates it covers."""
+
+    court_id: int
+    rental_length: int
+    start_date: str
+    start_time: str
+    end_time: str
+    dates: tuple[str, ...]
+
+    @property
+    def selected_days(self) -> dict[str, bool]:
+        """Weekday mask selecting exactly the covered dates."""
+        weekdays = {
+            WEEKDAYS[datetime.date.fromordinal(parse_date(date)).weekday()]
+            for date in self.dates
+        }
+        return {day: day in weekdays for day in ALL_DAYS_SELECTED}
+
+
+class QueryPlanner:
+    """
+    Turn wanted (date, court, rental_length) cells into upstream calls.
+
+    FilterResults returns up to UPSTREAM_WINDOW_DAYS days from its start
+    date, filtered by a weekday mask and a time window. For each court and
+    rental length the planner greedily starts a window at the earliest
+    uncovered date, which gives the fewest calls, and then narrows each
+    call's mask to the dates actually wanted and its time window to their
+    opening hours. Rows for dates or times that would be thrown away are
+    never requested.
+
+    The planner also counts rows fetched against rows used, so the plans
+    can be tuned from /admin/planner.
+    """
+
+    def __init__(self):
+        self.plans = 0
+        self.calls = 0
+        self.cells_wanted = 0
+        self.cells_cached = 0
+        self.rows_fetched = 0
+        self.rows_used = 0
+
+    def plan(
+        self,
+        wanted: Iterable[Cell],
+        cached: Iterable[Cell] = (),
+        day_hours: Mapping[str, tuple[str, str]] | None = None,
+    ) -> list[FetchCall]:
+        """
+        Plan the calls covering every wanted cell that isn't already cached.
+
+        Args:
+            wanted: Cells the caller needs
+            cached: Cells that are already available and needn't be fetched
+            day_hours: Opening (start, end) HH:MM per date; defaults apply otherwise
+
+        Returns:
+            Calls ordered by court, rental length and start date
+        """
+        wanted = set(wanted)
+        missing = wanted - set(cached)
+
+        dates_by_key: dict[tuple[int, int], set[str]] = {}
+        for date, court_id, rental_length in missing:
+            dates_by_key.setdefault((court_id, rental_length), set()).add(date)
+
+        calls = []
+        for (court_id, rental_length), dates in sorted(dates_by_key.items()):
+            for window in self._windows(dates):
+                start_time, end_time = self._time_window(window, day_hours or {})
+                calls.append(
+                    FetchCall(
+                        court_id=court_id,
+                        rental_length=rental_length,
+                        start_date=window[0],
+                        start_time=start_time,
+                        end_time=end_time,
+                        dates=window,
+                    )
+                )
+
+        self.plans += 1
+        self.calls += len(calls)
+        self.cells_wanted += len(wanted)
+        self.cells_cached += len(wanted) - len(missing)
+        return calls
+
+    @staticmethod
+    def _windows(dates: set[str]) -> list[tuple[str, ...]]:
+        """Group dates into the fewest upstream windows, earliest first."""
+        ordered = sorted(dates, key=parse_date)
+        windows = []
+        while ordered:
+            end = parse_date(ordered[0]) + UPSTREAM_WINDOW_DAYS
+            window = [date for date in ordered if parse_date(date) < end]
+            windows.append(tuple(window))
+            ordered = ordered[len(window) :]
+        return windows
+
+    @staticmethod
+    def _time_window(
+        dates: tuple[str, ...],
+        day_hours: Mapping[str, tuple[str, str]],
+    ) -> tuple[str, str]:
+        """Return the smallest time window spanning every date's opening hours."""
+        hours = [
+            day_hours.get(date, (DEFAULT_START_TIME, DEFAULT_END_TIME))
+            for date in dates
+        ]
+        # HH:MM strings compare in time order
+        return min(start for start, _ in hours), max(end for _, end in hours)
+
+    def record_rows(self, call: FetchCall, rows: list[BookingSlot]) -> None:
+        """Count a call's fetched rows and how many fall on its wanted dates."""
+        days = {parse_date(date) for date in call.dates}
+        self.rows_fetched += len(rows)
+        self.rows_used += sum(row.day in days for row in rows)
+
+    def stats(self) -> dict:
+        """Return planning and row usage counters."""
+        return {
+            "plans": self.plans,
+            "calls": self.calls,
+            "cells_wanted": self.cells_wanted,
+            "cells_cached": self.cells_cached,
+            "rows_fetched": self.rows_fetched,
+            "rows_used": self.rows_used,
+            "rows_used_ratio": (
+                round(self.rows_used / self.rows_fetched, 3)
+                if self.rows_fetched
+                else None
+            ),
+        }
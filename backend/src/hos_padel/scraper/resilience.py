@@ -0,0 +1,118 @@
+"""Retry and circuit-breaker policy for upstream requests."""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+
+import aiohttp
+
+
+class UpstreamUnavailableError(Exception):
+    """EZFacility could not be reached and no fallback data was available."""
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """The circuit breaker is open, so the request was not attempted."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return whether a failed request is worth retrying."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Return the sleep before retry number `attempt` (1-based)."""
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast with CircuitOpenError. Once `reset_timeout` has passed
+    a single trial call is let through (half-open); its success closes the
+    circuit and its failure re-opens it. `clock` is the monotonic time
+    source the timeout is measured with.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        return self.state == self.OPEN
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead."""
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("EZFacility circuit breaker is open")
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError("EZFacility circuit breaker is half-open")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the circuit after a call that reached the upstream."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+        self._trial_in_flight = False
+
+    def abandon_call(self) -> None:
+        """Forget a call that ended without an outcome (e.g. cancelled or a 4xx)."""
+        self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        """Return breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,193 @@
+"""Rate limiting and prioritised concurrency control for upstream requests."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Upstream request priority; lower values are admitted first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "upstream_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def upstream_priority(priority: Priority) -> Iterator[None]:
+    """
+    Run upstream requests made in this context at the given priority.
+
+    Tasks created inside the block inherit the priority, so it only needs
+    to be set where work starts (e.g. the prefetcher), not threaded
+    through every call.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Return the upstream priority of the current context."""
+    return _priority.get()
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Return seconds until a token is available (0 if one is now)."""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def take(self) -> None:
+        """Consume a token; call only when delay() is 0."""
+        self._tokens -= 1
+
+
+class _WaitStats:
+    """Queue wait counters for one priority."""
+
+    __slots__ = ("max_wait", "queued", "requests", "total_wait")
+
+    def __init__(self):
+        self.requests = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, queued: bool) -> None:
+        self.requests += 1
+        self.queued += queued
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queued": self.queued,
+            "mean_wait_ms": (
+                round(self.total_wait / self.requests * 1000, 2)
+                if self.requests
+                else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+class UpstreamGovernor:
+    """
+    Admit upstream requests under a concurrency cap and a token-bucket rate.
+
+    Requests that can't start immediately wait in a priority queue, so an
+    interactive request is admitted ahead of queued background work. Each
+    admission takes one concurrency slot and one rate token.
+    """
+
+    def __init__(self, max_concurrency: int, rate_per_second: float, burst: int):
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._stats = {priority: _WaitStats() for priority in Priority}
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority | None = None) -> AsyncIterator[None]:
+        """Hold an upstream slot for the duration of the block."""
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        queued = await self._acquire(priority)
+        self._stats[priority].record(time.monotonic() - started, queued)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> bool:
+        """Wait for admission; return whether the request had to queue."""
+        if (
+            not self._waiters
+            and self._active < self.max_concurrency
+            and self.bucket.delay() == 0
+        ):
+            self.bucket.take()
+            self._active += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Admitted just as we were cancelled: hand the slot back
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        return True
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued requests while slots and tokens allow."""
+        while self._waiters and self._active < self.max_concurrency:
+            delay = self.bucket.delay()
+            if delay > 0:
+                if self._wakeup is None:
+                    self._wakeup = asyncio.get_running_loop().call_later(
+                        delay, self._wake
+                    )
+                return
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.cancelled():
+                continue
+            self.bucket.take()
+            self._active += 1
+            future.set_result(None)
+
+    def _wake(self) -> None:
+        self._wakeup = None
+        self._dispatch()
+
+    def stats(self) -> dict:
+        """Return admission and queue wait counters per priority."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "active": self._active,
+            "queued": len(self._waiters),
+            "priorities": {
+                priority.name.lower(): stats.as_dict()
+                for priority, stats in self._stats.items()
+            },
+        }
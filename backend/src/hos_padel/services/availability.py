@@ -1,33 +1,292 @@
 """Availability service for fetching and processing court availability."""
 
 import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from ..core.config import settings
 from ..core.constants import (
-    ALL_DAYS_SELECTED,
-    COURT_ID_TO_NAME,
-    COURTS,
-    DEFAULT_END_TIME,
+    BASE_RENTAL_LENGTH,
     DEFAULT_RENTAL_LENGTH,
     DEFAULT_START_TIME,
+    VALID_RENTAL_LENGTHS,
 )
-from ..models.availability import AvailabilityResponse, TimeSlot
-from ..models.court import CourtStatus
-from ..scraper.bookings import fetch_court_bookings
-from ..scraper.client import get_client
+from ..core.metrics import build_seconds, timed, upstream_rows
+from ..core.times import format_minutes, parse_date
+from ..models.availability import (
+    AvailabilityRangeResponse,
+    AvailabilityResponse,
+    AvailabilitySummary,
+    DayAvailabilitySummary,
+    TimeSlot,
+)
+from ..models.booking import BookingSlot
+from ..scraper.bookings import iter_court_bookings
+from ..scraper.client import EZFacilityClient, get_client
+from ..scraper.planner import FetchCall, QueryPlanner
+from ..scraper.resilience import UpstreamUnavailableError
+from ..scraper.throttle import Priority, upstream_priority
+from ..storage import CourtSnapshot, PublishedEntry, PublishedReader, SnapshotStore
+from .compact import to_compact
+from .cube import AvailabilityCube
+from .encoding import EncodedBody
+from .metadata import VenueMetadata
+from .occupancy import derive_rows
+from .singleflight import SingleFlight
+from .slot_grid import SlotGrid
+
+logger = logging.getLogger(__name__)
+
+# (location_id, rental_type_id, date, rental_length)
+CacheKey = tuple[int, int, str, int]
+
+# A date's responses for every rental length, and the wall-clock time the
+# oldest of the data they were built from was fetched
+LoadedDay = tuple[dict[int, AvailabilityResponse], float]
+
+# Loads a cache entry's value, returning it and when its data was fetched
+Loader = Callable[[], Awaitable[tuple[AvailabilityResponse, float]]]
+
+# Encoded multi-day bodies (ranges, compact responses) kept for reuse
+COMBINED_BODY_CACHE_SIZE = 32
+
+
+@dataclass
+class _CacheEntry:
+    """A cached availability response and when it was stored."""
+
+    value: AvailabilityResponse
+    stored_at: float
+    ttl_seconds: float
+    # Wall-clock time the value was fetched, for Last-Modified
+    fetched_at: float
+    # The value encoded as JSON, made on first use
+    body: EncodedBody | None = None
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """An encoded cached response and when its data was fetched."""
+
+    body: EncodedBody
+    last_modified: float
+    # Wall-clock time the cached value stops being fresh, when known
+    expires_at: float | None = None
+
+
+class AvailabilityCache:
+    """
+    Bounded LRU cache of availability responses with stale-while-revalidate.
+
+    Entries younger than the TTL are served as-is. Entries past the TTL but
+    within the stale window are served immediately while a single background
+    task refreshes them. Anything older is treated as a miss. Listeners are
+    called with every value stored, whichever path refreshed it.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._refreshing: dict[CacheKey, asyncio.Task] = {}
+        self._listeners: list[Callable[[AvailabilityResponse], None]] = []
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_listener(self, listener: Callable[[AvailabilityResponse], None]) -> None:
+        """Call listener with every value stored from now on."""
+        self._listeners.append(listener)
+
+    def get(self, key: CacheKey) -> AvailabilityResponse | None:
+        """Return a fresh cached value without loading or counting a miss."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at >= entry.ttl_seconds:
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(
+        self,
+        key: CacheKey,
+        value: AvailabilityResponse,
+        ttl_seconds: float | None = None,
+        fetched_at: float | None = None,
+        body: EncodedBody | None = None,
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        fetched_at is when the value's data was fetched, if not just now
+        (e.g. rebuilt from a snapshot or published by the worker). The
+        default TTL counts from it, so older data is fresh for less time.
+        body may be given when the value was encoded elsewhere.
+        """
+        # Never let a partial response replace or outlive complete data
+        if value.failed_courts:
+            return
+
+        now = time.time()
+        if fetched_at is None:
+            fetched_at = now
+        if ttl_seconds is None:
+            ttl_seconds = max(0.0, self.ttl_seconds - (now - fetched_at))
+        self._entries[key] = _CacheEntry(
+            value=value,
+            stored_at=time.monotonic(),
+            ttl_seconds=ttl_seconds,
+            fetched_at=fetched_at,
+            body=body,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        for listener in self._listeners:
+            listener(value)
+
+    def encoded(self, key: CacheKey, value: AvailabilityResponse) -> CachedBody | None:
+        """
+        Return value encoded as JSON if it is the value stored under key.
+
+        The encoding is made once per stored value. None when the entry
+        holds anything else, e.g. an expired value whose refetch came back
+        partial and so wasn't stored.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.value is not value:
+            return None
+        if entry.body is None:
+            entry.body = EncodedBody(entry.value.model_dump_json().encode())
+        return CachedBody(
+            body=entry.body,
+            last_modified=entry.fetched_at,
+            expires_at=entry.fetched_at + entry.ttl_seconds,
+        )
+
+    async def get_or_load(
+        self,
+        key: CacheKey,
+        loader: Loader,
+        refresher: Loader | None = None,
+    ) -> AvailabilityResponse:
+        """
+        Return the cached value for key, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Returns the value and when its data was fetched
+            refresher: Used instead of loader to refresh a stale entry
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < entry.ttl_seconds:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < entry.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._schedule_refresh(key, refresher or loader)
+                return entry.value
+
+        self.misses += 1
+        value, fetched_at = await loader()
+        self.put(key, value, fetched_at=fetched_at)
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: CacheKey,
+        loader: Loader,
+    ) -> None:
+        """Start a background refresh for key unless one is already running."""
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                # Someone already has a usable answer, so don't jump the queue
+                with upstream_priority(Priority.BACKGROUND):
+                    value, fetched_at = await loader()
+                self.put(key, value, fetched_at=fetched_at)
+                self.refreshes += 1
+            except Exception:
+                self.refresh_errors += 1
+                logger.exception("Background refresh failed for %s", key)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> dict:
+        """Return cache counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "evictions": self.evictions,
+            "refreshing": len(self._refreshing),
+        }
 
 
 class AvailabilityService:
-    """Service for fetching and processing court availability."""
+    """
+    Service for fetching and processing court availability.
+
+    Given a PublishedReader, the service is read-only: days come from the
+    file the scraper worker publishes and the upstream is never called.
+    """
 
     def __init__(
         self,
         location_id: int | None = None,
         rental_type_id: int | None = None,
+        cache: AvailabilityCache | None = None,
+        client: EZFacilityClient | None = None,
+        store: SnapshotStore | None = None,
+        metadata: VenueMetadata | None = None,
+        published: PublishedReader | None = None,
     ):
         self.location_id = location_id or settings.ezfacility_location_id
         self.rental_type_id = rental_type_id or settings.ezfacility_rental_type_id
+        self.cache = cache
+        self.client = client
+        self.store = store
+        # Without a client of its own this uses the hard-coded courts and hours
+        self.metadata = metadata or VenueMetadata()
+        self.published = published
+        self.flights: SingleFlight[tuple, list[BookingSlot]] = SingleFlight()
+        self.planner = QueryPlanner()
+        self.cube = AvailabilityCube()
+        self._combined_bodies: OrderedDict[tuple[str, ...], EncodedBody] = OrderedDict()
 
     async def get_availability_for_date(
         self,
@@ -44,138 +303,738 @@ class AvailabilityService:
         Returns:
             AvailabilityResponse with time slots and court availability
         """
+        if self.cache is None:
+            responses, _ = await self._load_day(date)
+            return responses[rental_length]
+
+        return await self.cache.get_or_load(
+            self._cache_key(date, rental_length),
+            lambda: self._load_availability_for_date(date, rental_length),
+            # A stale entry is refreshed from the upstream, not a snapshot
+            lambda: self._load_availability_for_date(
+                date, rental_length, use_snapshot=False
+            ),
+        )
+
+    async def get_availability_uncached(
+        self,
+        date: str,
+        rental_length: int = DEFAULT_RENTAL_LENGTH,
+    ) -> AvailabilityResponse:
+        """
+        Get availability for a date without storing it in the cache or cube.
+
+        A fresh cached day is still used. For bulk reads (e.g. exports)
+        that would otherwise evict the days live requests need.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(date, rental_length))
+            if cached is not None:
+                return cached
+        responses, _ = await self._load_day(date, write_cube=False)
+        return responses[rental_length]
+
+    async def refresh_availability(
+        self,
+        dates: list[str],
+        ttl_seconds: dict[str, float] | None = None,
+    ) -> dict[str, dict[int, AvailabilityResponse]]:
+        """
+        Fetch availability for dates and cache it for every rental length.
+
+        The dates are fetched together, so the planner covers up to a
+        week of them with one call per court.
+
+        Args:
+            dates: Dates in DD/MM/YYYY format
+            ttl_seconds: How long each date's entries stay fresh (cache default
+                for dates not given)
+
+        Returns:
+            The freshly fetched AvailabilityResponse for each date and rental
+            length; a date with failed courts lists them and isn't cached
+        """
+        await self.metadata.refresh(dates)
+        loaded = await self._fetch_days(dates)
+        ttl_seconds = ttl_seconds or {}
+        for date, (responses, fetched_at) in loaded.items():
+            self._cache_day(responses, ttl_seconds.get(date), fetched_at)
+        return {date: responses for date, (responses, _) in loaded.items()}
+
+    async def warm_start(self) -> int:
+        """
+        Fill the cache from fresh snapshots so the process can serve at boot.
+
+        Returns:
+            Number of (date, rental_length) responses loaded into the cache
+        """
+        if self.published is not None:
+            return self.load_published()
+        if self.store is None or self.cache is None:
+            return 0
+
+        snapshots = await self.store.load_since(
+            self.location_id,
+            self.rental_type_id,
+            datetime.now().strftime("%d/%m/%Y"),
+            time.time() - settings.snapshot_max_age_seconds,
+        )
+
+        by_date: dict[str, list[CourtSnapshot]] = {}
+        for snapshot in snapshots:
+            if snapshot.rental_length == BASE_RENTAL_LENGTH:
+                by_date.setdefault(snapshot.date, []).append(snapshot)
+
+        await self.metadata.refresh(by_date)
+        loaded = 0
+        for date, day_snapshots in by_date.items():
+            responses = self._build_from_snapshots(date, day_snapshots)
+            if responses is not None:
+                self._cache_day(
+                    responses, fetched_at=min(s.fetched_at for s in day_snapshots)
+                )
+                loaded += len(responses)
+
+        return loaded
+
+    async def _load_availability_for_date(
+        self,
+        date: str,
+        rental_length: int,
+        use_snapshot: bool = True,
+    ) -> tuple[AvailabilityResponse, float]:
+        """Load a date, caching the rental lengths that weren't asked for."""
+        responses, fetched_at = await self._load_day(date, use_snapshot)
+        self._cache_day(
+            {length: r for length, r in responses.items() if length != rental_length},
+            fetched_at=fetched_at,
+        )
+        return responses[rental_length], fetched_at
+
+    async def _load_day(
+        self,
+        date: str,
+        use_snapshot: bool = True,
+        write_cube: bool = True,
+    ) -> LoadedDay:
+        """
+        Build a date's availability for every rental length from one fetch.
+
+        Only BASE_RENTAL_LENGTH is fetched (or read from a fresh snapshot);
+        longer lengths are derived from its per-court occupancy timeline.
+        Data read from snapshots or the published file keeps its original
+        fetch time. Without write_cube the built day is only returned.
+        """
+        if self.published is not None:
+            responses, fetched_at = self._load_published(date, write_cube)
+            if self._all_failed(responses):
+                raise UpstreamUnavailableError(f"No published availability for {date}")
+            return responses, fetched_at
+
+        await self.metadata.refresh([date])
+        if use_snapshot and self.store is not None:
+            snapshots = await self.store.load_day(
+                self.location_id, self.rental_type_id, date, BASE_RENTAL_LENGTH
+            )
+            fresh_after = time.time() - settings.snapshot_max_age_seconds
+            fresh = [s for s in snapshots if s.fetched_at > fresh_after]
+            responses = self._build_from_snapshots(date, fresh, write_cube)
+            if responses is not None:
+                return responses, min(s.fetched_at for s in fresh)
+
         # Fetch raw bookings from all courts concurrently
-        raw_slots = await self._fetch_all_court_bookings(date, rental_length)
+        loaded = await self._fetch_days([date], write_cube=write_cube)
+        responses, fetched_at = loaded[date]
+        if self._all_failed(responses):
+            raise UpstreamUnavailableError(f"No availability data for {date}")
+        return responses, fetched_at
+
+    async def get_availability_for_range(
+        self,
+        start_date: str,
+        days: int,
+        rental_length: int = DEFAULT_RENTAL_LENGTH,
+    ) -> AvailabilityRangeResponse:
+        """
+        Get availability for consecutive days starting at start_date.
+
+        Days already in the cache are reused. The rest are fetched with as
+        few upstream calls per court as the planner allows, the rows are
+        bucketed by StartDate and every day's slots are built from that
+        single pass.
+
+        Args:
+            start_date: First date in DD/MM/YYYY format
+            days: Number of consecutive days to return
+            rental_length: Rental duration in minutes (60 or 90)
+
+        Returns:
+            AvailabilityRangeResponse with one AvailabilityResponse per day
+        """
+        start = datetime.strptime(start_date, "%d/%m/%Y")
+        dates = [
+            (start + timedelta(days=offset)).strftime("%d/%m/%Y")
+            for offset in range(days)
+        ]
+
+        # Days already fresh in the cache are served as they are
+        cached: dict[str, AvailabilityResponse] = {}
+        if self.cache is not None:
+            for date in dates:
+                response = self.cache.get(self._cache_key(date, rental_length))
+                if response is not None:
+                    cached[date] = response
+            self.cache.hits += len(cached)
+
+        fetched: dict[str, AvailabilityResponse] = {}
+        missing = [date for date in dates if date not in cached]
+        if missing and self.published is not None:
+            loaded = [self._load_published(date) for date in missing]
+        elif missing:
+            await self.metadata.refresh(missing)
+            loaded = list((await self._fetch_days(dates, cached)).values())
+
+        if missing:
+            if not cached and all(
+                self._all_failed(responses) for responses, _ in loaded
+            ):
+                raise UpstreamUnavailableError(
+                    f"No availability data from {start_date}"
+                )
+
+            if self.cache is not None:
+                self.cache.misses += len(missing)
+                for responses, fetched_at in loaded:
+                    self._cache_day(responses, fetched_at=fetched_at)
+
+            fetched = {
+                date: responses[rental_length]
+                for date, (responses, _) in zip(missing, loaded)
+            }
+
+        return AvailabilityRangeResponse(
+            start_date=start_date,
+            rental_length=rental_length,
+            days=[cached.get(date) or fetched[date] for date in dates],
+        )
+
+    def get_availability_summary(
+        self,
+        start_date: str,
+        days: int,
+        rental_length: int = DEFAULT_RENTAL_LENGTH,
+    ) -> AvailabilitySummary:
+        """
+        Summarise which slots have a free court on consecutive days.
+
+        Answered from the cube without fetching; dates it doesn't hold are
+        listed as missing.
+
+        Args:
+            start_date: First date in DD/MM/YYYY format
+            days: Number of consecutive days
+            rental_length: Rental duration in minutes (60 or 90)
+        """
+        start = datetime.strptime(start_date, "%d/%m/%Y")
+        dates = [
+            (start + timedelta(days=offset)).strftime("%d/%m/%Y")
+            for offset in range(days)
+        ]
+        summaries = self.cube.summarise(dates, rental_length)
+
+        return AvailabilitySummary(
+            rental_length=rental_length,
+            days=[
+                DayAvailabilitySummary(
+                    date=date,
+                    available_times=[
+                        format_minutes(summary.day.origin + index * summary.day.step)
+                        for index in range(summary.day.slot_count)
+                        if summary.any_free >> index & 1
+                    ],
+                    free_court_slots=summary.free_cells,
+                )
+                for date, summary in summaries.items()
+            ],
+            missing_dates=[date for date in dates if date not in summaries],
+        )
+
+    def load_published(self) -> int:
+        """
+        Take in the days the worker has published since the last call.
+
+        Each changed day is cached with the worker's encoded JSON, fetch
+        time and expiry, so every API process serves the same bytes and
+        validators, and is written to the cube.
+
+        Returns:
+            Number of (date, rental_length) responses taken in
+        """
+        entries = self.published.refresh()
+        if entries:
+            courts = self.published.meta.get("courts", {})
+            self.metadata.set_courts({int(k): name for k, name in courts.items()})
+
+        now = time.time()
+        for entry in entries:
+            response = self._from_published(entry)
+            if self.cache is not None:
+                self.cache.put(
+                    self._cache_key(entry.date, entry.rental_length),
+                    response,
+                    ttl_seconds=max(0.0, entry.expires_at - now),
+                    fetched_at=entry.fetched_at,
+                    body=EncodedBody(entry.body),
+                )
+        return len(entries)
+
+    def cached_day_body(self, response: AvailabilityResponse) -> CachedBody | None:
+        """
+        Return a day's encoded response if it is the one cached.
+
+        None when it isn't cached (e.g. a partial response, which leaves an
+        older value in place), so the caller encodes the value it holds.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.encoded(
+            self._cache_key(response.date, response.rental_length), response
+        )
+
+    def cached_range_body(
+        self,
+        start_date: str,
+        responses: list[AvailabilityResponse],
+        rental_length: int,
+    ) -> CachedBody | None:
+        """
+        Return an encoded range response spliced from the cached day bodies.
 
-        # Filter to only the requested date
-        date_slots = [s for s in raw_slots if s["StartDate"] == date]
+        The days' JSON is joined as-is rather than re-encoded, and recent
+        ranges are kept so their compressed variants are reused. None if
+        any day isn't the one cached (e.g. a partial response).
+        """
+        return self._combined_body(
+            "range",
+            responses,
+            lambda days: (
+                b'{"start_date":%s,"rental_length":%d,"days":[%s]}'
+                % (
+                    json.dumps(start_date).encode(),
+                    rental_length,
+                    b",".join(day.body.identity for day in days),
+                )
+            ),
+        )
+
+    def cached_compact_body(
+        self,
+        responses: list[AvailabilityResponse],
+        rental_length: int,
+    ) -> CachedBody | None:
+        """
+        Return the compact encoding of cached responses.
+
+        None if any response isn't the one cached (e.g. a partial response).
+        """
+        return self._combined_body(
+            "compact",
+            responses,
+            lambda _: to_compact(responses, rental_length).model_dump_json().encode(),
+        )
+
+    def _combined_body(
+        self,
+        kind: str,
+        responses: list[AvailabilityResponse],
+        encode: Callable[[list[CachedBody]], bytes],
+    ) -> CachedBody | None:
+        """
+        Return a body built from cached responses, encoding it once per version.
+
+        The body is keyed by the ETags of the responses' own cached bodies
+        and encoded from those responses, so a reused body always matches
+        what is served. None if any response isn't the one cached.
+        """
+        days = [self.cached_day_body(response) for response in responses]
+        if not days or None in days:
+            return None
 
-        # Create 30-minute time slots
-        time_slots = self._create_daily_slots(date)
+        key = (kind, *(day.body.etag for day in days))
+        body = self._combined_bodies.get(key)
+        if body is None:
+            body = self._combined_bodies[key] = EncodedBody(encode(days))
+            while len(self._combined_bodies) > COMBINED_BODY_CACHE_SIZE:
+                self._combined_bodies.popitem(last=False)
+        self._combined_bodies.move_to_end(key)
+
+        return CachedBody(
+            body=body,
+            last_modified=max(day.last_modified for day in days),
+        )
+
+    def _cache_key(self, date: str, rental_length: int) -> CacheKey:
+        """Build the cache key for a date and rental length."""
+        return (self.location_id, self.rental_type_id, date, rental_length)
+
+    def _cache_day(
+        self,
+        responses: dict[int, AvailabilityResponse],
+        ttl_seconds: float | None = None,
+        fetched_at: float | None = None,
+    ) -> None:
+        """Cache a date's responses for each rental length."""
+        if self.cache is None:
+            return
+        for rental_length, response in responses.items():
+            self.cache.put(
+                self._cache_key(response.date, rental_length),
+                response,
+                ttl_seconds,
+                fetched_at=fetched_at,
+            )
+
+    def _all_failed(self, responses: dict[int, AvailabilityResponse]) -> bool:
+        """Whether no court had any data for a date."""
+        response = next(iter(responses.values()))
+        return len(response.failed_courts) >= len(self.metadata.court_ids)
+
+    def _load_published(self, date: str, write_cube: bool = True) -> LoadedDay:
+        """
+        Read a date's responses from the worker's published file.
+
+        A date the worker hasn't published, or not recently, is built with
+        every court failed, as if the upstream hadn't answered.
+        """
+        self.load_published()
+        now = time.time()
+        entries = [self.published.get(date, length) for length in VALID_RENTAL_LENGTHS]
+        if any(
+            entry is None or entry.fetched_at < now - settings.published_max_age_seconds
+            for entry in entries
+        ):
+            responses = self._build_day_responses(
+                date, [], failed_courts=self.metadata.court_ids, write_cube=write_cube
+            )
+            return responses, now
+        return (
+            {
+                entry.rental_length: self._from_published(entry, write_cube)
+                for entry in entries
+            },
+            min(entry.fetched_at for entry in entries),
+        )
+
+    def _from_published(
+        self,
+        entry: PublishedEntry,
+        write_cube: bool = True,
+    ) -> AvailabilityResponse:
+        """Decode a published day, writing it to the cube unless told not to."""
+        response = AvailabilityResponse.model_validate_json(entry.body)
+        if not write_cube:
+            return response
+        self.cube.write(
+            SlotGrid.from_time_slots(
+                entry.date,
+                response.slots,
+                court_ids=self.metadata.court_ids,
+                court_names=self.metadata.court_names,
+            ),
+            entry.rental_length,
+        )
+        return response
+
+    def _build_from_snapshots(
+        self,
+        date: str,
+        snapshots: list[CourtSnapshot],
+        write_cube: bool = True,
+    ) -> dict[int, AvailabilityResponse] | None:
+        """Build a date's responses from snapshots, or None if a court is missing."""
+        if not set(self.metadata.court_ids) <= {s.court_id for s in snapshots}:
+            return None
+
+        rows = [row for snapshot in snapshots for row in snapshot.rows]
+        return self._build_day_responses(date, rows, write_cube=write_cube)
+
+    async def _build_with_fallback(
+        self,
+        date: str,
+        date_slots: list[BookingSlot],
+        failed: set[int],
+        fetched_at: float,
+        write_cube: bool = True,
+    ) -> LoadedDay:
+        """
+        Build a date's responses, filling failed courts from their last snapshot.
+
+        The returned fetch time is that of the oldest snapshot used, if any
+        is older than fetched_at.
+        """
+        stale: set[int] = set()
+        if failed and self.store is not None:
+            snapshots = await self.store.load_day(
+                self.location_id, self.rental_type_id, date, BASE_RENTAL_LENGTH
+            )
+            for snapshot in snapshots:
+                if snapshot.court_id in failed:
+                    stale.add(snapshot.court_id)
+                    date_slots.extend(snapshot.rows)
+                    fetched_at = min(fetched_at, snapshot.fetched_at)
+
+        responses = self._build_day_responses(
+            date,
+            date_slots,
+            failed_courts=sorted(failed - stale),
+            stale_courts=sorted(stale),
+            write_cube=write_cube,
+        )
+        return responses, fetched_at
+
+    def _build_day_responses(
+        self,
+        date: str,
+        base_slots: list[BookingSlot],
+        failed_courts: list[int] | None = None,
+        stale_courts: list[int] | None = None,
+        write_cube: bool = True,
+    ) -> dict[int, AvailabilityResponse]:
+        """Build a date's response for every rental length from base-length rows."""
+        return {
+            rental_length: self._build_day_response(
+                date,
+                rental_length,
+                derive_rows(base_slots, rental_length),
+                failed_courts=failed_courts,
+                stale_courts=stale_courts,
+                write_cube=write_cube,
+            )
+            for rental_length in VALID_RENTAL_LENGTHS
+        }
+
+    def _build_day_response(
+        self,
+        date: str,
+        rental_length: int,
+        date_slots: list[BookingSlot],
+        failed_courts: list[int] | None = None,
+        stale_courts: list[int] | None = None,
+        write_cube: bool = True,
+    ) -> AvailabilityResponse:
+        """Build a day's AvailabilityResponse from its decoded API rows."""
+        # Create the 30-minute slot grid
+        grid = self._create_daily_slots(date)
 
         # Mark available slots based on API response
-        self._mark_available_slots(time_slots, date_slots)
+        self._mark_available_slots(grid, date_slots)
 
-        # Fill in booked status for remaining courts
-        self._fill_booked_status(time_slots)
+        # Keep the day in the cube if it's within the horizon
+        if write_cube:
+            self.cube.write(grid, rental_length)
 
+        # Expand to time slots, filling in booked status for remaining courts
         return AvailabilityResponse(
             date=date,
             rental_length=rental_length,
-            slots=time_slots,
+            slots=self._fill_booked_status(grid),
+            failed_courts=failed_courts or [],
+            stale_courts=stale_courts or [],
         )
 
-    async def _fetch_all_court_bookings(
+    async def _fetch_days(
         self,
-        start_date: str,
-        rental_length: int,
-    ) -> list[dict]:
-        """Fetch bookings from all courts concurrently."""
-        async with get_client() as client:
-            tasks = [
-                fetch_court_bookings(
+        dates: list[str],
+        cached_dates: Iterable[str] = (),
+        write_cube: bool = True,
+    ) -> dict[str, LoadedDay]:
+        """
+        Fetch and build every date not already cached, in date order.
+
+        The rows of all the calls are bucketed by StartDate in a single
+        pass and each day is built from its bucket. Days are stamped with
+        the time the fetch started, as the upstream's answers are at least
+        that fresh.
+        """
+        fetched_at = time.time()
+        raw_slots, failed_by_date = await self._fetch_dates(dates, cached_dates)
+
+        slots_by_day: dict[int, list[BookingSlot]] = {
+            parse_date(date): [] for date in failed_by_date
+        }
+        for raw in raw_slots:
+            bucket = slots_by_day.get(raw.day)
+            if bucket is not None:
+                bucket.append(raw)
+
+        return {
+            date: await self._build_with_fallback(
+                date, slots_by_day[parse_date(date)], failed, fetched_at, write_cube
+            )
+            for date, failed in failed_by_date.items()
+        }
+
+    async def _fetch_dates(
+        self,
+        dates: list[str],
+        cached_dates: Iterable[str] = (),
+    ) -> tuple[list[BookingSlot], dict[str, set[int]]]:
+        """
+        Fetch every court's base-length rows for the dates not already cached.
+
+        The planner batches the dates into as few windowed calls per court as
+        possible, each narrowed to its dates' opening hours; dates the venue
+        is closed are never fetched. All calls run concurrently within the
+        overall deadline, and a call that fails or misses the deadline
+        doesn't fail the others.
+
+        Returns:
+            Rows from the calls that answered, and for each fetched date the
+            IDs of the courts that didn't
+        """
+        cached_dates = set(cached_dates)
+        court_ids = self.metadata.court_ids
+        open_dates = [date for date in dates if self.metadata.is_open(date)]
+        calls = self.planner.plan(
+            wanted=(
+                (date, court_id, BASE_RENTAL_LENGTH)
+                for date in open_dates
+                for court_id in court_ids
+            ),
+            cached=(
+                (date, court_id, BASE_RENTAL_LENGTH)
+                for date in cached_dates
+                for court_id in court_ids
+            ),
+            day_hours={date: self.metadata.hours(date) for date in open_dates},
+        )
+
+        tasks = {
+            call: asyncio.ensure_future(self._fetch_court_bookings(call))
+            for call in calls
+        }
+        if tasks:
+            _, pending = await asyncio.wait(
+                tasks.values(), timeout=settings.upstream_deadline_seconds
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        all_slots = []
+        failed: dict[str, set[int]] = {
+            date: set() for date in dates if date not in cached_dates
+        }
+        for call, task in tasks.items():
+            if task.cancelled() or task.exception() is not None:
+                for date in call.dates:
+                    failed[date].add(call.court_id)
+                logger.warning(
+                    "Fetching court %s from %s failed: %r",
+                    call.court_id,
+                    call.start_date,
+                    None if task.cancelled() else task.exception(),
+                )
+            else:
+                all_slots.extend(task.result())
+
+        return all_slots, failed
+
+    async def _fetch_court_bookings(self, call: FetchCall) -> list[BookingSlot]:
+        """Run one planned call, joining an identical in-flight call."""
+        key = (self.location_id, self.rental_type_id, call)
+        return await self.flights.do(key, lambda: self._request_court_bookings(call))
+
+    async def _request_court_bookings(self, call: FetchCall) -> list[BookingSlot]:
+        """Request one planned call's bookings from the API, across all pages."""
+        async with self._get_client() as client:
+            rows = [
+                row
+                async for row in iter_court_bookings(
                     client=client,
                     location_id=self.location_id,
-                    court_id=court["id"],
+                    court_id=call.court_id,
                     rental_type_id=self.rental_type_id,
-                    start_date=start_date,
-                    rental_length=rental_length,
-                    start_time=DEFAULT_START_TIME,
-                    end_time=DEFAULT_END_TIME,
-                    selected_days=ALL_DAYS_SELECTED,
+                    start_date=call.start_date,
+                    rental_length=call.rental_length,
+                    start_time=call.start_time,
+                    end_time=call.end_time,
+                    selected_days=call.selected_days,
                 )
-                for court in COURTS
             ]
+        self.planner.record_rows(call, rows)
+        upstream_rows.observe(len(rows), call.court_id)
 
-            results = await asyncio.gather(*tasks)
-
-            all_slots = []
-            for result in results:
-                if result["total"] > 500:
-                    raise ValueError("API returned more bookings than requested limit")
-                all_slots.extend(result["rows"])
-
-            return all_slots
-
-    def _create_daily_slots(
-        self,
-        date_str: str,
-        start_time_str: str = DEFAULT_START_TIME,
-        end_time_str: str = DEFAULT_END_TIME,
-    ) -> list[TimeSlot]:
-        """Create 30-minute time slots for a day."""
-        start_time = datetime.strptime(start_time_str, "%H:%M").time()
-        end_time = datetime.strptime(end_time_str, "%H:%M").time()
-        current_dt = datetime.combine(
-            datetime.strptime(date_str, "%d/%m/%Y"), start_time
-        )
-        end_dt = datetime.combine(datetime.strptime(date_str, "%d/%m/%Y"), end_time)
-
-        slots = []
-        while current_dt < end_dt:
-            next_dt = current_dt + timedelta(minutes=30)
-            slots.append(
-                TimeSlot(
-                    start_time=current_dt.strftime("%H:%M"),
-                    end_time=next_dt.strftime("%H:%M"),
-                    date=date_str,
-                    has_available_court=False,
-                    courts=[],
-                )
+        if self.store is not None:
+            await self._save_snapshots(call, rows)
+
+        return rows
+
+    async def _save_snapshots(
+        self,
+        call: FetchCall,
+        rows: list[BookingSlot],
+    ) -> None:
+        """Persist one call's fetched rows, one snapshot per covered date."""
+        fetched_at = time.time()
+        snapshots = {
+            date: CourtSnapshot(
+                location_id=self.location_id,
+                rental_type_id=self.rental_type_id,
+                court_id=call.court_id,
+                date=date,
+                rental_length=call.rental_length,
+                fetched_at=fetched_at,
+                rows=[],
             )
-            current_dt = next_dt
+            for date in call.dates
+        }
+        for row in rows:
+            snapshot = snapshots.get(row.date)
+            if snapshot is not None:
+                snapshot.rows.append(row)
 
-        return slots
+        try:
+            await self.store.save(list(snapshots.values()))
+        except Exception:
+            logger.exception("Failed to save snapshots for court %s", call.court_id)
 
+    @asynccontextmanager
+    async def _get_client(self) -> AsyncIterator[EZFacilityClient]:
+        """Yield the shared client, or a short-lived one if none was given."""
+        if self.client is not None:
+            yield self.client
+        else:
+            async with get_client() as client:
+                yield client
+
+    @timed(build_seconds, "create_daily_slots")
+    def _create_daily_slots(self, date_str: str) -> SlotGrid:
+        """Create an empty 30-minute slot grid for a day's opening hours."""
+        # A closed day gets a grid with no slots
+        start_time, end_time = self.metadata.hours(date_str) or (
+            DEFAULT_START_TIME,
+            DEFAULT_START_TIME,
+        )
+        return SlotGrid(
+            date_str,
+            start_time,
+            end_time,
+            court_ids=self.metadata.court_ids,
+            court_names=self.metadata.court_names,
+        )
+
+    @timed(build_seconds, "mark_available_slots")
     def _mark_available_slots(
         self,
-        time_slots: list[TimeSlot],
-        raw_slots: list[dict],
+        grid: SlotGrid,
+        raw_slots: list[BookingSlot],
     ) -> None:
-        """Mark available courts in time slots based on API response."""
+        """Mark available courts in the grid based on API response."""
         for raw in raw_slots:
-            resource_id = raw["ResourceID"]
-            raw_start = datetime.strptime(raw["StartTime"], "%H:%M").time()
-            raw_end = datetime.strptime(raw["EndTime"], "%H:%M").time()
-
-            for slot in time_slots:
-                slot_start = datetime.strptime(slot.start_time, "%H:%M").time()
-                slot_end = datetime.strptime(slot.end_time, "%H:%M").time()
-
-                # Check if time ranges overlap
-                if slot_start < raw_end and slot_end > raw_start:
-                    # Check if this court is already in the slot
-                    existing = next(
-                        (c for c in slot.courts if c.court_id == resource_id), None
-                    )
-                    if existing is None:
-                        slot.courts.append(
-                            CourtStatus(
-                                court_id=resource_id,
-                                court_name=COURT_ID_TO_NAME.get(
-                                    resource_id, f"Court {resource_id}"
-                                ),
-                                is_booked=False,
-                            )
-                        )
-
-    def _fill_booked_status(self, time_slots: list[TimeSlot]) -> None:
-        """Fill in booked status for courts not in the available list."""
-        for slot in time_slots:
-            available_court_ids = {c.court_id for c in slot.courts}
-
-            for court in COURTS:
-                if court["id"] not in available_court_ids:
-                    slot.courts.append(
-                        CourtStatus(
-                            court_id=court["id"],
-                            court_name=court["name"],
-                            is_booked=True,
-                        )
-                    )
-
-            # Sort courts by ID for consistent ordering
-            slot.courts.sort(key=lambda c: c.court_id)
-
-            # Set has_available_court flag
-            slot.has_available_court = any(not c.is_booked for c in slot.courts)
+            grid.mark_free(raw.court_id, raw.start, raw.end)
+
+    @timed(build_seconds, "fill_booked_status")
+    def _fill_booked_status(self, grid: SlotGrid) -> list[TimeSlot]:
+        """Build time slots, marking courts not free in the grid as booked."""
+        return grid.to_time_slots()
@@ -0,0 +1,207 @@
+"""Broadcast availability changes to streaming subscribers."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+
+from ..models.availability import AvailabilityResponse, AvailabilityUpdate
+from .changes import DayMasks, changed_masks, changed_slots
+
+# (DD/MM/YYYY date, rental length) a subscriber is watching
+StreamKey = tuple[str, int]
+
+
+def _update(old: DayMasks, new: DayMasks) -> AvailabilityUpdate | None:
+    """Return the cells that changed between two versions, or None if none did."""
+    slots = changed_slots(new.response, changed_masks(old.masks, new.masks))
+
+    response = new.response
+    if (
+        not slots
+        and response.failed_courts == old.response.failed_courts
+        and response.stale_courts == old.response.stale_courts
+    ):
+        return None
+
+    return AvailabilityUpdate(
+        date=response.date,
+        rental_length=response.rental_length,
+        version=response.version,
+        slots=slots,
+        failed_courts=response.failed_courts,
+        stale_courts=response.stale_courts,
+    )
+
+
+def format_event(event: str, data: str) -> bytes:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+class Subscription:
+    """
+    One streaming client's pending events.
+
+    Events are queued as pre-encoded bytes and the client is woken through
+    an Event, so an idle subscriber costs a deque and a waiting coroutine.
+    A client that falls more than `max_pending` events behind has its
+    queue dropped and is resynced with full snapshots instead.
+    """
+
+    def __init__(self, keys: set[StreamKey], max_pending: int):
+        self.keys = keys
+        self.max_pending = max_pending
+        self.pending: deque[bytes] = deque()
+        self.overflowed = False
+        self.wakeup = asyncio.Event()
+
+    def push(self, event: bytes) -> None:
+        if len(self.pending) >= self.max_pending:
+            self.pending.clear()
+            self.overflowed = True
+        else:
+            self.pending.append(event)
+        self.wakeup.set()
+
+    def drain(self) -> list[bytes]:
+        """Take every pending event and reset the wakeup."""
+        events = list(self.pending)
+        self.pending.clear()
+        self.wakeup.clear()
+        return events
+
+
+class AvailabilityHub:
+    """
+    Fan availability changes out to every subscriber of a date.
+
+    The hub keeps the latest version of each watched (date, rental_length).
+    When a new response is published it diffs the court masks once,
+    encodes the change once and hands the same bytes to every subscriber,
+    so a single upstream refresh feeds all connected clients. Keys nobody
+    watches are ignored.
+    """
+
+    def __init__(self, max_pending: int = 32):
+        self.max_pending = max_pending
+        self._latest: dict[StreamKey, DayMasks] = {}
+        self._subscribers: dict[StreamKey, set[Subscription]] = {}
+
+        self.published = 0
+        self.events = 0
+        self.resyncs = 0
+
+    def watched_dates(self) -> set[str]:
+        """Return the dates at least one subscriber is watching."""
+        return {date for date, _ in self._subscribers}
+
+    def subscribe(
+        self,
+        responses: dict[StreamKey, AvailabilityResponse],
+    ) -> tuple[Subscription, list[AvailabilityResponse]]:
+        """
+        Register a subscriber for the given keys.
+
+        Args:
+            responses: A current response for each key, used for keys the
+                hub isn't tracking yet
+
+        Returns:
+            The subscription and the snapshot to send first for each key
+        """
+        subscription = Subscription(set(responses), self.max_pending)
+        for key, response in responses.items():
+            self._latest.setdefault(key, DayMasks.of(response))
+            self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription, self.snapshots(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber, forgetting keys nobody watches any more."""
+        for key in subscription.keys:
+            subscribers = self._subscribers.get(key)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[key]
+                del self._latest[key]
+
+    def snapshots(self, subscription: Subscription) -> list[AvailabilityResponse]:
+        """Return the latest full response for each of a subscriber's keys."""
+        if subscription.overflowed:
+            subscription.overflowed = False
+            self.resyncs += 1
+        return [self._latest[key].response for key in sorted(subscription.keys)]
+
+    async def stream(
+        self,
+        responses: dict[StreamKey, AvailabilityResponse],
+        keepalive_seconds: float,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield a subscriber's Server-Sent Events until the client goes away.
+
+        A snapshot is sent for every key first, then updates as they are
+        published. A comment line is sent after `keepalive_seconds` of
+        silence so proxies keep the connection open.
+        """
+        subscription, snapshots = self.subscribe(responses)
+        try:
+            for response in snapshots:
+                yield format_event("snapshot", response.model_dump_json())
+
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        subscription.wakeup.wait(), keepalive_seconds
+                    )
+                except TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+
+                events = subscription.drain()
+                if subscription.overflowed:
+                    events = [
+                        format_event("snapshot", response.model_dump_json())
+                        for response in self.snapshots(subscription)
+                    ]
+                yield b"".join(events)
+        finally:
+            self.unsubscribe(subscription)
+
+    def publish(self, response: AvailabilityResponse) -> None:
+        """Send subscribers of the response's key whatever changed."""
+        key = (response.date, response.rental_length)
+        subscribers = self._subscribers.get(key)
+        if not subscribers:
+            return
+        self.published += 1
+
+        old = self._latest[key]
+        new = DayMasks.of(response)
+        self._latest[key] = new
+
+        if new.start_times != old.start_times:
+            # The slot layout changed, so cell diffs don't apply
+            event = format_event("snapshot", response.model_dump_json())
+        else:
+            update = _update(old, new)
+            if update is None:
+                return
+            event = format_event("update", update.model_dump_json())
+
+        self.events += 1
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def stats(self) -> dict:
+        """Return subscriber and event counters."""
+        return {
+            "subscribers": len(
+                {s for subscribers in self._subscribers.values() for s in subscribers}
+            ),
+            "watched_keys": len(self._subscribers),
+            "published": self.published,
+            "events": self.events,
+            "resyncs": self.resyncs,
+        }
@@ -0,0 +1,205 @@
+"""Per-day versions and cell diffs of availability responses."""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from ..models.availability import (
+    AvailabilityChanges,
+    AvailabilityResponse,
+    TimeSlot,
+)
+
+# (DD/MM/YYYY date, rental length)
+DayKey = tuple[str, int]
+
+
+def court_masks(response: AvailabilityResponse) -> dict[int, int]:
+    """Return one bitmask per court with bit i set when slot i is free."""
+    masks: dict[int, int] = {}
+    for index, slot in enumerate(response.slots):
+        for court in slot.courts:
+            mask = masks.get(court.court_id, 0)
+            masks[court.court_id] = mask if court.is_booked else mask | 1 << index
+    return masks
+
+
+def changed_masks(old: dict[int, int], new: dict[int, int]) -> dict[int, int]:
+    """Return one bitmask per court with bit i set when slot i flipped."""
+    return {
+        court_id: old.get(court_id, 0) ^ new.get(court_id, 0)
+        for court_id in old.keys() | new.keys()
+    }
+
+
+def changed_slots(
+    response: AvailabilityResponse,
+    changed: dict[int, int],
+) -> list[TimeSlot]:
+    """
+    Return the response's slots that have a changed court.
+
+    Each returned slot lists only its changed courts, with their status in
+    `response`.
+    """
+    any_changed = 0
+    for bits in changed.values():
+        any_changed |= bits
+
+    return [
+        TimeSlot(
+            start_time=slot.start_time,
+            end_time=slot.end_time,
+            date=slot.date,
+            has_available_court=slot.has_available_court,
+            courts=[
+                court
+                for court in slot.courts
+                if changed.get(court.court_id, 0) >> index & 1
+            ],
+        )
+        for index, slot in enumerate(response.slots)
+        if any_changed >> index & 1
+    ]
+
+
+@dataclass
+class DayMasks:
+    """A response with its slot layout and per-court free masks."""
+
+    response: AvailabilityResponse
+    start_times: tuple[str, ...]
+    masks: dict[int, int]
+
+    @classmethod
+    def of(cls, response: AvailabilityResponse) -> "DayMasks":
+        return cls(
+            response=response,
+            start_times=tuple(slot.start_time for slot in response.slots),
+            masks=court_masks(response),
+        )
+
+
+@dataclass
+class _DayHistory:
+    """The current version of a day and the diffs that led to it."""
+
+    current: DayMasks
+    version: int
+    # Version the oldest retained diff applies to
+    base_version: int
+    # (version, per-court flipped masks) for each recent change, oldest first
+    diffs: deque[tuple[int, dict[int, int]]] = field(default_factory=deque)
+
+
+class ChangeLog:
+    """
+    Version every day's availability and remember its recent diffs.
+
+    Each time a response is stored, its court masks are XOR-ed against the
+    previous version. If any cell flipped, or failed/stale courts changed,
+    the day's version is bumped and the diff appended to a bounded ring.
+    Versions start from the current time in milliseconds, so they keep
+    increasing across restarts. Clients whose version predates the ring
+    get the full day back.
+    """
+
+    def __init__(self, max_days: int, max_changes: int):
+        self.max_days = max_days
+        self.max_changes = max_changes
+        self._days: OrderedDict[DayKey, _DayHistory] = OrderedDict()
+
+        self.versions = 0
+        self.deltas_served = 0
+        self.resets_served = 0
+
+    def record(self, response: AvailabilityResponse) -> None:
+        """Version a newly stored response, stamping it with its version."""
+        key = (response.date, response.rental_length)
+        new = DayMasks.of(response)
+        history = self._days.get(key)
+
+        if history is None or new.start_times != history.current.start_times:
+            # First sighting, or a new slot layout the old diffs can't apply to
+            version = self._next_version(history, response.version)
+            history = _DayHistory(current=new, version=version, base_version=version)
+            self._days[key] = history
+            self.versions += 1
+        else:
+            old = history.current
+            changed = changed_masks(old.masks, new.masks)
+            if (
+                any(changed.values())
+                or response.failed_courts != old.response.failed_courts
+                or response.stale_courts != old.response.stale_courts
+            ):
+                history.version = self._next_version(history, response.version)
+                history.diffs.append((history.version, changed))
+                if len(history.diffs) > self.max_changes:
+                    history.base_version, _ = history.diffs.popleft()
+                self.versions += 1
+            history.current = new
+
+        response.version = history.version
+        self._days.move_to_end(key)
+        while len(self._days) > self.max_days:
+            self._days.popitem(last=False)
+
+    @staticmethod
+    def _next_version(history: _DayHistory | None, given: int | None = None) -> int:
+        # A version stamped by the worker is kept, so API processes agree on it
+        now = given or int(time.time() * 1000)
+        return now if history is None else max(now, history.version + 1)
+
+    def changes(
+        self,
+        date: str,
+        rental_length: int,
+        since: int,
+    ) -> AvailabilityChanges | None:
+        """
+        Return what changed on a day after version `since`.
+
+        Returns:
+            The flipped cells, the full day (reset) if the diff ring doesn't
+            reach back to `since`, or None if the day isn't tracked
+        """
+        history = self._days.get((date, rental_length))
+        if history is None:
+            return None
+
+        response = history.current.response
+        reset = not history.base_version <= since <= history.version
+        if reset:
+            self.resets_served += 1
+            slots = response.slots
+        else:
+            self.deltas_served += 1
+            net: dict[int, int] = {}
+            for version, changed in history.diffs:
+                if version > since:
+                    for court_id, bits in changed.items():
+                        net[court_id] = net.get(court_id, 0) ^ bits
+            slots = changed_slots(response, net)
+
+        return AvailabilityChanges(
+            date=response.date,
+            rental_length=response.rental_length,
+            version=history.version,
+            since=since,
+            reset=reset,
+            slots=slots,
+            failed_courts=response.failed_courts,
+            stale_courts=response.stale_courts,
+        )
+
+    def stats(self) -> dict:
+        """Return tracked days and version/delta counters."""
+        return {
+            "days": len(self._days),
+            "max_days": self.max_days,
+            "max_changes": self.max_changes,
+            "versions": self.versions,
+            "deltas_served": self.deltas_served,
+            "resets_served": self.resets_served,
+        }
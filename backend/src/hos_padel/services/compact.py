@@ -0,0 +1,84 @@
+"""Compact bitmask wire format for availability responses."""
+
+import base64
+from collections import Counter
+
+from ..core.constants import DEFAULT_START_TIME
+from ..models.availability import (
+    AvailabilityResponse,
+    CompactAvailability,
+    CompactDay,
+)
+from ..models.court import Court
+from .changes import court_masks
+from .slot_grid import SLOT_MINUTES, parse_minutes
+
+# Media type clients send in Accept to ask for the compact format
+COMPACT_MEDIA_TYPE = "application/vnd.hos-padel.compact+json"
+
+
+def encode_mask(mask: int, slot_count: int) -> str:
+    """Encode a slot bitmask as base64, bit i in byte i // 8 (LSB first)."""
+    return base64.b64encode(mask.to_bytes((slot_count + 7) // 8, "little")).decode()
+
+
+def to_compact(
+    responses: list[AvailabilityResponse],
+    rental_length: int,
+) -> CompactAvailability:
+    """
+    Convert full responses to the compact format.
+
+    The days share one grid, the most common among days with slots; a
+    day with other opening hours (or none) carries its own origin and
+    slot count. Each court's free slots become one base64 bitmask per day.
+    """
+    grids = Counter(
+        (response.slots[0].start_time, len(response.slots))
+        for response in responses
+        if response.slots
+    )
+    if not grids:
+        origin, step, slot_count = DEFAULT_START_TIME, SLOT_MINUTES, 0
+    else:
+        (origin, slot_count), _ = grids.most_common(1)[0]
+        slot = next(r.slots[0] for r in responses if r.slots)
+        step = parse_minutes(slot.end_time) - parse_minutes(slot.start_time)
+
+    names: dict[int, str] = {}
+    for response in responses:
+        for slot in response.slots:
+            for court in slot.courts:
+                names.setdefault(court.court_id, court.court_name)
+
+    return CompactAvailability(
+        rental_length=rental_length,
+        origin=origin,
+        step_minutes=step,
+        slot_count=slot_count,
+        courts=[Court(id=court_id, name=names[court_id]) for court_id in sorted(names)],
+        days=[_compact_day(response, origin, slot_count) for response in responses],
+    )
+
+
+def _compact_day(
+    response: AvailabilityResponse,
+    origin: str,
+    slot_count: int,
+) -> CompactDay:
+    """Encode one day, noting its own grid if it differs from the shared one."""
+    day_origin = response.slots[0].start_time if response.slots else origin
+    day_slot_count = len(response.slots)
+    own_grid = (day_origin, day_slot_count) != (origin, slot_count)
+    return CompactDay(
+        date=response.date,
+        free={
+            court_id: encode_mask(mask, day_slot_count)
+            for court_id, mask in sorted(court_masks(response).items())
+        },
+        failed_courts=response.failed_courts,
+        stale_courts=response.stale_courts,
+        version=response.version,
+        origin=day_origin if own_grid else None,
+        slot_count=day_slot_count if own_grid else None,
+    )
@@ -0,0 +1,151 @@
+"""Long-lived multi-day cube of per-court free-slot bit planes for summaries."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..core.config import settings
+from ..core.times import MINUTES_PER_DAY, parse_date
+from .slot_grid import SLOT_MINUTES, SlotGrid
+
+# Bits reserved per day row, enough for a whole day of the finest grid
+ROW_SLOTS = MINUTES_PER_DAY // SLOT_MINUTES
+ROW_MASK = (1 << ROW_SLOTS) - 1
+
+
+@dataclass
+class CubeDay:
+    """A date held in a cube row and the grid its bits are laid out on."""
+
+    date: str
+    origin: int
+    step: int
+    slot_count: int
+
+
+@dataclass
+class DaySummary:
+    """Aggregates of one held day, sliced from the cube."""
+
+    day: CubeDay
+    # Bit i set when any court is free in slot i
+    any_free: int
+    # Free (court, slot) cells across every court
+    free_cells: int
+
+
+class AvailabilityCube:
+    """
+    Days × slots × courts of free slots for the whole bookable horizon.
+
+    Each (rental length, court) is one bit plane: a Python int with bit
+    row * ROW_SLOTS + i set when the court is free in slot i of the date
+    held in that row. Rows are a ring over date ordinals, so the cube holds
+    up to `days` consecutive dates and each plane stays under days × 48
+    bits. Building a day in the horizon rewrites its row in place, court
+    by court. The cube only answers summaries: aggregates across days are
+    a handful of big-int operations over every row at once rather than a
+    loop over slots. Day and range responses are expanded from the grid
+    each day was built on, not read back from here.
+    """
+
+    def __init__(self, days: int | None = None):
+        self.days = days or settings.cube_days
+        # (rental_length, court_id) -> bit plane
+        self._planes: dict[tuple[int, int], int] = {}
+        # (rental_length, row) -> date held in the row
+        self._rows: dict[tuple[int, int], CubeDay] = {}
+
+        self.writes = 0
+        self.evictions = 0
+        self.ignored = 0
+
+    def write(self, grid: SlotGrid, rental_length: int) -> bool:
+        """
+        Replace a date's row with a built grid, evicting what it held.
+
+        Only dates from today to `days` ahead are held; a grid for any
+        other date is ignored rather than evicting a day in the horizon
+        that shares its row.
+
+        Returns:
+            Whether the grid was written
+        """
+        ordinal = parse_date(grid.date)
+        today = datetime.now().toordinal()
+        if not today <= ordinal < today + self.days:
+            self.ignored += 1
+            return False
+
+        row = ordinal % self.days
+        shift = row * ROW_SLOTS
+        held = self._rows.get((rental_length, row))
+        if held is not None and held.date != grid.date:
+            self.evictions += 1
+
+        keep = ~(ROW_MASK << shift)
+        for key, plane in self._planes.items():
+            if key[0] == rental_length:
+                self._planes[key] = plane & keep
+        for court_id, mask in grid.free.items():
+            key = (rental_length, court_id)
+            self._planes[key] = self._planes.get(key, 0) | mask << shift
+
+        self._rows[(rental_length, row)] = CubeDay(
+            date=grid.date,
+            origin=grid.origin,
+            step=grid.step,
+            slot_count=grid.slot_count,
+        )
+        self.writes += 1
+        return True
+
+    def summarise(
+        self,
+        dates: Iterable[str],
+        rental_length: int,
+    ) -> dict[str, DaySummary]:
+        """Return the free-slot aggregates of each held date."""
+        # One OR per court covers every row of the cube
+        any_free = 0
+        planes = []
+        for (length, _), plane in self._planes.items():
+            if length == rental_length:
+                any_free |= plane
+                planes.append(plane)
+
+        summaries = {}
+        for date in dates:
+            held, shift = self._held(date, rental_length)
+            if held is None:
+                continue
+            summaries[date] = DaySummary(
+                day=held,
+                any_free=any_free >> shift & ROW_MASK,
+                free_cells=sum(
+                    (plane >> shift & ROW_MASK).bit_count() for plane in planes
+                ),
+            )
+        return summaries
+
+    def _held(self, date: str, rental_length: int) -> tuple[CubeDay | None, int]:
+        """Return the row holding a date (or None) and its bit offset."""
+        row = parse_date(date) % self.days
+        held = self._rows.get((rental_length, row))
+        if held is None or held.date != date:
+            return None, 0
+        return held, row * ROW_SLOTS
+
+    def stats(self) -> dict:
+        """Return the cube's size and counters."""
+        return {
+            "days": self.days,
+            "rows_held": len(self._rows),
+            "planes": len(self._planes),
+            "plane_bytes": sum(
+                (plane.bit_length() + 7) // 8 for plane in self._planes.values()
+            ),
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "ignored": self.ignored,
+        }
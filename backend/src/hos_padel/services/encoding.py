@@ -0,0 +1,143 @@
+"""Pre-encoded JSON response bodies with compressed variants."""
+
+import gzip
+import hashlib
+import time
+
+try:
+    import brotli
+except ImportError:  # optional: pip install 'hos-padel-api[brotli]'
+    brotli = None
+
+from ..core.config import settings
+
+# Content codings in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+class CompressionStats:
+    """
+    Counters for response compression.
+
+    Compression work (CPU time, bytes in and out) is counted where it
+    happens; sends are counted per response, whether the body was
+    compressed for that response or a stored variant was reused.
+    """
+
+    def __init__(self):
+        self.compressions = 0
+        self.cpu_seconds = 0.0
+        self.compressed_bytes_in = 0
+        self.compressed_bytes_out = 0
+
+        self.sent_compressed = 0
+        self.sent_precompressed = 0
+        self.sent_uncompressed = 0
+        self.bytes_saved = 0
+
+    def record_compression(self, size_in: int, size_out: int, cpu: float) -> None:
+        self.compressions += 1
+        self.cpu_seconds += cpu
+        self.compressed_bytes_in += size_in
+        self.compressed_bytes_out += size_out
+
+    def record_send(self, size: int, sent: int, precompressed: bool = False) -> None:
+        """Count a response of `size` identity bytes sent as `sent` bytes."""
+        if sent == size:
+            self.sent_uncompressed += 1
+        elif precompressed:
+            self.sent_precompressed += 1
+        else:
+            self.sent_compressed += 1
+        self.bytes_saved += size - sent
+
+    def stats(self) -> dict:
+        """Return compression work and bytes saved."""
+        return {
+            "compressions": self.compressions,
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "compressed_bytes_in": self.compressed_bytes_in,
+            "compressed_bytes_out": self.compressed_bytes_out,
+            "sent_compressed": self.sent_compressed,
+            "sent_precompressed": self.sent_precompressed,
+            "sent_uncompressed": self.sent_uncompressed,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+compression_stats = CompressionStats()
+
+
+def route_level(path: str) -> int | None:
+    """Return the compression level configured for a path, if any."""
+    prefixes = [p for p in settings.compression_route_levels if path.startswith(p)]
+    if not prefixes:
+        return None
+    return settings.compression_route_levels[max(prefixes, key=len)]
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """Compress data in a content coding, at `level` or the configured default."""
+    started = time.thread_time()
+    if encoding == "br":
+        quality = settings.response_brotli_quality if level is None else level
+        compressed = brotli.compress(data, quality=quality)
+    else:
+        level = settings.response_gzip_level if level is None else level
+        compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    compression_stats.record_compression(
+        len(data), len(compressed), time.thread_time() - started
+    )
+    return compressed
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the preferred supported content coding a client accepts, if any."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 0.0
+        if q > 0:
+            accepted.add(coding.strip())
+    for encoding in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class EncodedBody:
+    """
+    A JSON body encoded once, with compressed variants made on demand.
+
+    The ETag is a hash of the identity bytes. Each compressed variant is
+    a different representation, so it gets the ETag with the coding
+    appended, and is kept once made so repeat requests send stored bytes.
+    """
+
+    __slots__ = ("_variants", "etag", "identity")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        digest = hashlib.blake2b(identity, digest_size=16).hexdigest()
+        self.etag = f'"{digest}"'
+        self._variants: dict[tuple[str, int | None], bytes] = {}
+
+    def variant(self, encoding: str | None, level: int | None = None) -> bytes:
+        """Return the body in a content coding (None for identity)."""
+        if encoding is None:
+            return self.identity
+        key = (encoding, level)
+        data = self._variants.get(key)
+        if data is None:
+            data = self._variants[key] = compress(self.identity, encoding, level)
+        return data
+
+    def variant_etag(self, encoding: str | None) -> str:
+        """Return the ETag of the body in a content coding."""
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
@@ -0,0 +1,163 @@
+"""Streaming bulk export of availability as NDJSON or CSV."""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timedelta
+from typing import Literal
+
+from ..core.config import settings
+from ..models.availability import AvailabilityResponse
+from ..scraper.resilience import UpstreamUnavailableError
+from ..scraper.throttle import Priority, upstream_priority
+from .availability import AvailabilityService
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = [
+    "date",
+    "rental_length",
+    "start_time",
+    "end_time",
+    "court_id",
+    "court_name",
+    "status",
+]
+
+
+def date_range(start_date: str, end_date: str) -> list[str]:
+    """Return every DD/MM/YYYY date from start_date to end_date inclusive."""
+    start = datetime.strptime(start_date, "%d/%m/%Y")
+    end = datetime.strptime(end_date, "%d/%m/%Y")
+    return [
+        (start + timedelta(days=offset)).strftime("%d/%m/%Y")
+        for offset in range((end - start).days + 1)
+    ]
+
+
+async def iter_days(
+    service: AvailabilityService,
+    dates: Iterable[str],
+    rental_length: int,
+    concurrency: int | None = None,
+) -> AsyncIterator[tuple[str, AvailabilityResponse | None]]:
+    """
+    Yield each date's availability in order, loading a few days ahead.
+
+    At most `concurrency` days are loading or waiting to be yielded, so
+    memory doesn't grow with the range. Days are loaded at background
+    priority and without filling the cache or the cube, so a bulk export
+    neither delays live requests nor evicts their days. A day with no data
+    at all yields None.
+    """
+    concurrency = concurrency or settings.export_concurrency
+    dates = iter(dates)
+    pending: deque[tuple[str, asyncio.Task]] = deque()
+
+    def start_next() -> None:
+        date = next(dates, None)
+        if date is not None:
+            with upstream_priority(Priority.BACKGROUND):
+                task = asyncio.ensure_future(
+                    service.get_availability_uncached(date, rental_length)
+                )
+            pending.append((date, task))
+
+    try:
+        for _ in range(concurrency):
+            start_next()
+        while pending:
+            date, task = pending.popleft()
+            start_next()
+            try:
+                yield date, await task
+            except UpstreamUnavailableError as exc:
+                logger.warning("Export skipped %s: %s", date, exc)
+                yield date, None
+    finally:
+        for _, task in pending:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+def _ndjson_day(
+    service: AvailabilityService,
+    date: str,
+    response: AvailabilityResponse | None,
+) -> bytes:
+    """
+    One line holding the day's AvailabilityResponse, or an error record.
+
+    The cached bytes are reused only when the cache holds this very
+    response; an export day loaded past an expired entry is encoded anew.
+    """
+    if response is None:
+        error = {"date": date, "error": "No availability data"}
+        return json.dumps(error).encode() + b"\n"
+    cached = service.cached_day_body(response)
+    if cached is not None:
+        return cached.body.identity + b"\n"
+    return response.model_dump_json().encode() + b"\n"
+
+
+def _csv_day(response: AvailabilityResponse | None) -> bytes:
+    """One line per slot and court; failed courts are marked unknown."""
+    if response is None:
+        return b""
+    failed = set(response.failed_courts)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for slot in response.slots:
+        for court in slot.courts:
+            if court.court_id in failed:
+                status = "unknown"
+            else:
+                status = "booked" if court.is_booked else "free"
+            writer.writerow(
+                [
+                    response.date,
+                    response.rental_length,
+                    slot.start_time,
+                    slot.end_time,
+                    court.court_id,
+                    court.court_name,
+                    status,
+                ]
+            )
+    return buffer.getvalue().encode()
+
+
+async def export_lines(
+    service: AvailabilityService,
+    dates: Iterable[str],
+    rental_length: int,
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the export a day at a time.
+
+    NDJSON is one AvailabilityResponse per line (or a {"date", "error"}
+    line for a day with no data). CSV has a header, then one line per
+    slot and court with status free, booked or unknown.
+    """
+    if export_format == "csv":
+        yield (",".join(CSV_COLUMNS) + "\n").encode()
+
+    async for date, response in iter_days(service, dates, rental_length):
+        if export_format == "csv":
+            chunk = _csv_day(response)
+        else:
+            chunk = _ndjson_day(service, date, response)
+        if chunk:
+            yield chunk
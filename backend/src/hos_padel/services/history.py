@@ -0,0 +1,52 @@
+"""Recording stored availability into the occupancy history."""
+
+import asyncio
+import logging
+
+from ..models.availability import AvailabilityResponse
+from ..storage import OccupancyHistory
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryRecorder:
+    """
+    Feed every stored availability response to the occupancy history.
+
+    Registered as a cache listener in the one process holding the
+    history's writer lock. Responses are queued and recorded one at a
+    time in a worker thread, so memory-mapped writes never block the
+    event loop.
+    """
+
+    def __init__(self, history: OccupancyHistory):
+        self.history = history
+        self._pending: asyncio.Queue[AvailabilityResponse | None] = asyncio.Queue()
+        self._runner: asyncio.Task | None = None
+
+        self.errors = 0
+
+    def record(self, response: AvailabilityResponse) -> None:
+        """Queue a stored response to be recorded."""
+        self._pending.put_nowait(response)
+
+    def start(self) -> None:
+        """Start recording on the running event loop."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Record everything already queued, then stop."""
+        if self._runner is not None:
+            # Not cancelled: a write in progress would carry on in its thread
+            self._pending.put_nowait(None)
+            await self._runner
+            self._runner = None
+
+    async def _run(self) -> None:
+        while (response := await self._pending.get()) is not None:
+            try:
+                await asyncio.to_thread(self.history.record, response)
+            except Exception:
+                self.errors += 1
+                logger.exception("Recording occupancy history failed")
@@ -0,0 +1,224 @@
+"""Courts and per-date opening hours, cached from EZFacility."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from datetime import datetime
+
+import aiohttp
+
+from ..core.config import settings
+from ..core.constants import COURT_ID_TO_NAME, DEFAULT_END_TIME, DEFAULT_START_TIME
+from ..core.times import parse_date, parse_minutes
+from ..models.court import Court
+from ..scraper.client import EZFacilityClient
+from ..scraper.courts import fetch_court_ids
+from ..scraper.resilience import UpstreamUnavailableError
+from ..scraper.timeframe import fetch_timeframe
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Opening (start, end) HH:MM for a date, or None when the venue is closed
+Hours = tuple[str, str] | None
+
+# How long a failed lookup falls back to the defaults before it is retried
+RETRY_SECONDS = 60.0
+
+# A lookup that failed upstream or returned a body of the wrong shape
+LOAD_ERRORS = (
+    aiohttp.ClientError,
+    TimeoutError,
+    UpstreamUnavailableError,
+    KeyError,
+    TypeError,
+    ValueError,
+)
+
+
+def parse_hours(timeframe: dict) -> Hours:
+    """
+    Return the opening hours in a GetTimeFrame response.
+
+    Several open periods are merged into one window from the earliest open
+    to the latest close. No periods means the venue is closed that day.
+
+    Raises:
+        KeyError: If the response has no openCloseHoursForDay
+        ValueError: If a time isn't HH:MM
+    """
+    periods = timeframe["openCloseHoursForDay"]
+    if not periods:
+        return None
+    opens = [(parse_minutes(start), start) for start, _ in periods]
+    closes = [(parse_minutes(end), end) for _, end in periods]
+    return min(opens)[1], max(closes)[1]
+
+
+class VenueMetadata:
+    """
+    The venue's courts and opening hours, refreshed on a long TTL.
+
+    Courts come from GetResources and are indexed by ID. Opening hours come
+    from GetTimeFrame, one call per date, and are loaded the first time a
+    date is needed. Until a lookup succeeds, or when it fails, the
+    hard-coded courts and default hours apply, so availability never fails
+    on metadata. Without a client nothing is fetched and the defaults are
+    always used.
+    """
+
+    def __init__(
+        self,
+        client: EZFacilityClient | None = None,
+        location_id: int | None = None,
+        rental_type_id: int | None = None,
+        ttl_seconds: float | None = None,
+    ):
+        self.client = client
+        self.location_id = location_id or settings.ezfacility_location_id
+        self.rental_type_id = rental_type_id or settings.ezfacility_rental_type_id
+        self.ttl_seconds = ttl_seconds or settings.metadata_ttl_seconds
+
+        self._courts: dict[int, str] = dict(COURT_ID_TO_NAME)
+        self._courts_expire_at = 0.0
+        # date -> (expires at, hours)
+        self._hours: dict[str, tuple[float, Hours]] = {}
+        self.flights: SingleFlight[tuple, None] = SingleFlight()
+
+        self.court_loads = 0
+        self.hours_loads = 0
+        self.load_errors = 0
+
+    @property
+    def court_ids(self) -> list[int]:
+        """Court IDs in venue order."""
+        return list(self._courts)
+
+    @property
+    def court_names(self) -> dict[int, str]:
+        """Court names by ID, in venue order. Treat as read-only."""
+        return self._courts
+
+    def courts(self) -> list[Court]:
+        """Return every court in venue order."""
+        return [
+            Court(id=court_id, name=name) for court_id, name in self._courts.items()
+        ]
+
+    def court(self, court_id: int) -> Court | None:
+        """Return a court by ID, or None if the venue has no such court."""
+        name = self._courts.get(court_id)
+        return None if name is None else Court(id=court_id, name=name)
+
+    def set_courts(self, courts: dict[int, str]) -> None:
+        """Use a court list loaded elsewhere, e.g. published by the worker."""
+        if courts:
+            self._courts = dict(courts)
+
+    def hours(self, date: str) -> Hours:
+        """Return a date's opening hours, or the defaults if not loaded."""
+        entry = self._hours.get(date)
+        if entry is None:
+            return DEFAULT_START_TIME, DEFAULT_END_TIME
+        return entry[1]
+
+    def is_open(self, date: str) -> bool:
+        """Whether the venue opens at all on a date."""
+        return self.hours(date) is not None
+
+    async def refresh(self, dates: Iterable[str] = ()) -> None:
+        """
+        Load the courts and each date's hours unless they are still fresh.
+
+        Concurrent refreshes of the same item share one upstream call, and
+        no refresh waits longer than the upstream deadline.
+        """
+        if self.client is None:
+            return
+
+        self._forget_past()
+        now = time.monotonic()
+        loads = []
+        if now >= self._courts_expire_at:
+            loads.append(self.flights.do(("courts",), self._load_courts))
+        for date in set(dates):
+            entry = self._hours.get(date)
+            if entry is None or now >= entry[0]:
+                loads.append(
+                    self.flights.do(
+                        ("hours", date), lambda date=date: self._load_hours(date)
+                    )
+                )
+        if loads:
+            # Past the deadline the defaults apply while the loads carry on
+            await asyncio.wait(
+                [asyncio.ensure_future(load) for load in loads],
+                timeout=settings.upstream_deadline_seconds,
+            )
+
+    async def _load_courts(self) -> None:
+        """Replace the court list from GetResources, keeping it on failure."""
+        try:
+            resources = await fetch_court_ids(self.client, self.rental_type_id)
+            courts = {int(r["Id"]): r["Name"] for r in resources}
+        except LOAD_ERRORS as exc:
+            self.load_errors += 1
+            self._courts_expire_at = time.monotonic() + RETRY_SECONDS
+            logger.warning("Loading courts failed, keeping %s: %r", self.court_ids, exc)
+            return
+
+        if not courts:
+            # An empty list is more likely an upstream glitch than a closure
+            self.load_errors += 1
+            self._courts_expire_at = time.monotonic() + RETRY_SECONDS
+            logger.warning("GetResources returned no courts, keeping the last list")
+            return
+
+        if courts != self._courts:
+            logger.info("Venue courts changed: %s", courts)
+        self._courts = courts
+        self._courts_expire_at = time.monotonic() + self.ttl_seconds
+        self.court_loads += 1
+
+    async def _load_hours(self, date: str) -> None:
+        """Store a date's hours from GetTimeFrame, the defaults on failure."""
+        try:
+            timeframe = await fetch_timeframe(
+                self.client, self.location_id, self.rental_type_id, date
+            )
+            hours = parse_hours(timeframe)
+        except LOAD_ERRORS as exc:
+            self.load_errors += 1
+            previous = self._hours.get(date)
+            fallback = (
+                previous[1]
+                if previous is not None
+                else (DEFAULT_START_TIME, DEFAULT_END_TIME)
+            )
+            self._hours[date] = (time.monotonic() + RETRY_SECONDS, fallback)
+            logger.warning("Loading opening hours for %s failed: %r", date, exc)
+            return
+
+        self._hours[date] = (time.monotonic() + self.ttl_seconds, hours)
+        self.hours_loads += 1
+
+    def _forget_past(self) -> None:
+        """Drop the hours of dates before today."""
+        today = datetime.now().toordinal()
+        for date in [d for d in self._hours if parse_date(d) < today]:
+            del self._hours[date]
+
+    def stats(self) -> dict:
+        """Return the loaded metadata and load counters."""
+        return {
+            "courts": self.courts(),
+            "hours": {
+                date: self._hours[date][1]
+                for date in sorted(self._hours, key=parse_date)
+            },
+            "ttl_seconds": self.ttl_seconds,
+            "court_loads": self.court_loads,
+            "hours_loads": self.hours_loads,
+            "load_errors": self.load_errors,
+        }
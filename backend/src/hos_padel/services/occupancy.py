@@ -0,0 +1,77 @@
+"""Per-court occupancy timelines derived from FilterResults rows."""
+
+from ..core.constants import BASE_RENTAL_LENGTH
+from ..models.booking import BookingSlot
+from .slot_grid import SLOT_MINUTES
+
+# Bookable rental start times fall on this grid
+START_STEP_MINUTES = SLOT_MINUTES
+
+
+def free_intervals(
+    rows: list[BookingSlot],
+) -> dict[tuple[int, int], list[tuple[int, int]]]:
+    """
+    Merge rows into free intervals per court and date.
+
+    Args:
+        rows: FilterResults rows for any rental length
+
+    Returns:
+        Sorted, non-overlapping [start, end) minute intervals keyed by
+        (court ID, date ordinal). Touching rows are merged.
+    """
+    by_court_date: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for row in rows:
+        by_court_date.setdefault((row.court_id, row.day), []).append(
+            (row.start, row.end)
+        )
+
+    merged: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for key, intervals in by_court_date.items():
+        intervals.sort()
+        timeline = [intervals[0]]
+        for start, end in intervals[1:]:
+            last_start, last_end = timeline[-1]
+            if start <= last_end:
+                timeline[-1] = (last_start, max(last_end, end))
+            else:
+                timeline.append((start, end))
+        merged[key] = timeline
+
+    return merged
+
+
+def derive_rows(
+    base_rows: list[BookingSlot],
+    rental_length: int,
+    base_length: int = BASE_RENTAL_LENGTH,
+) -> list[BookingSlot]:
+    """
+    Derive the rows FilterResults would return for a longer rental length.
+
+    A court is bookable for rental_length from any start on the step grid
+    whose whole rental fits inside one free interval of the base rows.
+
+    Args:
+        base_rows: Rows fetched for base_length
+        rental_length: Rental duration in minutes to derive
+        base_length: Rental duration the base rows were fetched for
+
+    Returns:
+        One row per bookable start
+    """
+    if rental_length == base_length:
+        return base_rows
+    if rental_length < base_length:
+        raise ValueError(
+            f"Cannot derive {rental_length}-minute rows from {base_length}-minute rows"
+        )
+
+    rows = []
+    for (court_id, day), intervals in free_intervals(base_rows).items():
+        for start, end in intervals:
+            for begin in range(start, end - rental_length + 1, START_STEP_MINUTES):
+                rows.append(BookingSlot(court_id, day, begin, begin + rental_length))
+
+    return rows
@@ -0,0 +1,218 @@
+"""Background prefetcher that keeps upcoming availability warm in the cache."""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from ..core.config import settings
+from ..scraper.throttle import Priority, upstream_priority
+from .availability import AvailabilityService
+from .broadcast import AvailabilityHub
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the scheduler sleeps between checks
+MAX_TICK_SECONDS = 5.0
+
+
+@dataclass
+class PrefetchState:
+    """Refresh bookkeeping for one date (all rental lengths)."""
+
+    date: str
+    next_due: float = 0.0
+    last_refreshed_at: datetime | None = None
+    last_duration_seconds: float | None = None
+    refreshes: int = 0
+    failures: int = 0
+    last_error: str | None = None
+    in_progress: bool = False
+
+
+class AvailabilityPrefetcher:
+    """
+    Periodically refresh availability for the next N days into the cache.
+
+    Today is refreshed on a shorter interval than later dates, and at most
+    `concurrency` refreshes run at once. Dates due within the jitter of
+    each other are refreshed as one batch, so the planner covers a week of
+    them with a single call per court, and the batch shares one jittered
+    delay so its dates stay due together. One refresh covers every rental
+    length, since they are all derived from the same upstream fetch.
+    Upstream requests run at background priority so live user requests
+    are admitted first. Each refreshed entry is cached for twice its
+    refresh delay, so a single failed refresh never exposes a miss to
+    users. Dates watched through the availability stream are refreshed
+    too, even beyond the horizon.
+    """
+
+    def __init__(
+        self,
+        service: AvailabilityService,
+        horizon_days: int | None = None,
+        today_interval_seconds: float | None = None,
+        interval_seconds: float | None = None,
+        jitter_seconds: float | None = None,
+        concurrency: int | None = None,
+        hub: AvailabilityHub | None = None,
+    ):
+        self.service = service
+        self.horizon_days = horizon_days or settings.prefetch_horizon_days
+        self.today_interval_seconds = (
+            today_interval_seconds or settings.prefetch_today_interval_seconds
+        )
+        self.interval_seconds = interval_seconds or settings.prefetch_interval_seconds
+        self.jitter_seconds = (
+            jitter_seconds
+            if jitter_seconds is not None
+            else settings.prefetch_jitter_seconds
+        )
+        self.concurrency = concurrency or settings.prefetch_concurrency
+        self.hub = hub
+
+        self._states: dict[str, PrefetchState] = {}
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._runner: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler loop is active."""
+        return self._runner is not None and not self._runner.done()
+
+    def start(self) -> None:
+        """Start the scheduler loop on the running event loop."""
+        if not self.running:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the scheduler loop and any refreshes in progress."""
+        tasks = [*self._tasks]
+        if self._runner is not None:
+            tasks.append(self._runner)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._runner = None
+
+    async def _run(self) -> None:
+        """Launch due refreshes, then sleep until the next one is due."""
+        while True:
+            self._sync_horizon()
+            now = time.monotonic()
+            idle = [s for s in self._states.values() if not s.in_progress]
+            if any(state.next_due <= now for state in idle):
+                # Bring dates due shortly into the same batch
+                batch = [s for s in idle if s.next_due <= now + self.jitter_seconds]
+                for state in batch:
+                    state.in_progress = True
+                task = asyncio.create_task(self._refresh(batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            pending = [s.next_due for s in self._states.values() if not s.in_progress]
+            delay = min(pending, default=now + MAX_TICK_SECONDS) - now
+            await asyncio.sleep(min(max(delay, 0.1), MAX_TICK_SECONDS))
+
+    def _sync_horizon(self) -> None:
+        """Track the dates from today to the end of the horizon, plus watched ones."""
+        today = datetime.now()
+        wanted = [
+            (today + timedelta(days=offset)).strftime("%d/%m/%Y")
+            for offset in range(self.horizon_days)
+        ]
+        if self.hub is not None:
+            wanted += sorted(self.hub.watched_dates() - set(wanted))
+
+        for date in wanted:
+            if date not in self._states:
+                self._states[date] = PrefetchState(date=date)
+
+        for date in [d for d in self._states if d not in wanted]:
+            if not self._states[date].in_progress:
+                del self._states[date]
+
+    def _next_delays(self, dates: list[str]) -> dict[str, float]:
+        """Return each date's refresh delay, with one jitter for the batch."""
+        today = datetime.now().strftime("%d/%m/%Y")
+        jitter = random.uniform(-self.jitter_seconds, self.jitter_seconds)
+        delays = {}
+        for date in dates:
+            base = (
+                self.today_interval_seconds if date == today else self.interval_seconds
+            )
+            delays[date] = max(1.0, base + jitter)
+        return delays
+
+    async def _refresh(self, batch: list[PrefetchState]) -> None:
+        """Refresh a batch of dates into the cache for every rental length."""
+        delays = self._next_delays([state.date for state in batch])
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                with upstream_priority(Priority.BACKGROUND):
+                    day_responses = await self.service.refresh_availability(
+                        [state.date for state in batch],
+                        ttl_seconds={date: delay * 2 for date, delay in delays.items()},
+                    )
+                duration = time.perf_counter() - started
+            for state in batch:
+                state.last_duration_seconds = duration
+                failed = next(iter(day_responses[state.date].values())).failed_courts
+                if failed:
+                    state.failures += 1
+                    state.last_error = f"Courts failed: {failed}"
+                else:
+                    state.last_refreshed_at = datetime.now()
+                    state.refreshes += 1
+                    state.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            for state in batch:
+                state.failures += 1
+                state.last_error = repr(exc)
+            logger.exception(
+                "Prefetch failed for %s", ", ".join(state.date for state in batch)
+            )
+        finally:
+            for state in batch:
+                state.next_due = time.monotonic() + delays[state.date]
+                state.in_progress = False
+
+    def status(self) -> dict:
+        """Return the refresh status of every tracked date."""
+        now = time.monotonic()
+        return {
+            "running": self.running,
+            "horizon_days": self.horizon_days,
+            "concurrency": self.concurrency,
+            "dates": [
+                {
+                    "date": state.date,
+                    "last_refreshed_at": (
+                        state.last_refreshed_at.isoformat(timespec="seconds")
+                        if state.last_refreshed_at
+                        else None
+                    ),
+                    "last_duration_ms": (
+                        round(state.last_duration_seconds * 1000, 1)
+                        if state.last_duration_seconds is not None
+                        else None
+                    ),
+                    "next_refresh_in_seconds": (
+                        None
+                        if state.in_progress
+                        else round(max(0.0, state.next_due - now), 1)
+                    ),
+                    "in_progress": state.in_progress,
+                    "refreshes": state.refreshes,
+                    "failures": state.failures,
+                    "last_error": state.last_error,
+                }
+                for state in self._states.values()
+            ],
+        }
@@ -0,0 +1,164 @@
+"""Publishing availability from the scraper worker to read-only API processes."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from ..core.config import settings
+from ..core.times import parse_date
+from ..models.availability import AvailabilityResponse
+from ..storage import PublishedEntry, write_published
+from .availability import AvailabilityService
+
+logger = logging.getLogger(__name__)
+
+
+class AvailabilityPublisher:
+    """
+    Write every stored availability response to the published file.
+
+    Registered as a cache listener in the worker. Stored days are marked
+    dirty and written together at most once per interval, so a burst of
+    refreshes is one file write. Each day keeps its cached JSON, fetch
+    time and expiry; days before today are dropped.
+    """
+
+    def __init__(
+        self,
+        service: AvailabilityService,
+        path: str | None = None,
+        interval_seconds: float | None = None,
+    ):
+        self.service = service
+        self.path = path or settings.published_path
+        self.interval_seconds = interval_seconds or settings.published_interval_seconds
+
+        self._entries: dict[tuple[str, int], PublishedEntry] = {}
+        # (date, rental_length) -> latest response stored since the last write
+        self._dirty: dict[tuple[str, int], AvailabilityResponse] = {}
+        self._runner: asyncio.Task | None = None
+
+        self.writes = 0
+        self.bytes_written = 0
+        self.last_write_seconds: float | None = None
+
+    def record(self, response: AvailabilityResponse) -> None:
+        """Mark a stored day to be written with the next publish."""
+        self._dirty[(response.date, response.rental_length)] = response
+
+    def start(self) -> None:
+        """Start publishing on the running event loop."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop publishing, writing anything still pending first."""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        await self.publish()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.publish()
+            except Exception:
+                logger.exception("Publishing availability failed")
+
+    async def publish(self) -> None:
+        """Write the file if any day changed since the last write."""
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, {}
+        for (date, rental_length), response in dirty.items():
+            # Evicted since it was stored; the last published copy stays
+            cached = self.service.cached_day_body(response)
+            if cached is not None:
+                self._entries[(date, rental_length)] = PublishedEntry(
+                    date=date,
+                    rental_length=rental_length,
+                    fetched_at=cached.last_modified,
+                    expires_at=cached.expires_at,
+                    body=cached.body.identity,
+                )
+
+        today = datetime.now().toordinal()
+        for key in [key for key in self._entries if parse_date(key[0]) < today]:
+            del self._entries[key]
+
+        started = time.perf_counter()
+        self.bytes_written = await asyncio.to_thread(
+            write_published,
+            self.path,
+            list(self._entries.values()),
+            {"courts": self.service.metadata.court_names},
+        )
+        self.last_write_seconds = time.perf_counter() - started
+        self.writes += 1
+
+    def stats(self) -> dict:
+        """Return published days and write counters."""
+        return {
+            "path": self.path,
+            "entries": len(self._entries),
+            "pending": len(self._dirty),
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "last_write_seconds": self.last_write_seconds,
+        }
+
+
+class PublishedFollower:
+    """
+    Keep a read-only service current with the worker's published file.
+
+    Checks the file once per interval and takes in the days that changed,
+    which stores them in the cache and so versions them and notifies
+    stream subscribers and the search index as a local refresh would.
+    """
+
+    def __init__(
+        self,
+        service: AvailabilityService,
+        interval_seconds: float | None = None,
+    ):
+        self.service = service
+        self.interval_seconds = interval_seconds or settings.published_interval_seconds
+        self._runner: asyncio.Task | None = None
+
+        self.loaded = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start following on the running event loop."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop following and unmap the file."""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        self.service.published.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.loaded += self.service.load_published()
+            except Exception:
+                self.errors += 1
+                logger.exception("Reading published availability failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def stats(self) -> dict:
+        """Return the published file's state and days taken in."""
+        return {
+            **self.service.published.stats(),
+            "loaded": self.loaded,
+            "errors": self.errors,
+        }
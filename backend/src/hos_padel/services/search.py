@@ -0,0 +1,218 @@
+"""Free-slot index over cached availability for "find me a court" searches."""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..core.constants import BASE_RENTAL_LENGTH
+from ..core.times import format_minutes, parse_date, parse_minutes
+from ..models.availability import AvailabilityResponse
+from ..models.court import Court
+from ..models.search import SearchMatch
+from .changes import court_masks
+
+
+@dataclass
+class DayIndex:
+    """A day's slot grid and per-court free-slot bitmasks."""
+
+    origin: int
+    step: int
+    slot_count: int
+    weekday: int
+    masks: dict[int, int]
+
+    @classmethod
+    def of(cls, response: AvailabilityResponse) -> "DayIndex":
+        if response.slots:
+            first = response.slots[0]
+            origin = parse_minutes(first.start_time)
+            step = parse_minutes(first.end_time) - origin
+        else:
+            origin, step = 0, 1
+        return cls(
+            origin=origin,
+            step=step,
+            slot_count=len(response.slots),
+            weekday=datetime.strptime(response.date, "%d/%m/%Y").weekday(),
+            masks=court_masks(response),
+        )
+
+    def starts(self, duration: int) -> dict[int, int]:
+        """
+        Return one bitmask per court with bit i set when the court is free
+        for `duration` minutes from the start of slot i.
+        """
+        span = -(-duration // self.step)
+        starts = {}
+        for court_id, mask in self.masks.items():
+            # AND the mask with itself shifted by 1, 2, 4, ... slots
+            run, width = mask, 1
+            while width < span:
+                shift = min(width, span - width)
+                run &= run >> shift
+                width += shift
+            if run:
+                starts[court_id] = run
+        return starts
+
+    def window(self, earliest: int | None, latest: int | None) -> int:
+        """Return a mask of the slots starting within [earliest, latest]."""
+        first = (
+            0 if earliest is None else max(0, -((self.origin - earliest) // self.step))
+        )
+        last = (
+            self.slot_count
+            if latest is None
+            else min(self.slot_count, (latest - self.origin) // self.step + 1)
+        )
+        if first >= last:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+
+class AvailabilityIndex:
+    """
+    Per-court free-slot bitmasks for every cached day, kept current.
+
+    Registered as a cache listener, so each stored base-length response
+    replaces its day's masks whichever path refreshed it, and a search
+    never touches the upstream. Longer rentals are found by ANDing a
+    court's mask with shifted copies of itself, which matches how the
+    service derives them from the base-length rows.
+    """
+
+    def __init__(self, rental_length: int = BASE_RENTAL_LENGTH):
+        self.rental_length = rental_length
+        self._days: dict[str, DayIndex] = {}
+        self.updates = 0
+        self.searches = 0
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def record(self, response: AvailabilityResponse) -> None:
+        """Index a stored response, dropping days before today."""
+        if response.rental_length != self.rental_length:
+            return
+        self._days[response.date] = DayIndex.of(response)
+        self.updates += 1
+
+        today = datetime.now().toordinal()
+        for date in [d for d in self._days if parse_date(d) < today]:
+            del self._days[date]
+
+    def search(
+        self,
+        dates: Iterable[str],
+        duration: int,
+        courts: Mapping[int, str],
+        earliest: str | None = None,
+        latest: str | None = None,
+        min_courts: int = 1,
+        adjacent: bool = False,
+        weekdays: set[int] | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[SearchMatch], list[str]]:
+        """
+        Find start times with at least min_courts free for the whole duration.
+
+        Args:
+            dates: DD/MM/YYYY dates to search, in order
+            duration: Rental length in minutes
+            courts: Court names by ID in venue order, for adjacency and names
+            earliest: Earliest start time (HH:MM), inclusive
+            latest: Latest start time (HH:MM), inclusive
+            min_courts: Courts that must be free at once
+            adjacent: Whether those courts must be next to each other
+            weekdays: datetime.weekday() numbers to keep (all if None)
+            limit: Stop after this many matches
+
+        Returns:
+            Matches ordered by date and start time, and the dates that
+            aren't indexed and so weren't searched
+        """
+        self.searches += 1
+        earliest_minutes = None if earliest is None else parse_minutes(earliest)
+        latest_minutes = None if latest is None else parse_minutes(latest)
+        position = {court_id: i for i, court_id in enumerate(courts)}
+
+        matches: list[SearchMatch] = []
+        missing: list[str] = []
+        for date in dates:
+            day = self._days.get(date)
+            if day is None:
+                missing.append(date)
+                continue
+            if weekdays is not None and day.weekday not in weekdays:
+                continue
+
+            starts = day.starts(duration)
+            candidates = 0
+            for mask in starts.values():
+                candidates |= mask
+            candidates &= day.window(earliest_minutes, latest_minutes)
+
+            while candidates:
+                index = (candidates & -candidates).bit_length() - 1
+                candidates &= candidates - 1
+
+                free = sorted(
+                    (
+                        court_id
+                        for court_id, mask in starts.items()
+                        if mask >> index & 1
+                    ),
+                    key=lambda court_id: position.get(court_id, len(position)),
+                )
+                if adjacent:
+                    free = _adjacent_run(free, position, min_courts)
+                if len(free) < min_courts:
+                    continue
+
+                start = day.origin + index * day.step
+                matches.append(
+                    SearchMatch(
+                        date=date,
+                        start_time=format_minutes(start),
+                        end_time=format_minutes(start + duration),
+                        courts=[
+                            Court(
+                                id=court_id,
+                                name=courts.get(court_id, f"Court {court_id}"),
+                            )
+                            for court_id in free
+                        ],
+                    )
+                )
+                if limit is not None and len(matches) >= limit:
+                    return matches, missing
+
+        return matches, missing
+
+    def stats(self) -> dict:
+        """Return indexed days and counters."""
+        return {
+            "days": len(self._days),
+            "rental_length": self.rental_length,
+            "updates": self.updates,
+            "searches": self.searches,
+        }
+
+
+def _adjacent_run(
+    free: list[int],
+    position: dict[int, int],
+    min_courts: int,
+) -> list[int]:
+    """Return the first run of at least min_courts neighbouring courts, or []."""
+    run: list[int] = []
+    for court_id in free:
+        if court_id not in position:
+            continue
+        if run and position[run[-1]] + 1 != position[court_id]:
+            if len(run) >= min_courts:
+                return run
+            run = []
+        run.append(court_id)
+    return run if len(run) >= min_courts else []
@@ -0,0 +1,52 @@
+"""In-process single-flight coalescing of concurrent identical calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    """
+    Coalesce concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is running await the same task instead of starting their own.
+    The task is shielded so a cancelled caller does not cancel the work
+    other callers are waiting on.
+    """
+
+    def __init__(self):
+        self._inflight: dict[K, asyncio.Task[T]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn for key, or join the call already in flight for key."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.calls += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task[T]) -> None:
+        """Drop a finished task and mark its exception as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Return coalescing counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,127 @@
+"""Bitmask slot-grid engine for building a day's court availability."""
+
+from ..core.constants import (
+    COURT_ID_TO_NAME,
+    COURT_IDS,
+    DEFAULT_END_TIME,
+    DEFAULT_START_TIME,
+)
+from ..core.times import format_minutes, parse_minutes
+from ..models.availability import TimeSlot
+from ..models.court import CourtStatus
+
+# Width of a grid slot in minutes
+SLOT_MINUTES = 30
+
+
+class SlotGrid:
+    """
+    A day's fixed-step slot grid with one free-slot bitmask per court.
+
+    Slot i covers [origin + i * step, origin + (i + 1) * step) in minutes
+    since midnight, and bit i of a court's mask is set when the court is
+    free at any point in that slot. Pydantic models are only built when
+    the grid is expanded with to_time_slots().
+    """
+
+    __slots__ = ("court_ids", "date", "free", "names", "origin", "slot_count", "step")
+
+    def __init__(
+        self,
+        date: str,
+        start_time: str = DEFAULT_START_TIME,
+        end_time: str = DEFAULT_END_TIME,
+        step: int = SLOT_MINUTES,
+        court_ids: list[int] = COURT_IDS,
+        court_names: dict[int, str] = COURT_ID_TO_NAME,
+    ):
+        self.date = date
+        self.origin = parse_minutes(start_time)
+        self.step = step
+        # Round up so a partial final slot is still included
+        self.slot_count = max(0, -((self.origin - parse_minutes(end_time)) // step))
+        self.court_ids = sorted(court_ids)
+        self.names = court_names
+        self.free: dict[int, int] = dict.fromkeys(self.court_ids, 0)
+
+    @classmethod
+    def from_time_slots(
+        cls,
+        date: str,
+        slots: list[TimeSlot],
+        court_ids: list[int] = COURT_IDS,
+        court_names: dict[int, str] = COURT_ID_TO_NAME,
+    ) -> "SlotGrid":
+        """Rebuild the grid that to_time_slots() expanded into slots."""
+        if slots:
+            origin = parse_minutes(slots[0].start_time)
+            step = parse_minutes(slots[0].end_time) - origin
+            start_time = slots[0].start_time
+        else:
+            step, start_time = SLOT_MINUTES, DEFAULT_START_TIME
+
+        # Sized from the slots rather than an end time, which may be 24:00
+        grid = cls(date, start_time, start_time, step, court_ids, court_names)
+        grid.slot_count = len(slots)
+        for index, slot in enumerate(slots):
+            for court in slot.courts:
+                if not court.is_booked:
+                    grid.free[court.court_id] = (
+                        grid.free.get(court.court_id, 0) | 1 << index
+                    )
+        return grid
+
+    def slot_range(self, start_minutes: int, end_minutes: int) -> tuple[int, int]:
+        """Return the [first, last) slot indices overlapping a time range."""
+        first = max(0, (start_minutes - self.origin) // self.step)
+        last = min(self.slot_count, -((self.origin - end_minutes) // self.step))
+        return first, last
+
+    def mark_free(self, court_id: int, start_minutes: int, end_minutes: int) -> None:
+        """Mark every slot overlapping [start_minutes, end_minutes) as free."""
+        first, last = self.slot_range(start_minutes, end_minutes)
+        if first < last:
+            bits = ((1 << (last - first)) - 1) << first
+            self.free[court_id] = self.free.get(court_id, 0) | bits
+
+    def available_mask(self) -> int:
+        """Return a mask of slots where at least one court is free."""
+        mask = 0
+        for court_mask in self.free.values():
+            mask |= court_mask
+        return mask
+
+    def to_time_slots(self) -> list[TimeSlot]:
+        """Expand the grid into TimeSlot models, courts sorted by ID."""
+        court_ids = sorted(self.free)
+        known = set(self.court_ids)
+        names = {
+            court_id: self.names.get(court_id, f"Court {court_id}")
+            for court_id in court_ids
+        }
+
+        slots = []
+        for index in range(self.slot_count):
+            start = self.origin + index * self.step
+            bit = 1 << index
+            courts = [
+                CourtStatus(
+                    court_id=court_id,
+                    court_name=names[court_id],
+                    is_booked=not self.free[court_id] & bit,
+                )
+                for court_id in court_ids
+                # Courts outside the venue list only appear where free
+                if court_id in known or self.free[court_id] & bit
+            ]
+            slots.append(
+                TimeSlot(
+                    start_time=format_minutes(start),
+                    end_time=format_minutes(start + self.step),
+                    date=self.date,
+                    has_available_court=any(not c.is_booked for c in courts),
+                    courts=courts,
+                )
+            )
+
+        return slots
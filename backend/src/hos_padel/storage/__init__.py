@@ -0,0 +1,37 @@
+"""Persistent storage for scraped availability."""
+
+from .base import CourtSnapshot, SnapshotStore
+from .history import OccupancyHistory, create_occupancy_history
+from .published import PublishedEntry, PublishedReader, write_published
+from .sqlite import SQLiteSnapshotStore
+
+
+def create_snapshot_store(backend: str, path: str) -> SnapshotStore | None:
+    """
+    Create the configured snapshot store.
+
+    Args:
+        backend: "sqlite", or "none" to disable persistence
+        path: Database path for file-backed stores
+
+    Returns:
+        A SnapshotStore, or None when persistence is disabled
+    """
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return SQLiteSnapshotStore(path)
+    raise ValueError(f"Unknown snapshot backend: {backend}")
+
+
+__all__ = [
+    "CourtSnapshot",
+    "OccupancyHistory",
+    "PublishedEntry",
+    "PublishedReader",
+    "SQLiteSnapshotStore",
+    "SnapshotStore",
+    "create_occupancy_history",
+    "create_snapshot_store",
+    "write_published",
+]
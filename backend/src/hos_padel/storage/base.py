@@ -0,0 +1,57 @@
+"""Snapshot store interface."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from ..models.booking import BookingSlot
+
+
+@dataclass
+class CourtSnapshot:
+    """The latest FilterResults rows for one court, date and rental length."""
+
+    location_id: int
+    rental_type_id: int
+    court_id: int
+    date: str
+    rental_length: int
+    fetched_at: float
+    rows: list[BookingSlot]
+
+
+class SnapshotStore(ABC):
+    """
+    Storage backend for the latest scraped rows per court and date.
+
+    Saving a snapshot replaces any earlier one for the same key, so the
+    store always holds the last-known state of each court and date.
+    Dates are DD/MM/YYYY strings and fetched_at is a Unix timestamp.
+    """
+
+    @abstractmethod
+    async def save(self, snapshots: list[CourtSnapshot]) -> None:
+        """Persist snapshots, replacing earlier ones with the same key."""
+
+    @abstractmethod
+    async def load_day(
+        self,
+        location_id: int,
+        rental_type_id: int,
+        date: str,
+        rental_length: int,
+    ) -> list[CourtSnapshot]:
+        """Load every court's latest snapshot for a date."""
+
+    @abstractmethod
+    async def load_since(
+        self,
+        location_id: int,
+        rental_type_id: int,
+        first_date: str,
+        fetched_after: float,
+    ) -> list[CourtSnapshot]:
+        """Load snapshots on or after first_date fetched after a timestamp."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release any resources held by the store."""
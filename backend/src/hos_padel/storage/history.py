@@ -0,0 +1,339 @@
+"""Occupancy history kept in per-month memory-mapped NumPy arrays."""
+
+import fcntl
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ..core.constants import BASE_RENTAL_LENGTH
+from ..core.times import MINUTES_PER_DAY, parse_minutes
+from ..models.availability import AvailabilityResponse
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install 'hos-padel-api[analytics]'
+    np = None
+
+logger = logging.getLogger(__name__)
+
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+SLOTS_PER_HOUR = 60 // SLOT_MINUTES
+DAYS_PER_MONTH = 31
+# Court columns in each month file; courts beyond this aren't recorded
+MAX_COURTS = 16
+# Month files kept mapped for writing
+OPEN_MONTHS = 3
+
+# Slot states
+UNSEEN = 0
+FREE = 1
+BOOKED = 2
+
+# Sell-out values other than minutes before the slot's start
+NOT_SOLD = -1
+# Already booked the first time it was seen, so when it sold is unknown
+SOLD_BEFORE_SEEN = -2
+
+# Upper bounds (minutes ahead) of the sell-out lead-time buckets
+LEAD_BUCKET_EDGES = [60, 180, 360, 720, 1440, 2880, 4320, 10080, 20160]
+LEAD_BUCKET_LABELS = [
+    "<1h",
+    "1-3h",
+    "3-6h",
+    "6-12h",
+    "12-24h",
+    "1-2d",
+    "2-3d",
+    "3-7d",
+    "7-14d",
+    ">14d",
+]
+
+
+class OccupancyHistory:
+    """
+    Append-only record of every court slot's state, one file pair per month.
+
+    Each month is a (day, 30-minute slot of the day, court) grid in two
+    .npy files mapped with numpy.memmap: the last state seen (unseen, free
+    or booked) and, for slots seen free and later booked, how many minutes
+    before the start they sold. Every stored availability refresh updates
+    its day in place, and only slots that haven't started are recorded.
+    Court IDs are given columns in the order first seen.
+
+    At most OPEN_MONTHS months are mapped for writing and aggregates map
+    one month at a time, so memory stays flat however long the history.
+    Only the process holding the writer lock (see claim_writer()) may
+    record; any number of processes can read.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        location_id: int,
+        rental_type_id: int,
+        rental_length: int = BASE_RENTAL_LENGTH,
+    ):
+        self.root = Path(path) / f"{location_id}-{rental_type_id}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.rental_length = rental_length
+
+        self._columns_path = self.root / "courts.json"
+        self._columns: dict[int, int] = {}
+        if self._columns_path.exists():
+            columns = json.loads(self._columns_path.read_text())
+            self._columns = {int(court_id): col for court_id, col in columns.items()}
+        self._months: OrderedDict[str, tuple] = OrderedDict()
+        self._lock_fd: int | None = None
+
+        self.writer = False
+        self.records = 0
+        self.cells_changed = 0
+        self.slots_sold = 0
+        self.courts_skipped = 0
+
+    def claim_writer(self) -> bool:
+        """
+        Take the history's writer lock if no other process holds it.
+
+        The lock is held until close() or the process exits.
+
+        Returns:
+            True if this process may record, False if another one does
+        """
+        if self.writer:
+            return True
+        lock_fd = os.open(self.root / "writer.lock", os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock_fd)
+            return False
+        self._lock_fd = lock_fd
+        self.writer = True
+        return True
+
+    def record(self, response: AvailabilityResponse) -> None:
+        """Update a day's slot states and sell-out times from a response."""
+        if response.rental_length != self.rental_length or not response.slots:
+            return
+
+        day = datetime.strptime(response.date, "%d/%m/%Y")
+        # Minutes from now until each slot of the day starts
+        lead = (day.timestamp() - time.time()) / 60 + np.arange(
+            0, MINUTES_PER_DAY, SLOT_MINUTES
+        )
+
+        new = np.zeros((SLOTS_PER_DAY, MAX_COURTS), np.uint8)
+        # Stale courts are last-known data, not a fresh observation
+        skip = set(response.stale_courts) | set(response.failed_courts)
+        for slot in response.slots:
+            row = parse_minutes(slot.start_time) // SLOT_MINUTES
+            for court in slot.courts:
+                col = None if court.court_id in skip else self._column(court.court_id)
+                if col is not None:
+                    new[row, col] = BOOKED if court.is_booked else FREE
+
+        month_states, month_sold = self._month(day)
+        state, sold = month_states[day.day - 1], month_sold[day.day - 1]
+        seen = (new != UNSEEN) & (lead > 0)[:, None]
+        booked = seen & (new == BOOKED)
+        just_sold = booked & (state == FREE)
+        lead_minutes = np.broadcast_to(lead[:, None], new.shape).astype(np.int32)
+
+        sold[just_sold] = lead_minutes[just_sold]
+        sold[booked & (state == UNSEEN)] = SOLD_BEFORE_SEEN
+        # A cancellation puts the slot back on sale
+        sold[seen & (new == FREE)] = NOT_SOLD
+        self.cells_changed += int((seen & (state != new)).sum())
+        self.slots_sold += int(just_sold.sum())
+        state[seen] = new[seen]
+        self.records += 1
+
+    def occupancy(self, first: str, last: str) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        Count booked and observed court slots by weekday and hour.
+
+        Args:
+            first: First date (DD/MM/YYYY), inclusive
+            last: Last date (DD/MM/YYYY), inclusive
+
+        Returns:
+            (booked, observed) arrays of shape (7, 24), Monday first
+        """
+        booked = np.zeros((7, SLOTS_PER_DAY), np.int64)
+        observed = np.zeros((7, SLOTS_PER_DAY), np.int64)
+        for weekdays, states, _ in self._chunks(first, last):
+            np.add.at(booked, weekdays, (states == BOOKED).sum(axis=2))
+            np.add.at(observed, weekdays, (states != UNSEEN).sum(axis=2))
+        return _by_hour(booked), _by_hour(observed)
+
+    def sellout(
+        self,
+        first: str,
+        last: str,
+    ) -> "tuple[np.ndarray, np.ndarray, np.ndarray, int]":
+        """
+        Summarise how far ahead court slots sold, by weekday and hour.
+
+        Args:
+            first: First date (DD/MM/YYYY), inclusive
+            last: Last date (DD/MM/YYYY), inclusive
+
+        Returns:
+            Slots seen free and later booked and the sum of their lead
+            minutes, both (7, 24); a (24, len(LEAD_BUCKET_LABELS)) lead-time
+            histogram; and the count of slots booked before first seen
+        """
+        sold = np.zeros((7, SLOTS_PER_DAY), np.int64)
+        lead_sum = np.zeros((7, SLOTS_PER_DAY), np.int64)
+        histogram = np.zeros((24, len(LEAD_BUCKET_LABELS)), np.int64)
+        hours = np.repeat(np.arange(24), SLOTS_PER_HOUR)[None, :, None]
+        before_seen = 0
+        for weekdays, _, leads in self._chunks(first, last):
+            known = leads >= 0
+            np.add.at(sold, weekdays, known.sum(axis=2))
+            np.add.at(lead_sum, weekdays, np.where(known, leads, 0).sum(axis=2))
+            buckets = np.digitize(leads[known], LEAD_BUCKET_EDGES)
+            np.add.at(
+                histogram, (np.broadcast_to(hours, leads.shape)[known], buckets), 1
+            )
+            before_seen += int((leads == SOLD_BEFORE_SEEN).sum())
+        return _by_hour(sold), _by_hour(lead_sum), histogram, before_seen
+
+    def _chunks(
+        self,
+        first: str,
+        last: str,
+    ) -> "Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]":
+        """
+        Yield each recorded month's days between two dates, read-only.
+
+        Yields:
+            (weekday per day, states, sell-out leads) for the month's days
+            in range
+        """
+        start = datetime.strptime(first, "%d/%m/%Y")
+        end = datetime.strptime(last, "%d/%m/%Y")
+        month = start.replace(day=1)
+        while month <= end:
+            next_month = (month + timedelta(days=DAYS_PER_MONTH + 1)).replace(day=1)
+            states_path, sold_path = self._paths(month)
+            if states_path.exists():
+                first_day = max(start, month).day - 1
+                last_day = (min(end, next_month - timedelta(days=1))).day
+                weekdays = (month.weekday() + np.arange(first_day, last_day)) % 7
+                states = np.load(states_path, mmap_mode="r")[first_day:last_day]
+                leads = np.load(sold_path, mmap_mode="r")[first_day:last_day]
+                yield weekdays, states, leads
+                del states, leads
+            month = next_month
+
+    def _month(self, day: datetime) -> "tuple[np.ndarray, np.ndarray]":
+        """Return a month's state and sell-out arrays, creating the files."""
+        key = f"{day:%Y-%m}"
+        arrays = self._months.get(key)
+        if arrays is not None:
+            self._months.move_to_end(key)
+            return arrays
+
+        states_path, sold_path = self._paths(day)
+        shape = (DAYS_PER_MONTH, SLOTS_PER_DAY, MAX_COURTS)
+        if states_path.exists():
+            arrays = (
+                np.load(states_path, mmap_mode="r+"),
+                np.load(sold_path, mmap_mode="r+"),
+            )
+        else:
+            sold = np.lib.format.open_memmap(
+                sold_path, mode="w+", dtype=np.int32, shape=shape
+            )
+            sold[:] = NOT_SOLD
+            states = np.lib.format.open_memmap(
+                states_path, mode="w+", dtype=np.uint8, shape=shape
+            )
+            arrays = (states, sold)
+
+        self._months[key] = arrays
+        while len(self._months) > OPEN_MONTHS:
+            _, (states, sold) = self._months.popitem(last=False)
+            states.flush()
+            sold.flush()
+        return arrays
+
+    def _paths(self, day: datetime) -> tuple[Path, Path]:
+        """Return the state and sell-out file paths for a date's month."""
+        return (
+            self.root / f"{day:%Y-%m}-states.npy",
+            self.root / f"{day:%Y-%m}-sold.npy",
+        )
+
+    def _column(self, court_id: int) -> int | None:
+        """Return a court's column, assigning the next free one if new."""
+        col = self._columns.get(court_id)
+        if col is None:
+            if len(self._columns) >= MAX_COURTS:
+                self.courts_skipped += 1
+                return None
+            col = self._columns[court_id] = len(self._columns)
+            self._columns_path.write_text(json.dumps(self._columns))
+        return col
+
+    def stats(self) -> dict:
+        """Return recorded months, file sizes and counters."""
+        files = sorted(self.root.glob("*-states.npy"))
+        return {
+            "path": str(self.root),
+            "months": [path.name.removesuffix("-states.npy") for path in files],
+            "bytes_on_disk": sum(path.stat().st_size for path in self.root.iterdir()),
+            "months_mapped": len(self._months),
+            "writer": self.writer,
+            "courts": self._columns,
+            "records": self.records,
+            "cells_changed": self.cells_changed,
+            "slots_sold": self.slots_sold,
+            "courts_skipped": self.courts_skipped,
+        }
+
+    def close(self) -> None:
+        """Flush and unmap every open month and release the writer lock."""
+        for states, sold in self._months.values():
+            states.flush()
+            sold.flush()
+        self._months.clear()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            self.writer = False
+
+
+def _by_hour(counts: "np.ndarray") -> "np.ndarray":
+    """Sum (7, slots per day) counts into (7, 24) hourly counts."""
+    return counts.reshape(7, 24, SLOTS_PER_HOUR).sum(axis=2)
+
+
+def create_occupancy_history(
+    enabled: bool,
+    path: str,
+    location_id: int,
+    rental_type_id: int,
+) -> OccupancyHistory | None:
+    """
+    Create the occupancy history store if enabled and NumPy is installed.
+
+    Returns:
+        An OccupancyHistory, or None when history is off
+    """
+    if not enabled:
+        logger.warning("Occupancy history is off; history reports will return 503")
+        return None
+    if np is None:
+        logger.warning("Occupancy history needs NumPy; install the analytics extra")
+        return None
+    return OccupancyHistory(path, location_id, rental_type_id)
@@ -0,0 +1,186 @@
+"""Availability published by the scraper worker in a memory-mapped file."""
+
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+MAGIC = b"HOSPUB01"
+# magic, published at, entry count, metadata length
+HEADER = struct.Struct("<8sdII")
+# date (DD/MM/YYYY), rental length, fetched at, expires at, body offset, length
+ENTRY = struct.Struct("<10sHddQI")
+
+
+@dataclass
+class PublishedEntry:
+    """One (date, rental length) AvailabilityResponse as encoded JSON."""
+
+    date: str
+    rental_length: int
+    # Wall-clock times the data was fetched and stops being fresh
+    fetched_at: float
+    expires_at: float
+    body: bytes
+
+
+def write_published(
+    path: str | Path,
+    entries: Iterable[PublishedEntry],
+    meta: dict,
+) -> int:
+    """
+    Replace the published file with entries and venue metadata.
+
+    The file is written beside the target and renamed over it, so a reader
+    sees either the old file or the new one, never a partial write.
+
+    Returns:
+        The number of bytes written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entries = list(entries)
+    meta_bytes = json.dumps(meta).encode()
+
+    offset = HEADER.size + len(meta_bytes) + ENTRY.size * len(entries)
+    index = []
+    for entry in entries:
+        index.append(
+            ENTRY.pack(
+                entry.date.encode(),
+                entry.rental_length,
+                entry.fetched_at,
+                entry.expires_at,
+                offset,
+                len(entry.body),
+            )
+        )
+        offset += len(entry.body)
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, time.time(), len(entries), len(meta_bytes)))
+        f.write(meta_bytes)
+        f.writelines(index)
+        f.writelines(entry.body for entry in entries)
+    os.replace(tmp, path)
+    return offset
+
+
+class PublishedReader:
+    """
+    Read-only view of the worker's published file.
+
+    The file is mapped with mmap and only its header and index are parsed,
+    so checking for new data costs one stat() when nothing changed, and
+    only the bodies of changed days are copied out. A replaced file is
+    remapped; the old mapping stays valid until then because the rename
+    keeps its inode alive.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.published_at: float | None = None
+        self.meta: dict = {}
+
+        self._signature: tuple[int, int, int] | None = None
+        self._map: mmap.mmap | None = None
+        # (date, rental_length) -> (fetched_at, expires_at, offset, length)
+        self._index: dict[tuple[str, int], tuple[float, float, int, int]] = {}
+
+        self.reads = 0
+        self.entries_changed = 0
+
+    def refresh(self) -> list[PublishedEntry]:
+        """
+        Remap the file if the worker replaced it.
+
+        Returns:
+            Entries that are new or were fetched again since the last call
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return []
+
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, published_at, count, meta_length = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f"{self.path} is not a published availability file")
+
+        meta_start = HEADER.size
+        meta = json.loads(mapped[meta_start : meta_start + meta_length])
+        index = {}
+        for position in range(count):
+            date, rental_length, fetched_at, expires_at, offset, length = (
+                ENTRY.unpack_from(
+                    mapped, meta_start + meta_length + position * ENTRY.size
+                )
+            )
+            index[(date.decode(), rental_length)] = (
+                fetched_at,
+                expires_at,
+                offset,
+                length,
+            )
+
+        if self._map is not None:
+            self._map.close()
+        previous = self._index
+        self._map, self._index, self._signature = mapped, index, signature
+        self.published_at, self.meta = published_at, meta
+        self.reads += 1
+
+        changed = [
+            self._entry(key)
+            for key, (fetched_at, *_) in index.items()
+            if key not in previous or previous[key][0] != fetched_at
+        ]
+        self.entries_changed += len(changed)
+        return changed
+
+    def get(self, date: str, rental_length: int) -> PublishedEntry | None:
+        """Return a published day as of the last refresh, or None."""
+        if (date, rental_length) not in self._index:
+            return None
+        return self._entry((date, rental_length))
+
+    def _entry(self, key: tuple[str, int]) -> PublishedEntry:
+        fetched_at, expires_at, offset, length = self._index[key]
+        return PublishedEntry(
+            date=key[0],
+            rental_length=key[1],
+            fetched_at=fetched_at,
+            expires_at=expires_at,
+            body=self._map[offset : offset + length],
+        )
+
+    def stats(self) -> dict:
+        """Return the mapped file's age, size and read counters."""
+        return {
+            "path": str(self.path),
+            "published_at": self.published_at,
+            "age_seconds": (
+                None if self.published_at is None else time.time() - self.published_at
+            ),
+            "entries": len(self._index),
+            "bytes_mapped": 0 if self._map is None else len(self._map),
+            "reads": self.reads,
+            "entries_changed": self.entries_changed,
+        }
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
@@ -0,0 +1,197 @@
+"""SQLite snapshot store."""
+
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from ..core.times import format_date, format_minutes, parse_date, parse_minutes
+from ..models.booking import BookingSlot
+from .base import CourtSnapshot, SnapshotStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS court_snapshots (
+    location_id INTEGER NOT NULL,
+    rental_type_id INTEGER NOT NULL,
+    rental_length INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    court_id INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (location_id, rental_type_id, rental_length, date, court_id)
+);
+
+CREATE TABLE IF NOT EXISTS snapshot_rows (
+    location_id INTEGER NOT NULL,
+    rental_type_id INTEGER NOT NULL,
+    rental_length INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    court_id INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS snapshot_rows_key
+    ON snapshot_rows (location_id, rental_type_id, rental_length, date, court_id);
+
+CREATE INDEX IF NOT EXISTS snapshot_rows_date ON snapshot_rows (date);
+"""
+
+
+def _to_iso(date: str) -> str:
+    """Convert DD/MM/YYYY to YYYY-MM-DD so dates sort as text."""
+    return datetime.strptime(date, "%d/%m/%Y").strftime("%Y-%m-%d")
+
+
+def _from_iso(date: str) -> str:
+    """Convert YYYY-MM-DD back to DD/MM/YYYY."""
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%d/%m/%Y")
+
+
+class SQLiteSnapshotStore(SnapshotStore):
+    """
+    Snapshot store backed by a local SQLite database in WAL mode.
+
+    WAL lets readers proceed while a snapshot is being written. All writes
+    for one save() call go through executemany in a single transaction.
+    Blocking sqlite3 calls run in a worker thread, serialised by a lock
+    around one shared connection. The first save of each day deletes the
+    snapshots of dates already past, which are never served again, so the
+    database only holds dates from today on.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Today's date (YYYY-MM-DD) once earlier dates have been deleted
+        self._pruned_before: str | None = None
+
+    async def save(self, snapshots: list[CourtSnapshot]) -> None:
+        if snapshots:
+            await asyncio.to_thread(self._save, snapshots)
+
+    def _save(self, snapshots: list[CourtSnapshot]) -> None:
+        keys = [
+            (
+                s.location_id,
+                s.rental_type_id,
+                s.rental_length,
+                _to_iso(s.date),
+                s.court_id,
+            )
+            for s in snapshots
+        ]
+        rows = [
+            (
+                *key,
+                format_date(r.day),
+                format_date(r.day),
+                format_minutes(r.start),
+                format_minutes(r.end),
+            )
+            for key, s in zip(keys, snapshots)
+            for r in s.rows
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO court_snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                [(*key, s.fetched_at) for key, s in zip(keys, snapshots)],
+            )
+            self._conn.executemany(
+                "DELETE FROM snapshot_rows WHERE location_id = ? "
+                "AND rental_type_id = ? AND rental_length = ? AND date = ? "
+                "AND court_id = ?",
+                keys,
+            )
+            self._conn.executemany(
+                "INSERT INTO snapshot_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            today = datetime.now().strftime("%Y-%m-%d")
+            if self._pruned_before != today:
+                self._prune(today)
+
+    def _prune(self, today: str) -> None:
+        """Delete snapshots of dates before today (ISO), inside a transaction."""
+        self._conn.execute("DELETE FROM court_snapshots WHERE date < ?", (today,))
+        self._conn.execute("DELETE FROM snapshot_rows WHERE date < ?", (today,))
+        self._pruned_before = today
+
+    async def load_day(
+        self,
+        location_id: int,
+        rental_type_id: int,
+        date: str,
+        rental_length: int,
+    ) -> list[CourtSnapshot]:
+        return await asyncio.to_thread(
+            self._load,
+            "location_id = ? AND rental_type_id = ? AND date = ? AND rental_length = ?",
+            (location_id, rental_type_id, _to_iso(date), rental_length),
+        )
+
+    async def load_since(
+        self,
+        location_id: int,
+        rental_type_id: int,
+        first_date: str,
+        fetched_after: float,
+    ) -> list[CourtSnapshot]:
+        return await asyncio.to_thread(
+            self._load,
+            "location_id = ? AND rental_type_id = ? AND date >= ? AND fetched_at > ?",
+            (location_id, rental_type_id, _to_iso(first_date), fetched_after),
+        )
+
+    def _load(self, where: str, params: tuple) -> list[CourtSnapshot]:
+        """Load snapshots matching a WHERE clause on court_snapshots."""
+        with self._lock:
+            snapshot_rows = self._conn.execute(
+                "SELECT location_id, rental_type_id, rental_length, date, "
+                f"court_id, fetched_at FROM court_snapshots WHERE {where}",
+                params,
+            ).fetchall()
+            booking_rows = self._conn.execute(
+                "SELECT r.location_id, r.rental_type_id, r.rental_length, r.date, "
+                "r.court_id, r.start_date, r.end_date, r.start_time, r.end_time "
+                "FROM snapshot_rows r JOIN court_snapshots USING "
+                "(location_id, rental_type_id, rental_length, date, court_id) "
+                f"WHERE {where}",
+                params,
+            ).fetchall()
+
+        snapshots: dict[tuple, CourtSnapshot] = {}
+        for *key, fetched_at in snapshot_rows:
+            location_id, rental_type_id, rental_length, date, court_id = key
+            snapshots[tuple(key)] = CourtSnapshot(
+                location_id=location_id,
+                rental_type_id=rental_type_id,
+                court_id=court_id,
+                date=_from_iso(date),
+                rental_length=rental_length,
+                fetched_at=fetched_at,
+                rows=[],
+            )
+        for *key, start_date, _, start_time, end_time in booking_rows:
+            snapshots[tuple(key)].rows.append(
+                BookingSlot(
+                    key[4],
+                    parse_date(start_date),
+                    parse_minutes(start_time),
+                    parse_minutes(end_time),
+                )
+            )
+
+        return list(snapshots.values())
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,122 @@
+"""
+Scraper worker: the one process that calls EZFacility.
+
+Runs the prefetcher and publishes every refreshed day to the published
+file, which API processes started with API_READ_ONLY=true serve from.
+Occupancy history is recorded here too, so it has a single writer. Its
+upstream and build metrics are served on WORKER_METRICS_PORT at /metrics.
+
+Usage:
+    python -m hos_padel.worker
+"""
+
+import asyncio
+import logging
+import signal
+
+from aiohttp import web
+
+from .api.dependencies import create_availability_service
+from .api.metrics import service_families
+from .core.config import settings
+from .core.metrics import CONTENT_TYPE, registry
+from .scraper.client import create_client
+from .services.availability import AvailabilityService
+from .services.changes import ChangeLog
+from .services.history import HistoryRecorder
+from .services.prefetch import AvailabilityPrefetcher
+from .services.publish import AvailabilityPublisher
+from .storage import create_occupancy_history, create_snapshot_store
+
+logger = logging.getLogger(__name__)
+
+
+async def start_metrics_server(service: AvailabilityService) -> web.AppRunner:
+    """Serve the worker's metrics for Prometheus to scrape."""
+
+    async def metrics(request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render(service_families(service)).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, settings.host, settings.worker_metrics_port).start()
+    return runner
+
+
+async def run() -> None:
+    """Scrape and publish until SIGINT or SIGTERM."""
+    client = create_client()
+    store = create_snapshot_store(settings.snapshot_backend, settings.snapshot_path)
+    service = create_availability_service(client, store)
+    # Versioned here so every API process serves the same versions
+    change_log = ChangeLog(
+        max_days=settings.availability_cache_max_entries,
+        max_changes=settings.availability_change_history,
+    )
+    publisher = AvailabilityPublisher(service)
+    service.cache.add_listener(change_log.record)
+    service.cache.add_listener(publisher.record)
+    history = create_occupancy_history(
+        settings.history_enabled,
+        settings.history_path,
+        service.location_id,
+        service.rental_type_id,
+    )
+    recorder = None
+    if history is not None:
+        if history.claim_writer():
+            recorder = HistoryRecorder(history)
+            service.cache.add_listener(recorder.record)
+            recorder.start()
+        else:
+            logger.warning("Another process holds the history writer lock")
+    prefetcher = AvailabilityPrefetcher(service)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    metrics_server = None
+    try:
+        if settings.metrics_enabled:
+            metrics_server = await start_metrics_server(service)
+        await service.metadata.refresh()
+        await service.warm_start()
+        publisher.start()
+        prefetcher.start()
+        logger.info(
+            "Worker publishing %d days to %s",
+            prefetcher.horizon_days,
+            publisher.path,
+        )
+        await stopping.wait()
+    finally:
+        await prefetcher.stop()
+        await publisher.stop()
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+        await client.close()
+        if store is not None:
+            await store.close()
+        if recorder is not None:
+            await recorder.stop()
+        if history is not None:
+            history.close()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
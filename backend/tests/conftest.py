@@ -0,0 +1,75 @@
+"""Shared fixtures: an availability service over a stubbed upstream."""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from hos_padel.core.times import parse_date
+from hos_padel.main import app
+from hos_padel.models.booking import BookingSlot
+from hos_padel.services.availability import AvailabilityCache, AvailabilityService
+
+
+class FakeUpstream:
+    """
+    Stands in for the planned FilterResults calls.
+
+    Every court that hasn't failed is free for an hour from each of
+    `starts` (minutes since midnight) on every date asked for.
+    """
+
+    def __init__(self):
+        self.starts = [600]
+        self.failed: set[int] = set()
+        self.calls = 0
+
+    async def fetch_dates(self, service, dates, cached_dates=()):
+        self.calls += 1
+        wanted = [date for date in dates if date not in set(cached_dates)]
+        rows = [
+            BookingSlot(court_id, parse_date(date), start, start + 60)
+            for date in wanted
+            for court_id in service.metadata.court_ids
+            if court_id not in self.failed
+            for start in self.starts
+        ]
+        return rows, {date: set(self.failed) for date in wanted}
+
+
+def days_from_today(offsets) -> list[str]:
+    """DD/MM/YYYY dates the given numbers of days from today."""
+    today = datetime.now()
+    return [(today + timedelta(days=n)).strftime("%d/%m/%Y") for n in offsets]
+
+
+def expire(service: AvailabilityService) -> None:
+    """Age every cached entry past its TTL."""
+    for entry in service.cache._entries.values():
+        entry.stored_at -= entry.ttl_seconds + 1
+
+
+@pytest.fixture
+def upstream() -> FakeUpstream:
+    return FakeUpstream()
+
+
+@pytest.fixture
+def service(upstream) -> AvailabilityService:
+    service = AvailabilityService(
+        cache=AvailabilityCache(ttl_seconds=300, stale_seconds=0, max_entries=100)
+    )
+    service._fetch_dates = lambda dates, cached_dates=(): upstream.fetch_dates(
+        service, dates, cached_dates
+    )
+    return service
+
+
+@pytest.fixture
+async def client(service):
+    """The app serving `service`, without running its lifespan."""
+    app.state.availability_service = service
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    del app.state.availability_service
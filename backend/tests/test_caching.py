@@ -0,0 +1,162 @@
+"""Pre-encoded bodies, validators and conditional GETs on availability routes."""
+
+from conftest import days_from_today, expire
+
+
+def url_date(date: str) -> str:
+    return date.replace("/", "-")
+
+
+def free_cells(day: dict) -> int:
+    return sum(not c["is_booked"] for slot in day["slots"] for c in slot["courts"])
+
+
+async def test_expired_day_refetched_partial_is_sent_as_fetched(
+    client, service, upstream
+):
+    (date,) = days_from_today([1])
+    path = f"/api/v1/availability/{url_date(date)}"
+    first = await client.get(path)
+    assert first.headers["etag"]
+    assert free_cells(first.json()) > 0
+
+    expire(service)
+    court_id = service.metadata.court_ids[0]
+    upstream.failed = {court_id}
+    upstream.starts = []
+    second = await client.get(path)
+
+    body = second.json()
+    assert body["failed_courts"] == [court_id]
+    assert free_cells(body) == 0
+    # Not the cached day's bytes or validators
+    assert "etag" not in second.headers
+
+
+async def test_expired_range_refetched_partial_is_sent_as_fetched(
+    client, service, upstream
+):
+    dates = days_from_today([1, 2])
+    path = f"/api/v1/availability/range?start={url_date(dates[0])}&days=2"
+    assert (await client.get(path)).headers["etag"]
+
+    expire(service)
+    court_id = service.metadata.court_ids[0]
+    upstream.failed = {court_id}
+    second = await client.get(path)
+
+    assert [day["failed_courts"] for day in second.json()["days"]] == [
+        [court_id],
+        [court_id],
+    ]
+    assert "etag" not in second.headers
+
+
+async def test_compact_body_follows_the_days_served(client, service, upstream):
+    dates = days_from_today([1, 2])
+    path = f"/api/v1/availability/range?start={url_date(dates[0])}&days=2"
+    path += "&format=compact"
+    first = await client.get(path)
+    assert (await client.get(path)).headers["etag"] == first.headers["etag"]
+
+    # A complete refetch with new data is a new body
+    expire(service)
+    upstream.starts = [1200]
+    second = await client.get(path)
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.content != first.content
+
+    # A partial refetch isn't cached, so neither is its compact body
+    expire(service)
+    court_id = service.metadata.court_ids[0]
+    upstream.failed = {court_id}
+    third = await client.get(path)
+    assert "etag" not in third.headers
+    assert [day["failed_courts"] for day in third.json()["days"]] == [
+        [court_id],
+        [court_id],
+    ]
+
+
+async def day_response(client, **headers):
+    (date,) = days_from_today([1])
+    return await client.get(
+        f"/api/v1/availability/{url_date(date)}",
+        headers={"Accept-Encoding": "identity", **headers},
+    )
+
+
+async def test_validators_on_a_cached_day(client):
+    response = await day_response(client)
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"].endswith(" GMT")
+    assert response.headers["cache-control"].startswith("public")
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+async def test_matching_etags_get_a_bare_304(client):
+    etag = (await day_response(client)).headers["etag"]
+
+    for if_none_match in (
+        etag,
+        f"W/{etag}",
+        f'"stale", {etag}',
+        f'"stale",W/{etag} ',
+        "*",
+    ):
+        response = await day_response(client, **{"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+async def test_other_etags_get_the_body(client):
+    first = await day_response(client)
+    response = await day_response(client, **{"If-None-Match": '"stale", W/"other"'})
+    assert response.status_code == 200
+    assert response.content == first.content
+
+
+async def test_compressed_variant_has_its_own_etag(client):
+    identity = await day_response(client)
+    gzipped = await day_response(client, **{"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+    assert gzipped.content == identity.content
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+
+    # Either representation's ETag validates the other
+    response = await day_response(client, **{"If-None-Match": gzipped.headers["etag"]})
+    assert response.status_code == 304
+    assert response.headers["etag"] == identity.headers["etag"]
+    response = await day_response(
+        client,
+        **{"Accept-Encoding": "gzip", "If-None-Match": identity.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == gzipped.headers["etag"]
+    assert "content-encoding" not in response.headers
+
+
+async def test_if_modified_since(client):
+    last_modified = (await day_response(client)).headers["last-modified"]
+
+    response = await day_response(client, **{"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    response = await day_response(
+        client, **{"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+    response = await day_response(client, **{"If-Modified-Since": "not a date"})
+    assert response.status_code == 200
+
+
+async def test_if_none_match_takes_precedence_over_if_modified_since(client):
+    last_modified = (await day_response(client)).headers["last-modified"]
+    response = await day_response(
+        client,
+        **{"If-None-Match": '"stale"', "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 200
@@ -0,0 +1,117 @@
+"""Day versions, the bounded diff ring and full-day resets."""
+
+from hos_padel.models.availability import AvailabilityResponse, TimeSlot
+from hos_padel.models.court import CourtStatus
+from hos_padel.services.changes import ChangeLog
+
+DATE = "08/01/2025"
+STARTS = ["10:00", "10:30", "11:00", "11:30"]
+
+
+def day(booked: set[tuple[int, int]], date: str = DATE) -> AvailabilityResponse:
+    """Two courts over STARTS, booked at the given (court, slot index) cells."""
+    slots = []
+    for index, start in enumerate(STARTS):
+        courts = [
+            CourtStatus(
+                court_id=court_id,
+                court_name=f"Court {court_id}",
+                is_booked=(court_id, index) in booked,
+            )
+            for court_id in (1, 2)
+        ]
+        slots.append(
+            TimeSlot(
+                start_time=start,
+                end_time=start,
+                date=date,
+                has_available_court=not all(c.is_booked for c in courts),
+                courts=courts,
+            )
+        )
+    return AvailabilityResponse(date=date, rental_length=60, slots=slots)
+
+
+def flipped(changes) -> set[tuple[int, str]]:
+    return {
+        (court.court_id, slot.start_time)
+        for slot in changes.slots
+        for court in slot.courts
+    }
+
+
+def test_versions_only_increase_and_skip_unchanged_days():
+    log = ChangeLog(max_days=10, max_changes=10)
+    versions = []
+    for booked in [set(), {(1, 0)}, {(1, 0)}, {(1, 0), (2, 3)}, set()]:
+        response = day(booked)
+        log.record(response)
+        versions.append(response.version)
+
+    assert versions[1] > versions[0]
+    assert versions[2] == versions[1]
+    assert versions[4] > versions[3] > versions[2]
+    assert log.stats()["versions"] == 4
+
+
+def test_versions_increase_past_a_stamped_version_from_the_past():
+    log = ChangeLog(max_days=10, max_changes=10)
+    first = day(set())
+    log.record(first)
+    stale = day({(1, 0)})
+    stale.version = first.version - 1000
+    log.record(stale)
+
+    assert stale.version == first.version + 1
+
+
+def test_delta_nets_out_cells_that_flipped_back():
+    log = ChangeLog(max_days=10, max_changes=10)
+    base = day(set())
+    log.record(base)
+    log.record(day({(1, 0), (2, 1)}))
+    log.record(day({(2, 1)}))
+
+    changes = log.changes(DATE, 60, base.version)
+    assert not changes.reset
+    assert flipped(changes) == {(2, "10:30")}
+
+
+def test_ring_evicts_the_oldest_diffs():
+    log = ChangeLog(max_days=10, max_changes=2)
+    responses = [day(set()), day({(1, 0)}), day({(1, 1)}), day({(1, 2)})]
+    for response in responses:
+        log.record(response)
+    versions = [response.version for response in responses]
+
+    # Only the last two diffs are kept, so they reach back to versions[1]
+    changes = log.changes(DATE, 60, versions[0])
+    assert changes.reset
+    assert len(changes.slots) == len(STARTS)
+
+    changes = log.changes(DATE, 60, versions[1])
+    assert not changes.reset
+    assert flipped(changes) == {(1, "10:00"), (1, "11:00")}
+    changes = log.changes(DATE, 60, versions[2])
+    assert flipped(changes) == {(1, "10:30"), (1, "11:00")}
+    assert log.changes(DATE, 60, versions[3]).slots == []
+    assert log.stats()["resets_served"] == 1
+
+
+def test_unknown_versions_get_a_reset():
+    log = ChangeLog(max_days=10, max_changes=10)
+    response = day(set())
+    log.record(response)
+
+    assert log.changes(DATE, 60, 0).reset
+    assert log.changes(DATE, 60, response.version + 1).reset
+    assert log.changes("09/01/2025", 60, 0) is None
+
+
+def test_least_recent_days_are_forgotten():
+    log = ChangeLog(max_days=2, max_changes=10)
+    for date in ["08/01/2025", "09/01/2025", "10/01/2025"]:
+        log.record(day(set(), date))
+
+    assert log.changes("08/01/2025", 60, 0) is None
+    assert log.stats()["days"] == 2
@@ -0,0 +1,37 @@
+"""The availability cube holds the horizon and answers summaries."""
+
+from conftest import days_from_today
+
+from hos_padel.core.constants import VALID_RENTAL_LENGTHS
+
+
+def free_cells(response) -> int:
+    return sum(not c.is_booked for slot in response.slots for c in slot.courts)
+
+
+async def test_summary_matches_the_days_served(service, upstream):
+    upstream.starts = [600, 780]
+    dates = days_from_today(range(3))
+    loaded = await service.refresh_availability(dates)
+
+    summary = service.get_availability_summary(dates[0], 4, 60)
+
+    assert summary.missing_dates == days_from_today([3])
+    for day in summary.days:
+        response = loaded[day.date][60]
+        assert day.available_times == [
+            slot.start_time for slot in response.slots if slot.has_available_court
+        ]
+        assert day.free_court_slots == free_cells(response)
+
+
+async def test_days_outside_the_horizon_are_not_held(service):
+    span = service.cube.days
+    (today,) = days_from_today([0])
+    await service.refresh_availability([today])
+
+    await service.refresh_availability(days_from_today([-span, span]))
+
+    assert service.get_availability_summary(today, 1, 60).missing_dates == []
+    # Both days, at every rental length
+    assert service.cube.stats()["ignored"] == 2 * len(VALID_RENTAL_LENGTHS)
@@ -0,0 +1,48 @@
+"""Bulk exports build days without touching the live cache or cube."""
+
+import json
+
+from conftest import days_from_today, expire
+
+from hos_padel.services.export import export_lines
+
+
+async def export(service, dates) -> list[dict]:
+    return [
+        json.loads(line) async for line in export_lines(service, dates, 60, "ndjson")
+    ]
+
+
+async def test_export_leaves_cube_and_cache_unchanged(service):
+    live = days_from_today(range(3))
+    await service.refresh_availability(live)
+    cube_before = service.cube.stats()
+    summary_before = service.get_availability_summary(live[0], 3, 60)
+    cached_before = len(service.cache)
+
+    # Past and far-future days that share ring rows with the live ones
+    span = service.cube.days
+    exported = days_from_today([-span, -span + 1, span, span + 1])
+    days = await export(service, exported)
+
+    assert [day["date"] for day in days] == exported
+    assert all(free_starts(day) == ["10:00", "10:30"] for day in days)
+    assert service.cube.stats() == cube_before
+    assert service.get_availability_summary(live[0], 3, 60) == summary_before
+    assert len(service.cache) == cached_before
+
+
+def free_starts(day: dict) -> list[str]:
+    return [slot["start_time"] for slot in day["slots"] if slot["has_available_court"]]
+
+
+async def test_export_sends_fresh_data_past_an_expired_cached_day(service, upstream):
+    (date,) = days_from_today([1])
+    await service.refresh_availability([date])
+    assert free_starts((await export(service, [date]))[0]) == ["10:00", "10:30"]
+
+    expire(service)
+    upstream.starts = [1200]
+    (day,) = await export(service, [date])
+
+    assert free_starts(day) == ["20:00", "20:30"]
@@ -0,0 +1,78 @@
+"""Longer rental lengths derived from 60-minute FilterResults rows."""
+
+import pytest
+
+from hos_padel.core.times import parse_date, parse_minutes
+from hos_padel.models.booking import BookingSlot
+from hos_padel.services.occupancy import derive_rows, free_intervals
+
+COURT = 386680
+OTHER_COURT = 388015
+DAY = parse_date("02/11/2026")
+
+
+def rows(*spans: str, court_id: int = COURT, day: int = DAY) -> list[BookingSlot]:
+    """Rows from "HH:MM-HH:MM" spans."""
+    result = []
+    for span in spans:
+        start, end = span.split("-")
+        result.append(
+            BookingSlot(court_id, day, parse_minutes(start), parse_minutes(end))
+        )
+    return result
+
+
+def starts(derived: list[BookingSlot]) -> list[tuple[int, str]]:
+    return sorted(
+        (row.court_id, f"{row.start // 60:02d}:{row.start % 60:02d}") for row in derived
+    )
+
+
+def test_overlapping_rows_allow_a_longer_rental():
+    derived = derive_rows(rows("10:00-11:00", "10:30-11:30"), 90)
+    assert starts(derived) == [(COURT, "10:00")]
+    assert all(row.end - row.start == 90 for row in derived)
+
+
+def test_touching_rows_merge_into_one_interval():
+    assert free_intervals(rows("10:00-11:00", "11:00-12:00")) == {
+        (COURT, DAY): [(600, 720)]
+    }
+    assert starts(derive_rows(rows("10:00-11:00", "11:00-12:00"), 90)) == [
+        (COURT, "10:00"),
+        (COURT, "10:30"),
+    ]
+
+
+def test_rental_never_runs_past_closing_time():
+    derived = derive_rows(rows("21:00-22:00", "21:30-22:30", "22:00-23:00"), 90)
+    assert starts(derived) == [(COURT, "21:00"), (COURT, "21:30")]
+
+
+def test_rental_never_crosses_a_booked_cell():
+    # 11:30-12:00 is booked, so nothing spans it
+    base = rows("10:00-11:00", "10:30-11:30", "12:00-13:00")
+    assert starts(derive_rows(base, 90)) == [(COURT, "10:00")]
+
+
+def test_a_gap_shorter_than_the_rental_leaves_no_start():
+    assert derive_rows(rows("10:00-11:00", "11:30-12:30"), 90) == []
+
+
+def test_courts_and_days_are_never_merged():
+    base = (
+        rows("10:00-11:00")
+        + rows("10:30-11:30", court_id=OTHER_COURT)
+        + rows("10:30-11:30", day=DAY + 1)
+    )
+    assert derive_rows(base, 90) == []
+
+
+def test_base_length_rows_are_returned_as_is():
+    base = rows("10:00-11:00")
+    assert derive_rows(base, 60) is base
+
+
+def test_shorter_lengths_cannot_be_derived():
+    with pytest.raises(ValueError):
+        derive_rows(rows("10:00-11:00"), 30)
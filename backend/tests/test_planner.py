@@ -0,0 +1,82 @@
+"""Planned FilterResults windows, weekday masks and time windows."""
+
+from hos_padel.scraper.planner import QueryPlanner
+
+COURT = 11
+LENGTH = 60
+
+
+def cells(*dates, court_id=COURT, rental_length=LENGTH):
+    return [(date, court_id, rental_length) for date in dates]
+
+
+def selected(call) -> set[str]:
+    return {day for day, on in call.selected_days.items() if on}
+
+
+def test_contiguous_week_is_one_call_with_every_day():
+    # Monday 6 to Sunday 12 January 2025
+    dates = [f"{n:02d}/01/2025" for n in range(6, 13)]
+    (call,) = QueryPlanner().plan(cells(*dates))
+
+    assert call.start_date == "06/01/2025"
+    assert call.dates == tuple(dates)
+    assert all(call.selected_days.values())
+
+
+def test_windows_split_after_seven_days_across_a_week_boundary():
+    # Thursday 9 to Tuesday 21 January 2025
+    dates = [f"{n:02d}/01/2025" for n in range(9, 22)]
+    first, second = QueryPlanner().plan(cells(*dates))
+
+    assert first.dates == tuple(f"{n:02d}/01/2025" for n in range(9, 16))
+    assert all(first.selected_days.values())
+    assert second.start_date == "16/01/2025"
+    assert second.dates == tuple(f"{n:02d}/01/2025" for n in range(16, 22))
+    assert not second.selected_days["wednesday"]
+    assert len(selected(second)) == 6
+
+
+def test_windows_split_across_a_month_and_year_boundary():
+    dates = ["30/12/2024", "05/01/2025", "06/01/2025", "13/01/2025"]
+    calls = QueryPlanner().plan(cells(*dates))
+
+    assert [call.dates for call in calls] == [
+        ("30/12/2024", "05/01/2025"),
+        ("06/01/2025",),
+        ("13/01/2025",),
+    ]
+    assert selected(calls[0]) == {"monday", "sunday"}
+
+
+def test_mask_selects_only_the_wanted_weekdays():
+    # Wednesday 8 and Saturday 11, then Wednesday 15 January 2025
+    calls = QueryPlanner().plan(cells("15/01/2025", "11/01/2025", "08/01/2025"))
+
+    assert [call.dates for call in calls] == [
+        ("08/01/2025", "11/01/2025"),
+        ("15/01/2025",),
+    ]
+    assert selected(calls[0]) == {"wednesday", "saturday"}
+    assert selected(calls[1]) == {"wednesday"}
+
+
+def test_calls_are_per_court_and_rental_length_and_skip_cached_cells():
+    wanted = cells("08/01/2025", "09/01/2025") + cells(
+        "08/01/2025", court_id=12, rental_length=90
+    )
+    planner = QueryPlanner()
+    calls = planner.plan(wanted, cached=cells("09/01/2025"))
+
+    assert [(c.court_id, c.rental_length, c.dates) for c in calls] == [
+        (COURT, LENGTH, ("08/01/2025",)),
+        (12, 90, ("08/01/2025",)),
+    ]
+    assert planner.stats()["cells_cached"] == 1
+
+
+def test_time_window_spans_each_dates_opening_hours():
+    hours = {"08/01/2025": ("08:00", "22:00"), "11/01/2025": ("09:00", "23:00")}
+    (call,) = QueryPlanner().plan(cells("08/01/2025", "11/01/2025"), day_hours=hours)
+
+    assert (call.start_time, call.end_time) == ("08:00", "23:00")
@@ -0,0 +1,147 @@
+"""Circuit breaker transitions and how retries stop at an open circuit."""
+
+import aiohttp
+import pytest
+
+from hos_padel.scraper.client import EZFacilityClient
+from hos_padel.scraper.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+
+
+def fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_at_the_failure_threshold(breaker):
+    fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["rejected"] == 1
+    assert breaker.stats()["times_opened"] == 1
+
+
+def test_success_resets_the_failure_count(breaker):
+    fail(breaker, 2)
+    breaker.before_call()
+    breaker.record_success()
+    fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_trial_success_closes_the_circuit(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 29.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 0.1
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    breaker.before_call()
+
+
+def test_half_open_trial_failure_reopens_for_another_timeout(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_lets_a_single_trial_through(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+    breaker.before_call()
+
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+    assert breaker.stats()["rejected"] == 3
+
+    # A trial that ends without an outcome frees the slot for the next one
+    breaker.abandon_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+class FailingClient(EZFacilityClient):
+    """A client whose every attempt fails to connect."""
+
+    def __init__(self, breaker: CircuitBreaker, max_attempts: int):
+        super().__init__(
+            session=None,
+            base_url="http://upstream.test",
+            retry=RetryPolicy(max_attempts, base_delay=0, max_delay=0),
+            breaker=breaker,
+            request_timeout=1,
+        )
+        self.attempts = 0
+
+    async def _post(self, endpoint, data, court_id):
+        self.attempts += 1
+        raise aiohttp.ClientConnectionError("connection refused")
+
+
+async def test_retry_gives_up_when_the_circuit_opens(breaker):
+    client = FailingClient(breaker, max_attempts=10)
+
+    with pytest.raises(CircuitOpenError):
+        await client.post("/Rentals/FilterResults", "")
+
+    assert client.attempts == 3
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+async def test_open_circuit_fails_fast_without_an_attempt(breaker):
+    fail(breaker, 3)
+    client = FailingClient(breaker, max_attempts=10)
+
+    with pytest.raises(CircuitOpenError):
+        await client.post("/Rentals/FilterResults", "")
+    assert client.attempts == 0
+
+
+async def test_retries_stop_at_max_attempts(clock):
+    breaker = CircuitBreaker(failure_threshold=10, reset_timeout=30, clock=clock)
+    client = FailingClient(breaker, max_attempts=4)
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await client.post("/Rentals/FilterResults", "")
+    assert client.attempts == 4
+    assert breaker.state == CircuitBreaker.CLOSED
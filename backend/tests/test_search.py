@@ -0,0 +1,116 @@
+"""Free-start bitmasks, adjacent court runs and index searches."""
+
+from conftest import days_from_today
+
+from hos_padel.core.times import format_minutes
+from hos_padel.models.availability import AvailabilityResponse, TimeSlot
+from hos_padel.models.court import CourtStatus
+from hos_padel.services.search import AvailabilityIndex, DayIndex, _adjacent_run
+
+# Six 30-minute slots from 20:00 to 23:00 closing
+ORIGIN = 20 * 60
+SLOTS = 6
+COURTS = {1: "Court 1", 2: "Court 2", 3: "Court 3", 4: "Court 4"}
+
+
+def day(free: dict[int, set[int]], date: str = "08/01/2025") -> AvailabilityResponse:
+    """A day with each court free at the given slot indexes."""
+    slots = []
+    for index in range(SLOTS):
+        start = ORIGIN + index * 30
+        courts = [
+            CourtStatus(
+                court_id=court_id,
+                court_name=name,
+                is_booked=index not in free.get(court_id, set()),
+            )
+            for court_id, name in COURTS.items()
+        ]
+        slots.append(
+            TimeSlot(
+                start_time=format_minutes(start),
+                end_time=format_minutes(start + 30),
+                date=date,
+                has_available_court=not all(c.is_booked for c in courts),
+                courts=courts,
+            )
+        )
+    return AvailabilityResponse(date=date, rental_length=60, slots=slots)
+
+
+def bits(mask: int) -> set[int]:
+    return {i for i in range(SLOTS) if mask >> i & 1}
+
+
+def test_starts_need_the_whole_rental_free():
+    index = DayIndex.of(day({1: {0, 1, 2, 3}}))
+
+    assert bits(index.starts(30)[1]) == {0, 1, 2, 3}
+    assert bits(index.starts(60)[1]) == {0, 1, 2}
+    assert bits(index.starts(90)[1]) == {0, 1}
+    assert bits(index.starts(120)[1]) == {0}
+    assert 1 not in index.starts(150)
+
+
+def test_a_booked_cell_splits_a_run():
+    index = DayIndex.of(day({1: {0, 1, 3, 4, 5}}))
+
+    assert bits(index.starts(60)[1]) == {0, 3, 4}
+    assert bits(index.starts(90)[1]) == {3}
+
+
+def test_rentals_may_not_run_past_closing_time():
+    index = DayIndex.of(day({1: {4, 5}, 2: {5}}))
+
+    assert bits(index.starts(60)[1]) == {4}
+    assert 2 not in index.starts(60)
+    assert index.starts(90) == {}
+
+
+def test_courts_without_a_start_are_left_out():
+    index = DayIndex.of(day({1: {0, 1}, 3: {2}}))
+    assert set(index.starts(60)) == {1}
+
+
+def test_adjacent_run_is_the_first_run_of_neighbours():
+    position = {court_id: i for i, court_id in enumerate(COURTS)}
+
+    assert _adjacent_run([1, 3, 4], position, 2) == [3, 4]
+    assert _adjacent_run([1, 2, 4], position, 2) == [1, 2]
+    assert _adjacent_run([1, 2, 3, 4], position, 2) == [1, 2, 3, 4]
+    assert _adjacent_run([1, 2, 4], position, 3) == []
+    assert _adjacent_run([1, 3], position, 2) == []
+    # Courts the venue doesn't list have no neighbours
+    assert _adjacent_run([1, 9, 2], position, 2) == [1, 2]
+
+
+def test_search_finds_adjacent_courts_for_the_whole_rental():
+    (date,) = days_from_today([1])
+    index = AvailabilityIndex()
+    # Courts 1 and 3 are both free from 20:00, but only 2 and 3 are neighbours
+    index.record(day({1: {0, 1, 2}, 2: {1, 2, 3}, 3: {0, 1, 2, 3}}, date))
+
+    matches, missing = index.search([date], 60, COURTS, min_courts=2)
+    assert [(m.start_time, [c.id for c in m.courts]) for m in matches] == [
+        ("20:00", [1, 3]),
+        ("20:30", [1, 2, 3]),
+        ("21:00", [2, 3]),
+    ]
+
+    matches, _ = index.search([date], 60, COURTS, min_courts=2, adjacent=True)
+    assert [(m.start_time, [c.id for c in m.courts]) for m in matches] == [
+        ("20:30", [1, 2, 3]),
+        ("21:00", [2, 3]),
+    ]
+    assert matches[-1].end_time == "22:00"
+    assert missing == []
+
+
+def test_search_reports_dates_it_has_not_indexed():
+    dates = days_from_today([1, 2])
+    index = AvailabilityIndex()
+    index.record(day({1: {5}}, dates[0]))
+
+    matches, missing = index.search(dates, 60, COURTS)
+    assert matches == []
+    assert missing == [dates[1]]
@@ -0,0 +1,150 @@
+"""Upstream admission: priorities, cancellation, concurrency cap and rate."""
+
+import asyncio
+import time
+
+import pytest
+
+from hos_padel.scraper.throttle import Priority, TokenBucket, UpstreamGovernor
+
+
+def governor(max_concurrency: int = 1, rate: float = 1000, burst: int = 100):
+    return UpstreamGovernor(max_concurrency, rate_per_second=rate, burst=burst)
+
+
+async def settle() -> None:
+    """Let every ready task run until it blocks."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_interactive_request_jumps_queued_background_work():
+    gov = governor()
+    admitted = []
+    release = asyncio.Event()
+
+    async def request(name, priority):
+        async with gov.slot(priority):
+            admitted.append(name)
+            await release.wait()
+
+    holder = asyncio.create_task(request("holder", Priority.INTERACTIVE))
+    await settle()
+    waiting = [
+        asyncio.create_task(request(f"background-{n}", Priority.BACKGROUND))
+        for n in range(3)
+    ]
+    await settle()
+    waiting.append(asyncio.create_task(request("interactive", Priority.INTERACTIVE)))
+    await settle()
+    assert gov.stats()["queued"] == 4
+
+    release.set()
+    await asyncio.gather(holder, *waiting)
+
+    assert admitted == [
+        "holder",
+        "interactive",
+        "background-0",
+        "background-1",
+        "background-2",
+    ]
+    stats = gov.stats()["priorities"]
+    assert stats["background"]["queued"] == 3
+    assert stats["interactive"]["queued"] == 1
+
+
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    gov = governor()
+    release = asyncio.Event()
+
+    async def hold():
+        async with gov.slot():
+            await release.wait()
+
+    async def wait_for_slot():
+        async with gov.slot():
+            pass
+
+    holder = asyncio.create_task(hold())
+    await settle()
+    queued = asyncio.create_task(wait_for_slot())
+    await settle()
+    queued.cancel()
+    release.set()
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    assert gov.stats()["active"] == 0
+    await asyncio.wait_for(wait_for_slot(), 1)
+
+
+async def test_waiter_cancelled_as_it_is_admitted_hands_the_slot_back():
+    gov = governor()
+
+    async def wait_for_slot():
+        async with gov.slot():
+            pass
+
+    holding = gov.slot()
+    await holding.__aenter__()
+    queued = asyncio.create_task(wait_for_slot())
+    await settle()
+
+    # Releasing admits the waiter, which is cancelled before it runs again
+    await holding.__aexit__(None, None, None)
+    assert gov.stats()["active"] == 1
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    assert gov.stats()["active"] == 0
+    await asyncio.wait_for(wait_for_slot(), 1)
+
+
+async def test_concurrency_never_exceeds_the_cap():
+    gov = governor(max_concurrency=3)
+    active = peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with gov.slot(Priority.BACKGROUND):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+
+    await asyncio.gather(*(request() for _ in range(20)))
+
+    assert peak == 3
+    assert gov.stats()["active"] == 0
+    assert gov.stats()["priorities"]["background"]["requests"] == 20
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.delay() == 0
+    bucket.take()
+    bucket.take()
+    assert bucket.delay() == pytest.approx(0.1, abs=0.01)
+
+    # Half a refill interval ago
+    bucket._updated -= 0.05
+    assert bucket.delay() == pytest.approx(0.05, abs=0.01)
+
+    # Never more than the burst, however long it has been idle
+    bucket._updated -= 60
+    bucket.delay()
+    assert bucket._tokens == 2
+
+
+async def test_requests_beyond_the_burst_wait_for_tokens():
+    gov = governor(max_concurrency=10, rate=50, burst=1)
+    started = time.monotonic()
+    for _ in range(3):
+        async with gov.slot():
+            pass
+
+    # One token from the burst, then one every 20 ms
+    assert time.monotonic() - started >= 0.035
@@ -1,5 +1,17 @@
-import { AvailabilityResponse, TimeSlot, WeekAvailability } from '../types/api'
-import { formatDateForApi, getWeekDates, dateToKey } from '../utils/dates'
+import {
+  AvailabilityRangeResponse,
+  AvailabilityResponse,
+  AvailabilityUpdate,
+  CompactAvailability,
+  TimeSlot,
+  WeekAvailability,
+} from '../types/api'
+import {
+  formatDateForApi,
+  getWeekDates,
+  dateToKey,
+  parseApiDate,
+} from '../utils/dates'
 
 // In dev: Vite proxy forwards /api to localhost:8000
 // In prod: nginx proxy forwards /api to the api container
@@ -24,8 +36,86 @@ export async function getAvailability(
   return response.json()
 }
 
+function formatMinutes(minutes: number): string {
+  const hours = Math.floor(minutes / 60) % 24
+  return `${String(hours).padStart(2, '0')}:${String(minutes % 60).padStart(2, '0')}`
+}
+
+function decodeMask(value: string | undefined): Uint8Array {
+  if (!value) return new Uint8Array()
+  return Uint8Array.from(atob(value), (char) => char.charCodeAt(0))
+}
+
+/**
+ * Expand a compact bitmask response into full per-day responses
+ */
+export function decodeCompactAvailability(
+  compact: CompactAvailability
+): AvailabilityResponse[] {
+  return compact.days.map((day) => {
+    const [hours, minutes] = (day.origin ?? compact.origin).split(':').map(Number)
+    const origin = hours * 60 + minutes
+    const slotCount = day.slot_count ?? compact.slot_count
+    const masks = compact.courts.map((court) => decodeMask(day.free[court.id]))
+
+    const slots: TimeSlot[] = []
+    for (let i = 0; i < slotCount; i++) {
+      const start = origin + i * compact.step_minutes
+      const courts = compact.courts.map((court, c) => ({
+        court_id: court.id,
+        court_name: court.name,
+        is_booked: !((masks[c][i >> 3] ?? 0) & (1 << (i & 7))),
+      }))
+      slots.push({
+        start_time: formatMinutes(start),
+        end_time: formatMinutes(start + compact.step_minutes),
+        date: day.date,
+        has_available_court: courts.some((court) => !court.is_booked),
+        courts,
+      })
+    }
+
+    return {
+      date: day.date,
+      rental_length: compact.rental_length,
+      slots,
+      failed_courts: day.failed_courts,
+      stale_courts: day.stale_courts,
+      version: day.version,
+    }
+  })
+}
+
 /**
- * Fetch availability for an entire week (7 parallel requests)
+ * Fetch availability for consecutive days in a single request
+ *
+ * Requested in the compact bitmask format and expanded locally, which
+ * keeps the transfer small on slow connections.
+ */
+export async function getRangeAvailability(
+  start: Date,
+  days: number,
+  rentalLength: number = 60
+): Promise<AvailabilityRangeResponse> {
+  const startStr = formatDateForApi(start)
+  const url = `${API_BASE}/api/v1/availability/range?start=${startStr}&days=${days}&rental_length=${rentalLength}&format=compact`
+
+  const response = await fetch(url)
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch availability: ${response.statusText}`)
+  }
+
+  const compact: CompactAvailability = await response.json()
+  return {
+    start_date: compact.days[0]?.date ?? '',
+    rental_length: compact.rental_length,
+    days: decodeCompactAvailability(compact),
+  }
+}
+
+/**
+ * Fetch availability for an entire week (one range request)
  */
 export async function getWeekAvailability(
   weekStart: Date,
@@ -33,22 +123,79 @@ export async function getWeekAvailability(
 ): Promise<WeekAvailability> {
   const dates = getWeekDates(weekStart)
 
-  const results = await Promise.all(
-    dates.map(async (date) => {
-      try {
-        const response = await getAvailability(date, rentalLength)
-        return { date, slots: response.slots }
-      } catch {
-        // Return empty slots for failed requests
-        return { date, slots: [] as TimeSlot[] }
-      }
-    })
-  )
+  let days: TimeSlot[][]
+  try {
+    const response = await getRangeAvailability(weekStart, dates.length, rentalLength)
+    days = response.days.map((day) => day.slots)
+  } catch {
+    // Return empty slots if the request failed
+    days = dates.map(() => [] as TimeSlot[])
+  }
 
   const availability: WeekAvailability = new Map()
-  for (const { date, slots } of results) {
-    availability.set(dateToKey(date), slots)
-  }
+  dates.forEach((date, i) => {
+    availability.set(dateToKey(date), days[i] ?? [])
+  })
 
   return availability
 }
+
+/**
+ * Apply a streamed update to a day's slots, returning new slots
+ */
+export function applyAvailabilityUpdate(
+  slots: TimeSlot[],
+  update: AvailabilityUpdate
+): TimeSlot[] {
+  const changes = new Map(update.slots.map((slot) => [slot.start_time, slot]))
+
+  return slots.map((slot) => {
+    const change = changes.get(slot.start_time)
+    if (!change) return slot
+
+    const courts = new Map(change.courts.map((court) => [court.court_id, court]))
+    return {
+      ...slot,
+      has_available_court: change.has_available_court,
+      courts: slot.courts.map((court) => courts.get(court.court_id) ?? court),
+    }
+  })
+}
+
+/**
+ * Subscribe to availability changes for the given dates.
+ *
+ * `onDay` is called with a day's full slots, first from the initial
+ * snapshot and then after every change. Returns a function that closes
+ * the stream.
+ */
+export function subscribeToAvailability(
+  dates: Date[],
+  rentalLength: number,
+  onDay: (dateKey: string, slots: TimeSlot[]) => void
+): () => void {
+  const dateParam = dates.map(formatDateForApi).join(',')
+  const url = `${API_BASE}/api/v1/availability/stream?dates=${dateParam}&rental_length=${rentalLength}`
+  const source = new EventSource(url)
+  const days = new Map<string, TimeSlot[]>()
+
+  source.addEventListener('snapshot', (event) => {
+    const snapshot: AvailabilityResponse = JSON.parse((event as MessageEvent).data)
+    const key = dateToKey(parseApiDate(snapshot.date))
+    days.set(key, snapshot.slots)
+    onDay(key, snapshot.slots)
+  })
+
+  source.addEventListener('update', (event) => {
+    const update: AvailabilityUpdate = JSON.parse((event as MessageEvent).data)
+    const key = dateToKey(parseApiDate(update.date))
+    const slots = days.get(key)
+    if (!slots) return
+
+    const updated = applyAvailabilityUpdate(slots, update)
+    days.set(key, updated)
+    onDay(key, updated)
+  })
+
+  return () => source.close()
+}
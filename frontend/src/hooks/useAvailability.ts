@@ -1,7 +1,7 @@
 import { useState, useEffect, useRef } from 'react'
-import { getWeekAvailability } from '../api/availability'
+import { getWeekAvailability, subscribeToAvailability } from '../api/availability'
 import { WeekAvailability } from '../types/api'
-import { dateToKey } from '../utils/dates'
+import { dateToKey, getWeekDates } from '../utils/dates'
 
 interface UseAvailabilityResult {
   data: WeekAvailability
@@ -20,6 +20,22 @@ export function useAvailability(
 
   useEffect(() => {
     const cacheKey = `${dateToKey(weekStart)}-${rentalLength}`
+    let cancelled = false
+
+    // Keep the shown week live; the stream's first snapshots also
+    // refresh anything served from the cache below
+    const unsubscribe = subscribeToAvailability(
+      getWeekDates(weekStart),
+      rentalLength,
+      (dateKey, slots) => {
+        if (cancelled) return
+        const week: WeekAvailability = new Map(cacheRef.current.get(cacheKey))
+        week.set(dateKey, slots)
+        cacheRef.current.set(cacheKey, week)
+        setData(week)
+        setIsLoading(false)
+      }
+    )
 
     // Check cache first
     const cached = cacheRef.current.get(cacheKey)
@@ -27,11 +43,12 @@ export function useAvailability(
       setData(cached)
       setIsLoading(false)
       setError(null)
-      return
+      return () => {
+        cancelled = true
+        unsubscribe()
+      }
     }
 
-    let cancelled = false
-
     async function fetchData() {
       setIsLoading(true)
       setError(null)
@@ -39,8 +56,11 @@ export function useAvailability(
       try {
         const result = await getWeekAvailability(weekStart, rentalLength)
         if (!cancelled) {
-          cacheRef.current.set(cacheKey, result)
-          setData(result)
+          // Days the stream already delivered are at least as new
+          const streamed = cacheRef.current.get(cacheKey) ?? []
+          const week: WeekAvailability = new Map([...result, ...streamed])
+          cacheRef.current.set(cacheKey, week)
+          setData(week)
         }
       } catch (err) {
         if (!cancelled) {
@@ -57,6 +77,7 @@ export function useAvailability(
 
     return () => {
       cancelled = true
+      unsubscribe()
     }
   }, [weekStart, rentalLength])
 
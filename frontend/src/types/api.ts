@@ -16,6 +16,52 @@ export interface AvailabilityResponse {
   date: string        // "DD-MM-YYYY"
   rental_length: number
   slots: TimeSlot[]
+  failed_courts?: number[]  // upstream failed; shown as booked
+  stale_courts?: number[]   // served from last-known data
+  version?: number          // increases whenever the day changes
+}
+
+// Streamed change: only slots with a changed court, listing only those courts
+export interface AvailabilityUpdate {
+  date: string        // "DD/MM/YYYY"
+  rental_length: number
+  slots: TimeSlot[]
+  failed_courts: number[]
+  stale_courts: number[]
+  version?: number
+}
+
+export interface AvailabilityRangeResponse {
+  start_date: string  // "DD/MM/YYYY"
+  rental_length: number
+  days: AvailabilityResponse[]
+}
+
+export interface Court {
+  id: number
+  name: string
+}
+
+// Compact format: base64 bitmask per court, bit i (byte i >> 3, LSB
+// first) set when slot i is free
+export interface CompactDay {
+  date: string        // "DD/MM/YYYY"
+  free: Record<string, string>
+  failed_courts: number[]
+  stale_courts: number[]
+  version?: number
+  // Set when the day's opening hours don't match the shared grid
+  origin?: string | null
+  slot_count?: number | null
+}
+
+export interface CompactAvailability {
+  rental_length: number
+  origin: string      // "HH:MM" start of slot 0
+  step_minutes: number
+  slot_count: number
+  courts: Court[]
+  days: CompactDay[]
 }
 
 export type WeekAvailability = Map<string, TimeSlot[]>